@@ -0,0 +1,42 @@
+"""add post hashtags
+
+Revision ID: 2f90c6c8f324
+Revises: 42b05a66f996
+Create Date: 2026-10-18 20:21:05.117842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f90c6c8f324'
+down_revision: Union[str, None] = '42b05a66f996'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('post_hashtags',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id', 'tag')
+    )
+    # 기존 게시물 본문에서 해시태그를 추출해 백필합니다 (extract_hashtags와 같은 규칙).
+    op.execute(
+        "INSERT INTO post_hashtags (post_id, tag, created_at) "
+        "SELECT DISTINCT posts.id, left(lower(match[1]), 100), coalesce(posts.created_at, now()) "
+        "FROM posts, regexp_matches(posts.content, '#(\\w+)', 'g') AS match"
+    )
+    op.create_index('ix_post_hashtags_tag_created_at', 'post_hashtags', ['tag', sa.text('created_at DESC'), sa.text('post_id DESC')], unique=False)
+    op.create_index('ix_post_hashtags_created_at', 'post_hashtags', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_hashtags_created_at', table_name='post_hashtags')
+    op.drop_index('ix_post_hashtags_tag_created_at', table_name='post_hashtags')
+    op.drop_table('post_hashtags')
@@ -0,0 +1,26 @@
+"""add posts created_at id index
+
+Revision ID: 38411fcc3885
+Revises: 51c61fe27855
+Create Date: 2026-10-18 10:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '38411fcc3885'
+down_revision: Union[str, None] = '51c61fe27855'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_posts_created_at_id', 'posts', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
@@ -0,0 +1,41 @@
+"""add home timeline
+
+Revision ID: 3ae50677a6d0
+Revises: 9eaa0dfcf07e
+Create Date: 2026-10-18 11:20:53.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3ae50677a6d0'
+down_revision: Union[str, None] = '9eaa0dfcf07e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('followers_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE users SET "
+        "followers_count = (SELECT count(*) FROM follows WHERE follows.followed_id = users.id)"
+    )
+    op.create_table('timeline_entries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'post_id')
+    )
+    op.create_index('ix_timeline_entries_user_id_created_at', 'timeline_entries', ['user_id', sa.text('created_at DESC'), sa.text('post_id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timeline_entries_user_id_created_at', table_name='timeline_entries')
+    op.drop_table('timeline_entries')
+    op.drop_column('users', 'followers_count')
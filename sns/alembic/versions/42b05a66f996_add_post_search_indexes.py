@@ -0,0 +1,36 @@
+"""add post search indexes
+
+Revision ID: 42b05a66f996
+Revises: b249e49e09be
+Create Date: 2026-10-18 19:58:44.903316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '42b05a66f996'
+down_revision: Union[str, None] = 'b249e49e09be'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# STORED 생성 컬럼 추가는 posts 테이블을 다시 쓰므로 트래픽이 적은 시간에 실행하세요.
+# GIN 인덱스는 테이블을 잠그지 않도록 트랜잭션 밖에서 CONCURRENTLY로 만듭니다.
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('posts', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("to_tsvector('simple', content)", persisted=True), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_posts_search_vector', 'posts', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_posts_content_trgm', 'posts', ['content'], unique=False, postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_content_trgm', table_name='posts', postgresql_concurrently=True)
+        op.drop_index('ix_posts_search_vector', table_name='posts', postgresql_concurrently=True)
+    op.drop_column('posts', 'search_vector')
@@ -0,0 +1,36 @@
+"""add foreign key access path indexes
+
+Revision ID: 93a2d9b98139
+Revises: af0bffb010e2
+Create Date: 2026-10-18 13:47:31.226915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '93a2d9b98139'
+down_revision: Union[str, None] = 'af0bffb010e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 운영 중인 큰 테이블을 잠그지 않도록 CONCURRENTLY로 만들며, 이는 트랜잭션 밖에서만 가능합니다.
+# likes.user_id, follows.follower_id는 uq_likes_user_id_post_id, uq_follows_follower_id_followed_id 유니크 인덱스의 선두 컬럼으로 이미 커버됩니다.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_posts_author_id_created_at', 'posts', ['author_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_likes_post_id', 'likes', ['post_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_comments_post_id', 'comments', ['post_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_follows_followed_id', 'follows', ['followed_id', 'follower_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_follows_followed_id', table_name='follows', postgresql_concurrently=True)
+        op.drop_index('ix_comments_post_id', table_name='comments', postgresql_concurrently=True)
+        op.drop_index('ix_likes_post_id', table_name='likes', postgresql_concurrently=True)
+        op.drop_index('ix_posts_author_id_created_at', table_name='posts', postgresql_concurrently=True)
@@ -0,0 +1,34 @@
+"""add post counter columns
+
+Revision ID: 9eaa0dfcf07e
+Revises: 38411fcc3885
+Create Date: 2026-10-18 10:41:07.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9eaa0dfcf07e'
+down_revision: Union[str, None] = '38411fcc3885'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('posts', sa.Column('comments_count', sa.Integer(), server_default='0', nullable=False))
+    # 기존 데이터 백필
+    op.execute(
+        "UPDATE posts SET "
+        "likes_count = (SELECT count(*) FROM likes WHERE likes.post_id = posts.id), "
+        "comments_count = (SELECT count(*) FROM comments WHERE comments.post_id = posts.id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('posts', 'comments_count')
+    op.drop_column('posts', 'likes_count')
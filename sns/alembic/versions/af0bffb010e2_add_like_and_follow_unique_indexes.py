@@ -0,0 +1,43 @@
+"""add like and follow unique indexes
+
+Revision ID: af0bffb010e2
+Revises: 3ae50677a6d0
+Create Date: 2026-10-18 13:02:18.640552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'af0bffb010e2'
+down_revision: Union[str, None] = '3ae50677a6d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 유니크 인덱스를 만들기 전에 중복 행을 정리하고(가장 오래된 행만 유지) 카운터를 다시 맞춥니다.
+    op.execute(
+        "DELETE FROM likes a USING likes b "
+        "WHERE a.user_id = b.user_id AND a.post_id = b.post_id AND a.id > b.id"
+    )
+    op.execute(
+        "DELETE FROM follows a USING follows b "
+        "WHERE a.follower_id = b.follower_id AND a.followed_id = b.followed_id AND a.id > b.id"
+    )
+    op.execute(
+        "UPDATE posts SET likes_count = (SELECT count(*) FROM likes WHERE likes.post_id = posts.id)"
+    )
+    op.execute(
+        "UPDATE users SET followers_count = (SELECT count(*) FROM follows WHERE follows.followed_id = users.id)"
+    )
+    op.create_index('uq_likes_user_id_post_id', 'likes', ['user_id', 'post_id'], unique=True)
+    op.create_index('uq_follows_follower_id_followed_id', 'follows', ['follower_id', 'followed_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_follows_follower_id_followed_id', table_name='follows')
+    op.drop_index('uq_likes_user_id_post_id', table_name='likes')
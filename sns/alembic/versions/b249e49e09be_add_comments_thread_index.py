@@ -0,0 +1,32 @@
+"""add comments thread index
+
+Revision ID: b249e49e09be
+Revises: 93a2d9b98139
+Create Date: 2026-10-18 19:32:10.418027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b249e49e09be'
+down_revision: Union[str, None] = '93a2d9b98139'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 댓글 목록의 키셋 페이지네이션용 (post_id, created_at, id) 인덱스입니다.
+# 선두 컬럼이 post_id이므로 기존 ix_comments_post_id를 대체합니다.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_comments_post_id_created_at_id', 'comments', ['post_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_comments_post_id', table_name='comments', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_comments_post_id', 'comments', ['post_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_comments_post_id_created_at_id', table_name='comments', postgresql_concurrently=True)
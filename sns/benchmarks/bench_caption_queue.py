@@ -0,0 +1,90 @@
+"""캡션 작업 큐 처리량 / 중복 제거 벤치마크 (오프라인, stub 백엔드).
+
+--jobs 개의 요청이 --unique 종류의 이미지 해시를 나눠 가지며 동시에 들어올 때,
+- inline: 요청마다 백엔드를 직접 await (요청이 모델 지연만큼 막힘)
+- queue: CaptionQueue.submit 후 바로 반환, 워커가 처리 (캐시 + 처리 중 작업 병합)
+두 방식의 요청 지연, 전체 처리 시간, 실제 백엔드 호출 수를 비교합니다.
+
+    python -m benchmarks.bench_caption_queue --jobs 500 --unique 50 --delay 0.2 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from dependencies.cache import MemoryCache
+from dependencies.captions import CaptionQueue, StubCaptionBackend
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(mode: str, latencies: list[float], elapsed: float, calls: int, extra: dict) -> dict:
+    return {
+        "mode": mode,
+        "request_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "request_p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "all_results_ready_s": round(elapsed, 2),
+        "backend_calls": calls,
+        **extra,
+    }
+
+
+async def run_inline(keys: list[str], args) -> dict:
+    backend = StubCaptionBackend(args.delay)
+    semaphore = asyncio.Semaphore(args.workers)
+    latencies = []
+
+    async def request(key: str) -> None:
+        started = time.perf_counter()
+        async with semaphore:
+            await backend.generate(key)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(key) for key in keys))
+    return summarize("inline", latencies, time.perf_counter() - started, backend.calls, {})
+
+
+async def run_queue(keys: list[str], args) -> dict:
+    backend = StubCaptionBackend(args.delay)
+    queue = CaptionQueue(backend, args.workers, max_queue=len(keys), cache=MemoryCache(maxsize=len(keys), ttl=3600))
+    await queue.start()
+    latencies = []
+    jobs = []
+
+    async def request(key: str) -> None:
+        started = time.perf_counter()
+        jobs.append(await queue.submit(key, key))
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(key) for key in keys))
+    await asyncio.gather(*(job.done.wait() for job in jobs))
+    elapsed = time.perf_counter() - started
+    stats = queue.stats()
+    await queue.stop()
+    return summarize("queue", latencies, elapsed, backend.calls, {"coalesced": stats["coalesced"], "failed": stats["failed"]})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Caption job queue vs inline model calls.")
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--unique", type=int, default=50, help="distinct image hashes among the jobs")
+    parser.add_argument("--delay", type=float, default=0.2, help="stub model latency in seconds")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = [f"{rng.randrange(args.unique):064x}.jpg" for _ in range(args.jobs)]
+    results = [asyncio.run(run_inline(keys, args)), asyncio.run(run_queue(keys, args))]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
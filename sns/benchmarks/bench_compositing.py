@@ -0,0 +1,112 @@
+"""프레임 합성 처리량 / 프레임당 할당량 벤치마크 (합성 프레임, OpenCV 필요).
+
+test/test.py의 process_frame 합성 부분(프레임 복사, 마스크와 20x20 커널 새로 생성,
+bitwise_and 두 번 + 덧셈)과 FrameCompositor(버퍼 재사용, copyTo 한 번)를 같은 프레임과
+랜드마크로 비교합니다. MediaPipe 대신 같은 연결 정보로 스켈레톤을 그리므로 포즈 추정 비용은
+빠져 있습니다. 할당량은 tracemalloc으로 프레임마다 잰 일시적 최대 메모리를 프레임 크기로 나눈 값입니다.
+
+    python -m benchmarks.bench_compositing --frames 300 --width 1280 --height 720
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from dependencies.compositing import JOINT_COLOR, POSE_CONNECTIONS, SKELETON_COLOR, FrameCompositor
+
+
+def draw_skeleton(image, landmarks, color, thickness, joint_color=None) -> None:
+    height, width = image.shape[:2]
+    points = [(int(x * width), int(y * height)) for x, y, _ in landmarks]
+    for start, end in POSE_CONNECTIONS:
+        cv2.line(image, points[start], points[end], color, thickness)
+    if joint_color is not None:
+        for point in points:
+            cv2.circle(image, point, 2, joint_color, -1)
+
+
+def legacy_process_frame(frame, landmarks):
+    # test/test.py의 process_frame에서 MediaPipe 호출만 draw_skeleton으로 바꾼 것
+    annotated_image = frame.copy()
+    draw_skeleton(annotated_image, landmarks, SKELETON_COLOR, 2, JOINT_COLOR)
+    mask = np.zeros(frame.shape[:2], dtype=np.uint8)
+    draw_skeleton(mask, landmarks, 255, 10)
+    kernel = np.ones((20, 20), np.uint8)
+    dilated_mask = cv2.dilate(mask, kernel, iterations=1)
+    result = cv2.bitwise_and(frame, frame, mask=cv2.bitwise_not(dilated_mask))
+    result += cv2.bitwise_and(annotated_image, annotated_image, mask=dilated_mask)
+    return result
+
+
+def make_inputs(count: int, width: int, height: int):
+    rng = np.random.default_rng(7)
+    frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+    base = rng.uniform(0.3, 0.7, (33, 3))
+    landmarks = [base + rng.normal(0, 0.01, base.shape) for _ in range(count)]
+    return frames, landmarks
+
+
+def measure(label: str, process, frames, landmarks) -> dict:
+    frame_bytes = frames[0].nbytes
+    for i in range(5):
+        process(frames[i % len(frames)], landmarks[i])
+
+    started = time.perf_counter()
+    for i, points in enumerate(landmarks):
+        process(frames[i % len(frames)], points)
+    elapsed = time.perf_counter() - started
+
+    # 측정 오버헤드가 fps에 섞이지 않도록 할당량은 따로 돌려서 잽니다.
+    tracemalloc.start()
+    transient = []
+    for i, points in enumerate(landmarks[:50]):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        process(frames[i % len(frames)], points)
+        transient.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    per_frame = sum(transient) / len(transient)
+    return {
+        "mode": label,
+        "fps": round(len(landmarks) / elapsed, 1),
+        "ms_per_frame": round(elapsed / len(landmarks) * 1000, 3),
+        "peak_alloc_kb_per_frame": round(per_frame / 1024, 1),
+        "frame_buffers_per_frame": round(per_frame / frame_bytes, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="process_frame vs FrameCompositor on synthetic frames.")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    frames, landmarks = make_inputs(args.frames, args.width, args.height)
+    compositor = FrameCompositor(args.width, args.height)
+    batch = np.stack(frames)
+    batch_out = np.empty_like(batch)
+    scratch = [frame.copy() for frame in frames]
+
+    results = [
+        measure("legacy_process_frame", legacy_process_frame, frames, landmarks),
+        measure("compositor", compositor.process, frames, landmarks),
+        measure("compositor_in_place", lambda frame, points: compositor.process(frame, points, out=frame), scratch, landmarks),
+    ]
+    started = time.perf_counter()
+    for offset in range(0, args.frames, len(batch)):
+        chunk = landmarks[offset:offset + len(batch)]
+        compositor.process_batch(batch[:len(chunk)], chunk, out=batch_out[:len(chunk)])
+    elapsed = time.perf_counter() - started
+    results.append({"mode": f"compositor_batch({len(batch)})", "fps": round(args.frames / elapsed, 1)})
+
+    legacy = legacy_process_frame(frames[0], landmarks[0])
+    current = compositor.process(frames[0], landmarks[0])
+    print(json.dumps({"results": results, "max_pixel_diff": int(np.abs(legacy.astype(int) - current).max())}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""이미지 업로드 파이프라인 처리량 / 메모리 벤치마크.
+
+MediaStore만 붙인 작은 앱을 uvicorn으로 띄우고 --concurrency 개의 업로드를 동시에 보냅니다
+(기본 50개 x 10 MB). 매 업로드는 같은 원본 이미지 뒤에 서로 다른 꼬리 바이트를 붙여 해시가
+겹치지 않게 하므로 중복 제거 없이 저장과 변형 생성 경로를 모두 탑니다 (--same 으로 중복 업로드 측정).
+서버 프로세스의 RSS를 업로드 중 주기적으로 샘플링해 최대값을 보고하고, 변형을 만드는 워커
+프로세스의 최대 RSS는 따로 표시합니다. 클라이언트는 파일을 디스크에서 조금씩 읽어 보내므로
+업로드 본문이 측정값에 섞이지 않습니다. 원본 이미지 생성과 변형에는 Pillow가 필요하며,
+없으면 PNG 시그니처만 붙인 임의 바이트로 저장 경로만 측정합니다.
+
+    python -m benchmarks.bench_media_upload --concurrency 50 --size-mb 10
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from dependencies.media import MediaStore, parse_variant_sizes
+
+
+def make_source_image(path: str, size_mb: int) -> bool:
+    # 노이즈 이미지는 거의 압축되지 않으므로 픽셀 수로 파일 크기를 맞출 수 있습니다.
+    try:
+        from PIL import Image
+    except ImportError:
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n" + os.urandom(size_mb * 1024 * 1024))
+        return False
+    side = int((size_mb * 1024 * 1024 / 3) ** 0.5)
+    Image.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(path, format="PNG", compress_level=1)
+    return True
+
+
+class TrailedFile(io.RawIOBase):
+    """원본 파일 뒤에 trailer를 이어 붙여 읽는 파일 객체 (PNG 뒤의 여분 바이트는 디코더가 무시합니다)."""
+
+    def __init__(self, path: str, trailer: bytes):
+        self._file = open(path, "rb")
+        self._length = os.fstat(self._file.fileno()).st_size
+        self._trailer = trailer
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        total = self._length + len(self._trailer)
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: total}[whence]
+        self._position = max(0, min(total, base + offset))
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        total = self._length + len(self._trailer)
+        if size < 0:
+            size = total - self._position
+        if self._position < self._length:
+            self._file.seek(self._position)
+            chunk = self._file.read(min(size, self._length - self._position))
+        else:
+            start = self._position - self._length
+            chunk = self._trailer[start:start + size]
+        self._position += len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_app(store: MediaStore):
+    from fastapi import FastAPI, Request
+
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        return {"url": await store.store(request)}
+
+    return app
+
+
+async def run(args, source: str, store: MediaStore) -> dict:
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(build_app(store), host="127.0.0.1", port=args.port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    samples = [current_rss_mb()]
+    stop = asyncio.Event()
+
+    async def sample_rss() -> None:
+        while not stop.is_set():
+            samples.append(current_rss_mb())
+            await asyncio.sleep(0.05)
+
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    async def upload(client: httpx.AsyncClient, index: int) -> None:
+        nonlocal errors
+        trailer = b"" if args.same else index.to_bytes(8, "big")
+        stream = TrailedFile(source, trailer)
+        started = time.perf_counter()
+        try:
+            response = await client.post("/upload", files={"file": ("image.png", stream, "image/png")})
+            if response.status_code != 200:
+                errors += 1
+        finally:
+            stream.close()
+        latencies.append(time.perf_counter() - started)
+
+    sampler = asyncio.create_task(sample_rss())
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=600) as client:
+        await asyncio.gather(*(upload(client, i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+    server.should_exit = True
+    await server_task
+
+    latencies.sort()
+    total_mb = os.path.getsize(source) * args.concurrency / 1024 / 1024
+    return {
+        "uploads": args.concurrency,
+        "errors": errors,
+        "upload_mb_total": round(total_mb, 1),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_mb_s": round(total_mb / elapsed, 1),
+        "latency_p50_s": round(latencies[len(latencies) // 2], 2),
+        "latency_max_s": round(latencies[-1], 2),
+        "rss_baseline_mb": round(samples[0], 1),
+        "rss_peak_mb": round(max(samples), 1),
+        "variant_worker_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent image upload throughput and peak RSS.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--size-mb", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=2, help="variant process pool size")
+    parser.add_argument("--variants", default="thumb:320,medium:1080")
+    parser.add_argument("--same", action="store_true", help="upload identical bytes to measure dedup")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-media-")
+    try:
+        source = os.path.join(workdir, "source.png")
+        # 원본 생성에 쓰는 메모리가 서버 RSS 측정에 섞이지 않도록 별도 프로세스에서 만듭니다.
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            has_pillow = pool.submit(make_source_image, source, args.size_mb).result()
+        variants = parse_variant_sizes(args.variants) if has_pillow else {}
+        store = MediaStore(os.path.join(workdir, "media"), "http://bench/media", 1 << 40, variants, args.workers)
+        try:
+            result = asyncio.run(run(args, source, store))
+        finally:
+            store.shutdown()
+        result["variants"] = list(variants)
+        print(json.dumps(result, indent=2))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""로그인 폭주 중 비인증 엔드포인트 지연 벤치마크 (SQLite 임시 DB, aiosqlite 필요).
+
+실제 앱을 httpx.ASGITransport로 띄워 POST /api/login 폭주를 보내는 동안, 따로 도는 reader들이
+GET /api/posts를 반복 호출해 응답 지연의 p50/p99를 잽니다. bcrypt 검증을 이벤트 루프에서 바로
+실행할 때(inline, 이전 동작)와 PasswordHasher 풀로 넘길 때(offload)를 비교하고, 폭주 전에
+같은 reader로 잰 기준값(baseline)도 함께 출력합니다.
+
+    python -m benchmarks.bench_password_hashing --logins 200 --concurrency 32 --readers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import dependencies.database as database
+import domains.users.services as user_services
+from dependencies.database import Base
+from dependencies.password import create_password_hasher, pwd_context
+from domains.users.models import Post, User
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class InlineHasher:
+    # 풀 도입 전처럼 bcrypt를 이벤트 루프 스레드에서 바로 실행합니다.
+    async def hash(self, password: str) -> str:
+        return pwd_context.hash(password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return pwd_context.verify(plain_password, hashed_password)
+
+
+async def prepare_database(path: str, posts: int) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    now = datetime.utcnow()
+    async with database._create_sessionmaker(engine)() as session:
+        session.add(User(id=1, username="bench", email="bench@example.com", password=pwd_context.hash(PASSWORD),
+                         full_name="Bench", created_at=now, updated_at=now))
+        session.add_all([
+            Post(author_id=1, content=f"post {i}", created_at=now, updated_at=now) for i in range(posts)
+        ])
+        await session.commit()
+    await engine.dispose()
+
+
+async def read_loop(client: httpx.AsyncClient, stop: asyncio.Event, samples: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/posts", params={"limit": 10})
+        response.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+
+
+async def measure_reads(client: httpx.AsyncClient, readers: int, seconds: float) -> list[float]:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(read_loop(client, stop, samples)) for _ in range(readers)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return samples
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "requests": len(samples),
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "mean_ms": round(statistics.mean(samples), 2),
+    }
+
+
+async def run(mode: str, path: str, args) -> dict:
+    import main
+
+    hasher = InlineHasher() if mode == "inline" else create_password_hasher(
+        args.executor, args.workers, max(args.logins, args.max_pending)
+    )
+    user_services.get_password_hasher = lambda: hasher
+    database.db_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    database.DBSessionLocal = database._create_sessionmaker(database.db_engine)
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            baseline = await measure_reads(client, args.readers, args.baseline_seconds)
+
+            semaphore = asyncio.Semaphore(args.concurrency)
+            failures = 0
+
+            async def login() -> None:
+                nonlocal failures
+                async with semaphore:
+                    response = await client.post("/api/login", data={"username": "bench", "password": PASSWORD})
+                    failures += response.status_code != 200
+
+            samples: list[float] = []
+            stop = asyncio.Event()
+            readers = [asyncio.create_task(read_loop(client, stop, samples)) for _ in range(args.readers)]
+            started = time.perf_counter()
+            await asyncio.gather(*(login() for _ in range(args.logins)))
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await asyncio.gather(*readers)
+
+    if mode != "inline":
+        hasher.shutdown()
+    database.db_engine = None
+    return {
+        "mode": mode,
+        "logins": args.logins,
+        "login_failures": failures,
+        "logins_per_second": round(args.logins / elapsed, 1),
+        "reads_baseline": summarize(baseline),
+        "reads_during_storm": summarize(samples),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GET /api/posts latency during a POST /api/login storm.")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--readers", type=int, default=4, help="concurrent GET /api/posts loops")
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=16)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        asyncio.run(prepare_database(path, args.posts))
+        results = [asyncio.run(run(mode, path, args)) for mode in ("inline", "offload")]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""포즈 랜드마크 중계 포맷 벤치마크 (JSON vs 바이너리).
+
+MediaPipe Pose와 같은 33개 랜드마크 프레임으로
+- 프레임당 바이트 수와 인코딩/디코딩 속도 (test/pose.py의 {"landmarks": [(x, y, z), ...]} JSON 포함)
+- /pose/{room} 웹소켓을 uvicorn으로 띄워 발행자 1명 -> 구독자 --subscribers 명 중계 FPS
+를 포맷별로 비교합니다. 클라이언트(websockets 패키지 필요)도 같은 프로세스에서 돌므로 CPU를 서버와 나눠 씁니다.
+
+    python -m benchmarks.bench_pose_relay --frames 2000 --subscribers 4
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from fastapi import FastAPI
+
+from domains.pose.relay import (
+    BINARY_SUBPROTOCOL,
+    JSON_SUBPROTOCOL,
+    PoseFrame,
+    PoseRelay,
+    decode_binary,
+    decode_json,
+    get_pose_relay,
+)
+from domains.users.services import UserService
+from routers.pose.pose_controller import TOKEN_SUBPROTOCOL_PREFIX, router
+
+LANDMARKS = 33
+
+
+def make_frames(count: int, seed: int) -> list[PoseFrame]:
+    rng = random.Random(seed)
+    return [
+        PoseFrame(seq, time.time(), tuple(rng.random() for _ in range(LANDMARKS * 3)))
+        for seq in range(count)
+    ]
+
+
+def legacy_json(frame: PoseFrame) -> str:
+    coordinates = frame.coordinates
+    return json.dumps({"landmarks": [tuple(coordinates[i:i + 3]) for i in range(0, len(coordinates), 3)]})
+
+
+def measure_codec(frames: list[PoseFrame]) -> list[dict]:
+    results = []
+    codecs = {
+        "legacy_json": (legacy_json, lambda data, seq: decode_json(data, seq, LANDMARKS)),
+        "json": (lambda frame: PoseFrame(frame.seq, frame.timestamp, frame.coordinates).to_json(),
+                 lambda data, seq: decode_json(data, seq, LANDMARKS)),
+        "binary": (lambda frame: PoseFrame(frame.seq, frame.timestamp, frame.coordinates).to_binary(),
+                   lambda data, seq: decode_binary(data, LANDMARKS)),
+    }
+    for label, (encode, decode) in codecs.items():
+        started = time.perf_counter()
+        encoded = [encode(frame) for frame in frames]
+        encode_elapsed = time.perf_counter() - started
+        started = time.perf_counter()
+        for seq, data in enumerate(encoded):
+            decode(data, seq)
+        decode_elapsed = time.perf_counter() - started
+        size = sum(len(data.encode() if isinstance(data, str) else data) for data in encoded) / len(encoded)
+        results.append({
+            "format": label,
+            "bytes_per_frame": round(size, 1),
+            "encode_us": round(encode_elapsed / len(frames) * 1e6, 2),
+            "decode_us": round(decode_elapsed / len(frames) * 1e6, 2),
+        })
+    return results
+
+
+def build_app(relay: PoseRelay) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_pose_relay] = lambda: relay
+    return app
+
+
+async def measure_relay(frames: list[PoseFrame], subprotocol: str, args) -> dict:
+    import uvicorn
+    import websockets
+
+    # 모든 프레임이 도착하는지 보려고 큐를 프레임 수만큼 잡습니다 (운영 기본값은 오래된 프레임을 버림).
+    relay = PoseRelay(queue_size=len(frames), max_landmarks=LANDMARKS)
+    server = uvicorn.Server(uvicorn.Config(build_app(relay), host="127.0.0.1", port=args.port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    binary = subprotocol == BINARY_SUBPROTOCOL
+    payloads = [frame.to_binary() if binary else frame.to_json() for frame in frames]
+    # 방 주인(id 1)으로 발행하고 같은 토큰으로 구독합니다. uid 토큰이라 DB 없이 인증됩니다.
+    token = UserService(None).create_access_token({"sub": "bench", "uid": 1})
+    subprotocols = [subprotocol, TOKEN_SUBPROTOCOL_PREFIX + token]
+    url = f"ws://127.0.0.1:{args.port}/pose/1"
+    received_bytes = 0
+
+    async def consume(socket) -> int:
+        nonlocal received_bytes
+        for _ in payloads:
+            data = await socket.recv()
+            received_bytes += len(data)
+        return len(payloads)
+
+    subscribers = [await websockets.connect(f"{url}?role=subscriber", subprotocols=subprotocols) for _ in range(args.subscribers)]
+    while relay.stats()["subscribers"] < args.subscribers:
+        await asyncio.sleep(0.01)
+    readers = [asyncio.create_task(consume(socket)) for socket in subscribers]
+    started = time.perf_counter()
+    async with websockets.connect(f"{url}?role=publisher", subprotocols=subprotocols) as publisher:
+        for payload in payloads:
+            await publisher.send(payload)
+        delivered = sum(await asyncio.gather(*readers))
+    elapsed = time.perf_counter() - started
+    for socket in subscribers:
+        await socket.close()
+    server.should_exit = True
+    await server_task
+
+    return {
+        "format": subprotocol,
+        "frames": len(frames),
+        "subscribers": args.subscribers,
+        "delivered": delivered,
+        "relay_fps": round(len(frames) / elapsed, 1),
+        "wire_bytes_per_frame": round(received_bytes / max(1, delivered), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pose landmark relay: JSON vs binary frames.")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--subscribers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames, args.seed)
+    result = {
+        "codec": measure_codec(frames),
+        "relay": [asyncio.run(measure_relay(frames, subprotocol, args)) for subprotocol in (JSON_SUBPROTOCOL, BINARY_SUBPROTOCOL)],
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""비디오 세그멘테이션 처리량 벤치마크 (stub 모델, 합성 프레임).
+
+test/background.py처럼 디코딩 -> 한 프레임씩 추론 -> 합성을 순서대로 돌리는 루프와
+SegmentationPipeline(단계별 스레드 + 배치 추론)의 초당 처리 프레임 수를 비교합니다.
+디코딩 비용은 --decode-ms, 모델 비용은 배치당 --batch-ms + 프레임당 --frame-ms 만큼
+sleep으로 흉내 내고, 합성은 실제 NumPy 연산입니다.
+
+    python -m benchmarks.bench_segmentation --frames 300 --batch-size 8 --width 640 --height 360
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from dependencies.segmentation import SegmentationPipeline, StubSegmentationModel, apply_mask
+
+
+def synthetic_frames(count: int, width: int, height: int, decode_delay: float):
+    rng = np.random.default_rng(7)
+    palette = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+    for index in range(count):
+        time.sleep(decode_delay)
+        yield palette[index % len(palette)].copy()
+
+
+def run_serial(args) -> dict:
+    model = StubSegmentationModel(args.batch_ms / 1000, args.frame_ms / 1000)
+    processed = 0
+    started = time.perf_counter()
+    for frame in synthetic_frames(args.frames, args.width, args.height, args.decode_ms / 1000):
+        mask = model.predict_batch(frame[None])[0]
+        apply_mask(frame, mask)
+        processed += 1
+    elapsed = time.perf_counter() - started
+    return {"mode": "serial", "processed": processed, "batches": model.batches, "fps": round(processed / elapsed, 1)}
+
+
+def run_pipeline(args) -> dict:
+    model = StubSegmentationModel(args.batch_ms / 1000, args.frame_ms / 1000)
+    pipeline = SegmentationPipeline(model, batch_size=args.batch_size, queue_size=args.queue_size)
+    stats = pipeline.run(synthetic_frames(args.frames, args.width, args.height, args.decode_ms / 1000), lambda frame: None)
+    return {
+        "mode": f"pipeline(batch={args.batch_size})",
+        "processed": stats.composited,
+        "batches": stats.batches,
+        "fps": round(stats.fps, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-frame segmentation loop vs batched pipeline.")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--decode-ms", type=float, default=3.0)
+    parser.add_argument("--batch-ms", type=float, default=20.0, help="fixed model cost per predict call")
+    parser.add_argument("--frame-ms", type=float, default=4.0, help="model cost per frame")
+    args = parser.parse_args()
+
+    print(json.dumps([run_serial(args), run_pipeline(args)], indent=2))
+
+
+if __name__ == "__main__":
+    main()
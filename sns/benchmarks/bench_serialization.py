@@ -0,0 +1,99 @@
+"""응답 직렬화 CPU 비용 벤치마크.
+
+GET /api/posts와 같은 response_model(Union[PostPageDTO, List[PostDTO]])을 가진 라우트 두 개를 만들고,
+같은 100개짜리 PostDTO 페이지를 기본 경로(response_model 재검증 + jsonable_encoder + json.dumps)와
+DTOResponse 경로(dump_json 한 번)로 각각 돌려주면서 요청당 CPU 시간을 비교합니다.
+DB 없이 ASGI로 직접 호출하므로 차이는 직렬화 경로에서만 생깁니다.
+
+    python -m benchmarks.bench_serialization --posts 100 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import List, Union
+
+import httpx
+from fastapi import FastAPI
+
+from dependencies.responses import DTOResponse
+from domains.posts.dto import PostDTO, PostPageDTO
+from domains.users.dto import UserProfileDTO
+
+
+def make_page(count: int) -> list[PostDTO]:
+    now = datetime.utcnow()
+    authors = [
+        UserProfileDTO(
+            id=i, username=f"user{i}", email=f"user{i}@example.com", full_name=f"User {i}",
+            bio="benchmark bio", profile_picture=f"https://cdn.example.com/u/{i}.png",
+            created_at=now, updated_at=now,
+        )
+        for i in range(10)
+    ]
+    return [
+        PostDTO(
+            id=i, content=f"benchmark post {i} " * 8, image_url=f"https://cdn.example.com/p/{i}.jpg",
+            created_at=now - timedelta(seconds=i), updated_at=now,
+            author=authors[i % len(authors)], likes_count=i * 3, comments_count=i,
+        )
+        for i in range(count)
+    ]
+
+
+def build_app(page: list[PostDTO]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=Union[PostPageDTO, List[PostDTO]])
+    async def default_route():
+        return page
+
+    @app.get("/fast", response_model=Union[PostPageDTO, List[PostDTO]])
+    async def fast_route():
+        return DTOResponse(page)
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> dict:
+    for _ in range(min(requests, 50)):
+        await client.get(path)
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+    cpu, wall = time.process_time() - cpu_started, time.perf_counter() - wall_started
+    return {
+        "cpu_us_per_request": round(cpu / requests * 1e6, 1),
+        "wall_us_per_request": round(wall / requests * 1e6, 1),
+        "response_bytes": len(response.content),
+    }
+
+
+async def run(args) -> dict:
+    page = make_page(args.posts)
+    transport = httpx.ASGITransport(app=build_app(page))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        default = await client.get("/default")
+        fast = await client.get("/fast")
+        assert default.json() == fast.json(), "fast path must produce the same JSON document"
+        results = {
+            "default": await measure(client, "/default", args.requests),
+            "fast": await measure(client, "/fast", args.requests),
+        }
+    saved = results["default"]["cpu_us_per_request"] - results["fast"]["cpu_us_per_request"]
+    results["cpu_us_saved_per_request"] = round(saved, 1)
+    results["posts_per_page"] = args.posts
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CPU per request: response_model vs DTOResponse.")
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
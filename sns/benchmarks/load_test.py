@@ -0,0 +1,219 @@
+"""엔드포인트 부하 테스트 / 지연 시간 벤치마크.
+
+main.app을 uvicorn으로 띄우고(POSTGRESQL_* 환경 변수의 로컬 DB 사용) 회원가입 → 로그인 →
+게시물 작성 → 단건 조회 → 목록 조회(skip/cursor) 단계를 차례로 부하를 주며 실행합니다.
+각 단계가 앞 단계에서 만든 사용자/토큰/게시물을 그대로 쓰므로 별도의 시드가 필요 없습니다.
+라우트별 RPS와 p50/p95/p99를 출력하고, --output을 주면 JSON으로 저장해 커밋 간에 diff로 비교할 수 있습니다.
+httpx가 필요합니다 (pip install httpx).
+
+    python -m benchmarks.load_test --concurrency 32 --requests 2000 --output bench.json
+    python -m benchmarks.load_test --base-url http://localhost:8000   # 이미 떠 있는 서버 대상
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.durations: dict[str, float] = {}
+
+    async def request(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[route] += 1
+            raise
+        self.latencies[route].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            self.errors[route] += 1
+        return response
+
+    def report(self) -> dict:
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            duration = self.durations.get(route) or 1e-9
+            routes[route] = {
+                "requests": len(samples),
+                "errors": self.errors[route],
+                "rps": round(len(samples) / duration, 1),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+            }
+        return routes
+
+
+async def run_phase(recorder: Recorder, route: str, count: int, concurrency: int, make_request) -> list:
+    # 고정된 수의 워커가 작업 인덱스를 나눠 가지며 요청을 보냅니다 (closed-loop 부하).
+    results: list = [None] * count
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < count:
+            index = next_index
+            next_index += 1
+            try:
+                results[index] = await make_request(index)
+            except httpx.HTTPError:
+                pass
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, count))))
+    recorder.durations[route] = time.perf_counter() - started
+    return results
+
+
+async def run_scenario(base_url: str, args) -> dict:
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        users = args.users
+
+        async def signup(i: int):
+            payload = {
+                "username": f"bench_{run_id}_{i}",
+                "email": f"bench_{run_id}_{i}@example.com",
+                "password": "benchmark-password",
+                "full_name": f"Bench User {i}",
+            }
+            return await recorder.request(client, "POST /api/signup", "POST", "/api/signup", json=payload)
+
+        async def login(i: int):
+            form = {"username": f"bench_{run_id}_{i % users}", "password": "benchmark-password"}
+            response = await recorder.request(client, "POST /api/login", "POST", "/api/login", data=form)
+            return response.json().get("access_token") if response.status_code == 200 else None
+
+        await run_phase(recorder, "POST /api/signup", users, args.concurrency, signup)
+        tokens = [token for token in await run_phase(recorder, "POST /api/login", users, args.concurrency, login) if token]
+        if not tokens:
+            raise RuntimeError("No successful logins; is the database reachable and migrated?")
+
+        async def create_post(i: int):
+            headers = {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}
+            response = await recorder.request(
+                client, "POST /api/posts", "POST", "/api/posts",
+                json={"content": f"benchmark post {run_id} {i}"}, headers=headers,
+            )
+            return response.json().get("id") if response.status_code == 201 else None
+
+        post_ids = [post_id for post_id in await run_phase(
+            recorder, "POST /api/posts", args.requests, args.concurrency, create_post
+        ) if post_id]
+        if not post_ids:
+            errors = recorder.errors["POST /api/posts"]
+            raise RuntimeError(f"No posts were created ({errors} failed POST /api/posts); cannot run the read phases.")
+
+        async def get_post(i: int):
+            post_id = post_ids[(i * 7919) % len(post_ids)]
+            return await recorder.request(client, "GET /api/posts/{post_id}", "GET", f"/api/posts/{post_id}")
+
+        async def list_posts(i: int):
+            params = {"skip": (i * 10) % max(len(post_ids), 1), "limit": args.page_size}
+            return await recorder.request(client, "GET /api/posts?skip", "GET", "/api/posts", params=params)
+
+        async def list_posts_cursor(i: int):
+            # 매 요청마다 첫 페이지부터 pages 만큼 따라가며 커서 경로의 깊은 페이지 비용을 측정합니다.
+            cursor = ""
+            for _ in range(args.pages):
+                response = await recorder.request(
+                    client, "GET /api/posts?cursor", "GET", "/api/posts",
+                    params={"cursor": cursor, "limit": args.page_size},
+                )
+                cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+                if not cursor:
+                    break
+
+        await run_phase(recorder, "GET /api/posts/{post_id}", args.requests, args.concurrency, get_post)
+        await run_phase(recorder, "GET /api/posts?skip", args.requests, args.concurrency, list_posts)
+        await run_phase(recorder, "GET /api/posts?cursor", max(args.requests // args.pages, 1), args.concurrency, list_posts_cursor)
+
+    return recorder.report()
+
+
+async def serve_and_run(args) -> dict:
+    import uvicorn
+    from main import app
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning", lifespan="on")
+    server = uvicorn.Server(config)
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        if server_task.done():
+            server_task.result()
+        await asyncio.sleep(0.05)
+    try:
+        return await run_scenario(f"http://127.0.0.1:{args.port}", args)
+    finally:
+        server.should_exit = True
+        await server_task
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the SNS API and report per-route latency.")
+    parser.add_argument("--base-url", help="target an already running server instead of booting main.app")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per read/write phase")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=5, help="pages followed per cursor walk")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="also write the JSON report to this path (e.g. outside the repo)")
+    args = parser.parse_args()
+
+    try:
+        if args.base_url:
+            routes = asyncio.run(run_scenario(args.base_url, args))
+        else:
+            routes = asyncio.run(serve_and_run(args))
+    except RuntimeError as error:
+        raise SystemExit(f"load_test: {error}")
+
+    result = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "requests": args.requests,
+            "page_size": args.page_size,
+        },
+        "routes": routes,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+            f.write("\n")
+    print(json.dumps(routes, indent=2))
+
+
+if __name__ == "__main__":
+    main()
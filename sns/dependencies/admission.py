@@ -0,0 +1,158 @@
+from functools import lru_cache
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+from .config import get_config
+from .database import pool_wait_stats
+
+# 커넥션 풀이나 이벤트 루프를 오래 붙잡지 않는 읽기 요청. 나머지는 쓰기로 보고 먼저 버립니다.
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def parse_route_limits(spec: str) -> dict[str, int]:
+    # "POST /api/signup:8,POST /api/login:16" -> {"POST /api/signup": 8, "POST /api/login": 16}
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, limit = item.rpartition(":")
+        method, _, path = route.strip().partition(" ")
+        limits[f"{method.upper()} {path.strip()}"] = int(limit)
+    return limits
+
+
+def overloaded_response(detail: str, retry_after: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": detail},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+class AdmissionController:
+    """처리 중인 요청 수와 DB 풀 대기 수를 보고 요청을 받을지 바로 503으로 돌려보낼지 정합니다.
+
+    쓰기 요청은 더 낮은 기준(write_*)을 넘으면 버리므로, 과부하가 시작되면 bcrypt 같은 비싼 쓰기부터
+    줄고 남은 여유는 읽기가 씁니다. 라우트별 한도는 "METHOD /경로 템플릿" 단위의 동시 처리 수입니다.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        write_in_flight: int,
+        max_pool_waiting: int,
+        write_pool_waiting: int,
+        route_limits: Optional[dict[str, int]] = None,
+        retry_after: int = 1,
+    ):
+        self.max_in_flight = max_in_flight
+        self.write_in_flight = min(write_in_flight, max_in_flight)
+        self.max_pool_waiting = max_pool_waiting
+        self.write_pool_waiting = min(write_pool_waiting, max_pool_waiting)
+        self.route_limits = route_limits or {}
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.in_flight_writes = 0
+        self.route_in_flight = dict.fromkeys(self.route_limits, 0)
+        self.admitted = 0
+        self.shed_in_flight = 0
+        self.shed_pool = 0
+        self.shed_route = 0
+        self.pool_timeouts = 0
+
+    def rejection(self, write: bool, route: Optional[str]) -> Optional[str]:
+        """받을 수 없으면 이유를 돌려줍니다. None이면 받아도 됩니다."""
+        if self.in_flight >= (self.write_in_flight if write else self.max_in_flight):
+            self.shed_in_flight += 1
+            return "Too many requests in flight"
+        if pool_wait_stats.waiting >= (self.write_pool_waiting if write else self.max_pool_waiting):
+            self.shed_pool += 1
+            return "Database connection pool is saturated"
+        if route is not None and self.route_in_flight[route] >= self.route_limits[route]:
+            self.shed_route += 1
+            return f"Too many concurrent requests to {route}"
+        return None
+
+    def enter(self, write: bool, route: Optional[str]) -> None:
+        self.admitted += 1
+        self.in_flight += 1
+        if write:
+            self.in_flight_writes += 1
+        if route is not None:
+            self.route_in_flight[route] += 1
+
+    def leave(self, write: bool, route: Optional[str]) -> None:
+        self.in_flight -= 1
+        if write:
+            self.in_flight_writes -= 1
+        if route is not None:
+            self.route_in_flight[route] -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "in_flight_writes": self.in_flight_writes,
+            "max_in_flight": self.max_in_flight,
+            "pool_waiting": pool_wait_stats.waiting,
+            "admitted": self.admitted,
+            "shed_in_flight": self.shed_in_flight,
+            "shed_pool": self.shed_pool,
+            "shed_route": self.shed_route,
+            "pool_timeouts": self.pool_timeouts,
+            "routes": dict(self.route_in_flight),
+        }
+
+
+@lru_cache
+def get_admission_controller() -> AdmissionController:
+    config = get_config()
+    return AdmissionController(
+        max_in_flight=config.admission_max_in_flight,
+        write_in_flight=config.admission_write_in_flight,
+        max_pool_waiting=config.admission_max_pool_waiting,
+        write_pool_waiting=config.admission_write_pool_waiting,
+        route_limits=parse_route_limits(config.admission_route_limits),
+        retry_after=config.admission_retry_after_seconds,
+    )
+
+
+class AdmissionMiddleware:
+    """라우팅 전에 AdmissionController에 물어보고, 버릴 요청은 핸들러와 DB에 닿기 전에 503으로 끝냅니다."""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or get_admission_controller()
+        self._limited_routes: Optional[list] = None
+
+    def _limited_route(self, scope) -> Optional[str]:
+        # 한도가 걸린 라우트만 미리 골라 두고, 요청마다 그 라우트들과만 경로를 맞춰 봅니다.
+        if self._limited_routes is None:
+            self._limited_routes = [
+                (route, f"{method} {route.path}")
+                for route in scope["app"].routes
+                for method in getattr(route, "methods", None) or ()
+                if f"{method} {route.path}" in self.controller.route_limits
+            ]
+        for route, key in self._limited_routes:
+            if key.startswith(scope["method"] + " ") and route.matches(scope)[0] == Match.FULL:
+                return key
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        write = scope["method"] not in READ_METHODS
+        route = self._limited_route(scope) if controller.route_limits else None
+        reason = controller.rejection(write, route)
+        if reason is not None:
+            await overloaded_response(reason, controller.retry_after)(scope, receive, send)
+            return
+
+        controller.enter(write, route)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.leave(write, route)
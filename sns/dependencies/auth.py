@@ -6,9 +6,6 @@ from .config import get_config
 
 ALGORITHM = "HS256"
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-conf_vars = get_config()
-secret_key = conf_vars.jwt_secret_key
-jwt_expire_minutes = conf_vars.jwt_expire_minutes
 
 
 
@@ -19,12 +16,14 @@ def hash_password(password):
     return pwd_context.hash(password)
 
 def create_access_token(data: dict):
+    # 설정은 import 시점이 아니라 호출 시점에 읽습니다.
+    config = get_config()
     to_encode = data.copy()
 
     # JWT 토큰의 만료 시간을 설정합니다.
-    expire = datetime.now(timezone.utc) + timedelta(minutes=jwt_expire_minutes)
+    expire = datetime.now(timezone.utc) + timedelta(minutes=config.jwt_expire_minutes)
     to_encode.update({"exp": expire})
 
     # JWT 토큰을 생성합니다.
-    encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, config.jwt_secret_key, algorithm=ALGORITHM)
     return encoded_jwt
\ No newline at end of file
@@ -0,0 +1,145 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from .config import get_config
+
+
+class CacheBackend:
+    """캐시 백엔드 인터페이스. 외부 캐시(Redis 등)를 붙일 수 있도록 모든 연산은 async입니다."""
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        # read-through: 로딩 도중 무효화가 일어났다면 읽어 온 값은 이미 낡았을 수 있으므로 저장하지 않습니다.
+        value = await self.get(key)
+        if value is not None:
+            return value
+        generation = self.generation
+        value = await loader()
+        if value is not None and generation == self.generation:
+            await self.set(key, value)
+        return value
+
+    @property
+    def generation(self) -> int:
+        return 0
+
+
+class NullCache(CacheBackend):
+    def __init__(self):
+        self._misses = 0
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        self._misses += 1
+        return None
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        pass
+
+    async def delete(self, key: Hashable) -> None:
+        pass
+
+    async def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "none", "size": 0, "hits": 0, "misses": self._misses, "evictions": 0, "expirations": 0}
+
+
+class MemoryCache(CacheBackend):
+    """프로세스 내 LRU + TTL 캐시. 워커 프로세스마다 따로 존재하므로 무효화도 프로세스 단위입니다."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def delete(self, key: Hashable) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
+
+
+_caches: dict[str, CacheBackend] = {}
+
+
+def create_cache(maxsize: int, ttl: float) -> CacheBackend:
+    backend = get_config().cache_backend
+    if backend == "memory":
+        return MemoryCache(maxsize=maxsize, ttl=ttl)
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def get_cache(name: str, maxsize: Optional[int] = None, ttl: Optional[float] = None) -> CacheBackend:
+    cache = _caches.get(name)
+    if cache is None:
+        config = get_config()
+        cache = _caches[name] = create_cache(
+            maxsize if maxsize is not None else config.cache_maxsize,
+            ttl if ttl is not None else config.cache_ttl_seconds,
+        )
+    return cache
+
+
+def cache_stats() -> dict[str, dict]:
+    return {name: cache.stats() for name, cache in _caches.items()}
@@ -0,0 +1,270 @@
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Callable, Optional
+
+from .cache import CacheBackend, get_cache
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = """
+당신은 인기 있는 라이프스타일 인플루언서입니다. 일상의 순간들을 진솔하고 매력적으로 공유하는 것으로 유명합니다.
+당신의 포스트는 항상 진실되고, 개인적이며, 팔로워들과 깊은 유대감을 형성합니다.
+트렌디하면서도 당신만의 독특한 개성을 잃지 않는 방식으로 콘텐츠를 만듭니다.
+"""
+
+USER_PROMPT = """
+제공된 이미지를 당신의 일상 중 한 순간으로 간주하고, 인스타그램 포스트를 위한 다음 내용을 생성해주세요:
+
+1. 해시태그 (최대 5개):
+   - 당신의 일상, 감정, 경험을 반영하는 태그
+   - 개인적이고 친근한 느낌의 태그 포함
+   - 트렌디하면서도 자연스러운 태그 사용
+   - 한글 또는 영어 사용 가능
+   - 각 태그 앞에 '#' 기호 사용
+
+2. 캡션 (200자 이내, 한국어):
+   - 이미지와 관련된 개인적인 이야기나 감정을 공유
+   - 친근하고 대화하는 듯한 톤 사용
+   - 팔로워들과 소통하는 느낌을 주는 문구 포함 (예: 질문하기)
+   - 자연스럽게 이모지 사용
+
+결과는 다음 형식으로 제공해주세요:
+해시태그: #태그1 #태그2 #태그3 #태그4 #태그5
+캡션: [생성된 캡션]
+
+주의: 이미지에 텍스트가 포함된 경우, 그 내용을 직접 인용하지 마세요. 대신 그 상황에 대한 당신의 개인적인 생각이나 느낌을 표현하세요.
+"""
+
+_HASHTAG_LINE = re.compile(r"해시태그\s*:\s*(.*)")
+_CAPTION_LINE = re.compile(r"캡션\s*:\s*(.*)", re.S)
+
+
+class CaptionResult:
+    __slots__ = ("caption", "hashtags")
+
+    def __init__(self, caption: str, hashtags: list[str]):
+        self.caption = caption
+        self.hashtags = hashtags
+
+
+def parse_caption_output(text: str) -> CaptionResult:
+    # "해시태그: #a #b\n캡션: ..." 형식의 모델 출력을 나눕니다. 형식을 벗어나면 전체를 캡션으로 씁니다.
+    hashtags_match = _HASHTAG_LINE.search(text)
+    caption_match = _CAPTION_LINE.search(text)
+    hashtags = re.findall(r"#(\w+)", hashtags_match.group(1)) if hashtags_match else []
+    caption = caption_match.group(1).strip() if caption_match else text.strip()
+    return CaptionResult(caption=caption, hashtags=hashtags[:5])
+
+
+class CaptionBackend:
+    async def generate(self, image_path: str) -> str:
+        raise NotImplementedError
+
+
+class StubCaptionBackend(CaptionBackend):
+    """외부 API 없이 테스트/벤치마크를 돌리기 위한 백엔드. 지연만 흉내 내고 결정적인 결과를 돌려줍니다."""
+
+    def __init__(self, delay: float):
+        self._delay = delay
+        self.calls = 0
+
+    async def generate(self, image_path: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self._delay)
+        tag = hashlib.sha256(image_path.encode()).hexdigest()[:6]
+        return f"해시태그: #일상 #stub{tag}\n캡션: 오늘의 한 장면 📷 여러분의 하루는 어땠나요?"
+
+
+class LangChainCaptionBackend(CaptionBackend):
+    """LangChain MultiModal로 GPT-4o를 호출합니다. invoke가 동기 호출이므로 스레드에서 실행합니다."""
+
+    def __init__(self, model_name: str):
+        from langchain_openai import ChatOpenAI
+        from langchain_teddynote.models import MultiModal
+
+        llm = ChatOpenAI(temperature=0.1, max_tokens=2048, model_name=model_name)
+        self._multimodal = MultiModal(llm, system_prompt=SYSTEM_PROMPT, user_prompt=USER_PROMPT)
+
+    async def generate(self, image_path: str) -> str:
+        return await asyncio.to_thread(self._multimodal.invoke, image_path)
+
+
+class CaptionJob:
+    __slots__ = ("key", "image_path", "status", "result", "error", "done")
+
+    def __init__(self, key: str, image_path: str):
+        self.key = key
+        self.image_path = image_path
+        self.status = "queued"
+        self.result: Optional[CaptionResult] = None
+        self.error: Optional[str] = None
+        self.done = asyncio.Event()
+
+
+class CaptionQueue:
+    """이미지 캡션/해시태그 생성 작업 큐.
+
+    요청 경로에서는 submit으로 작업을 넣기만 하고 바로 돌아가며, 고정된 수의 워커가 백엔드를
+    호출합니다. 결과는 이미지 내용 해시를 키로 캐시하므로 같은 이미지는 모델을 다시 돌리지 않고,
+    처리 중인 같은 키의 작업이 있으면 새로 넣지 않고 그 작업을 돌려줍니다(coalescing).
+    큐가 가득 차면 작업을 버리고 rejected 상태를 돌려주며, 다음 조회 때 다시 시도됩니다.
+    실패한 작업은 failure_ttl 동안 failed로 기억해 조회마다 모델을 다시 부르지 않고, 기한이 지난 뒤
+    들어온 요청에서만 다시 시도합니다. 연속으로 실패할수록 기한을 두 배씩 늘리되 max_failure_ttl을 넘기지 않습니다.
+    """
+
+    def __init__(
+        self,
+        backend: CaptionBackend,
+        workers: int,
+        max_queue: int,
+        cache: CacheBackend,
+        failure_ttl: float = 60,
+        max_failure_ttl: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._backend = backend
+        self._workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._cache = cache
+        self._jobs: dict[str, CaptionJob] = {}
+        # key -> (다시 시도해도 되는 시각, 연속 실패 횟수, 마지막 오류)
+        self._failures: dict[str, tuple[float, int, str]] = {}
+        self._failure_ttl = failure_ttl
+        self._max_failure_ttl = max_failure_ttl
+        self._clock = clock
+        self._tasks: list[asyncio.Task] = []
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._coalesced = 0
+
+    async def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _failed_job(self, key: str, image_path: str) -> Optional[CaptionJob]:
+        failure = self._failures.get(key)
+        if failure is None or self._clock() >= failure[0]:
+            return None
+        job = CaptionJob(key, image_path)
+        job.status, job.error = "failed", failure[2]
+        job.done.set()
+        return job
+
+    def _record_failure(self, key: str, error: str) -> None:
+        now = self._clock()
+        # 오래전에 기한이 지나고 다시 요청되지 않은 기록은 이때 정리합니다.
+        for stale in [k for k, (retry_at, _, _) in self._failures.items() if now - retry_at > self._max_failure_ttl]:
+            del self._failures[stale]
+        _, attempts, _ = self._failures.get(key, (0.0, 0, ""))
+        attempts += 1
+        delay = min(self._failure_ttl * 2 ** (attempts - 1), self._max_failure_ttl)
+        self._failures[key] = (now + delay, attempts, error)
+
+    async def submit(self, key: str, image_path: str) -> CaptionJob:
+        failed = self._failed_job(key, image_path)
+        if failed is not None:
+            return failed
+        job = self._jobs.get(key)
+        if job is None:
+            cached = await self._cache.get(key)
+            if cached is not None:
+                job = CaptionJob(key, image_path)
+                job.status, job.result = "done", cached
+                job.done.set()
+                return job
+            # 캐시를 조회하는 동안 같은 키의 작업이 먼저 들어왔을 수 있습니다.
+            job = self._jobs.get(key)
+        if job is not None:
+            self._coalesced += 1
+            return job
+        job = CaptionJob(key, image_path)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            job.status = "rejected"
+            job.done.set()
+            return job
+        self._jobs[key] = job
+        return job
+
+    async def status(self, key: str) -> Optional[CaptionJob]:
+        job = self._jobs.get(key) or self._failed_job(key, "")
+        if job is not None:
+            return job
+        cached = await self._cache.get(key)
+        if cached is None:
+            return None
+        job = CaptionJob(key, "")
+        job.status, job.result = "done", cached
+        job.done.set()
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            try:
+                output = await self._backend.generate(job.image_path)
+                job.result = parse_caption_output(output)
+                await self._cache.set(job.key, job.result)
+                self._failures.pop(job.key, None)
+                job.status = "done"
+                self._completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Caption job {job.key} failed: {e}")
+                job.status, job.error = "failed", str(e)
+                self._record_failure(job.key, job.error)
+                self._failed += 1
+            finally:
+                self._jobs.pop(job.key, None)
+                job.done.set()
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize(),
+            "in_flight": len(self._jobs),
+            "completed": self._completed,
+            "failed": self._failed,
+            "failures_cached": len(self._failures),
+            "rejected": self._rejected,
+            "coalesced": self._coalesced,
+        }
+
+
+def create_caption_backend(kind: str) -> CaptionBackend:
+    config = get_config()
+    if kind == "stub":
+        return StubCaptionBackend(config.caption_stub_delay_seconds)
+    if kind == "langchain":
+        return LangChainCaptionBackend(config.caption_model)
+    raise ValueError(f"Unknown caption backend: {kind}")
+
+
+@lru_cache
+def get_caption_queue() -> CaptionQueue:
+    config = get_config()
+    return CaptionQueue(
+        backend=create_caption_backend(config.caption_backend),
+        workers=config.caption_workers,
+        max_queue=config.caption_queue_size,
+        cache=get_cache("captions", ttl=config.caption_cache_ttl_seconds),
+        failure_ttl=config.caption_failure_ttl_seconds,
+        max_failure_ttl=config.caption_max_failure_ttl_seconds,
+    )
@@ -0,0 +1,89 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+# MediaPipe Pose의 33개 랜드마크 연결 (mp.solutions.pose.POSE_CONNECTIONS와 같은 값)
+POSE_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+    (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+)
+
+SKELETON_COLOR = (224, 224, 224)
+JOINT_COLOR = (0, 0, 255)
+
+
+class FrameCompositor:
+    """포즈 스켈레톤 영역에 오버레이(아바타 렌더링 등)를 합성합니다. test/test.py의 process_frame 대체.
+
+    한 해상도에 대해 마스크, 팽창 마스크, 오버레이, 출력 버퍼와 팽창 커널을 처음에 한 번 만들고
+    모든 프레임에서 재사용합니다. 합성은 팽창 마스크가 켜진 픽셀만 오버레이로 덮는 한 번의
+    cv2.copyTo이므로 bitwise_and 두 번과 덧셈(uint8 overflow 가능)이 필요 없습니다.
+    반환되는 배열은 내부 버퍼이므로 다음 프레임을 처리하기 전에 쓰거나 복사해야 합니다.
+    """
+
+    def __init__(self, width: int, height: int, mask_thickness: int = 10, kernel_size: int = 20):
+        import cv2
+
+        self._cv2 = cv2
+        self.width = width
+        self.height = height
+        self._thickness = mask_thickness
+        self._kernel = np.ones((kernel_size, kernel_size), np.uint8)
+        self._scale = np.array([width, height], dtype=np.float32)
+        self._mask = np.zeros((height, width), np.uint8)
+        self._dilated = np.zeros((height, width), np.uint8)
+        self._overlay = np.empty((height, width, 3), np.uint8)
+        self._output = np.empty((height, width, 3), np.uint8)
+
+    def _points(self, landmarks) -> list[tuple[int, int]]:
+        # MediaPipe의 정규화 좌표 (x, y[, z]) -> 픽셀 좌표
+        pixels = (np.asarray(landmarks, dtype=np.float32)[:, :2] * self._scale).astype(np.int32)
+        return [tuple(point) for point in pixels.tolist()]
+
+    def _draw(self, image: np.ndarray, points, color, thickness: int, joint_color=None) -> None:
+        cv2 = self._cv2
+        for start, end in POSE_CONNECTIONS:
+            if end < len(points):
+                cv2.line(image, points[start], points[end], color, thickness)
+        if joint_color is not None:
+            for point in points:
+                cv2.circle(image, point, 2, joint_color, -1)
+
+    def landmark_mask(self, landmarks) -> np.ndarray:
+        """스켈레톤을 굵게 그린 뒤 팽창시킨 합성 영역 마스크를 돌려줍니다."""
+        self._mask.fill(0)
+        self._draw(self._mask, self._points(landmarks), 255, self._thickness)
+        return self._cv2.dilate(self._mask, self._kernel, dst=self._dilated)
+
+    def composite(self, frame: np.ndarray, overlay: np.ndarray, mask: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """mask가 0이 아닌 픽셀은 overlay, 나머지는 frame으로 채웁니다. out에 frame을 넘기면 제자리에서 합성합니다."""
+        if out is None:
+            out = self._output
+        if out is not frame:
+            np.copyto(out, frame)
+        return self._cv2.copyTo(overlay, mask, out)
+
+    def process(self, frame: np.ndarray, landmarks, overlay: Optional[np.ndarray] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """process_frame과 같은 결과. overlay가 없으면 스켈레톤을 그린 프레임을 오버레이로 씁니다."""
+        if landmarks is None or len(landmarks) == 0:
+            return frame
+        mask = self.landmark_mask(landmarks)
+        if overlay is None:
+            overlay = self._overlay
+            np.copyto(overlay, frame)
+            self._draw(overlay, self._points(landmarks), SKELETON_COLOR, 2, JOINT_COLOR)
+        return self.composite(frame, overlay, mask, out)
+
+    def process_batch(self, frames: np.ndarray, landmarks: Sequence, overlays: Optional[np.ndarray] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """오프라인 클립용. (N, H, W, 3) 프레임 묶음을 처리해 out(없으면 새 배열 하나)에 채워 돌려줍니다."""
+        if out is None:
+            out = np.empty_like(frames)
+        for i, frame in enumerate(frames):
+            if landmarks[i] is None or len(landmarks[i]) == 0:
+                np.copyto(out[i], frame)
+            else:
+                self.process(frame, landmarks[i], None if overlays is None else overlays[i], out=out[i])
+        return out
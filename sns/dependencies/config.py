@@ -9,11 +9,55 @@ class DefaultConfig(BaseSettings):
     postgresql_table: str = os.getenv("POSTGRESQL_TABLE", "sns")
     postgresql_user: str = os.getenv("POSTGRESQL_USER", "root")
     postgresql_password: str = os.getenv("POSTGRESQL_PASSWORD", "3321")
+    db_pool_size: int = os.getenv("DB_POOL_SIZE", 10)
+    db_max_overflow: int = os.getenv("DB_MAX_OVERFLOW", 10)
+    db_pool_timeout: float = os.getenv("DB_POOL_TIMEOUT", 30)
+    db_pool_recycle: int = os.getenv("DB_POOL_RECYCLE", 1800)
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", True)
+    db_pool_prewarm: int = os.getenv("DB_POOL_PREWARM", 5)
+    db_replica_endpoints: str = os.getenv("DB_REPLICA_ENDPOINTS", "")
+    db_read_your_writes_seconds: float = os.getenv("DB_READ_YOUR_WRITES_SECONDS", 5)
+    admission_enabled: bool = os.getenv("ADMISSION_ENABLED", False)
+    admission_max_in_flight: int = os.getenv("ADMISSION_MAX_IN_FLIGHT", 256)
+    admission_write_in_flight: int = os.getenv("ADMISSION_WRITE_IN_FLIGHT", 128)
+    admission_max_pool_waiting: int = os.getenv("ADMISSION_MAX_POOL_WAITING", 32)
+    admission_write_pool_waiting: int = os.getenv("ADMISSION_WRITE_POOL_WAITING", 8)
+    admission_route_limits: str = os.getenv("ADMISSION_ROUTE_LIMITS", "POST /api/signup:8,POST /api/login:16")
+    admission_retry_after_seconds: int = os.getenv("ADMISSION_RETRY_AFTER_SECONDS", 1)
     jwt_secret_key: str = os.getenv(
         "JWT_SECRET_KEY",
         "5c2fea6305c8c209714e73b265958703e65c4b40dec4c388dddac06f3f791ec7",
     )
     jwt_expire_minutes: int = os.getenv("JWT_TOKEN_EXPIRE_MINUTES", 600)
+    timeline_fanout_limit: int = os.getenv("TIMELINE_FANOUT_LIMIT", 10000)
+    cache_backend: str = os.getenv("CACHE_BACKEND", "memory")
+    cache_maxsize: int = os.getenv("CACHE_MAXSIZE", 10000)
+    cache_ttl_seconds: float = os.getenv("CACHE_TTL_SECONDS", 60)
+    auth_cache_ttl_seconds: float = os.getenv("AUTH_CACHE_TTL_SECONDS", 30)
+    jwt_profile_claims: bool = os.getenv("JWT_PROFILE_CLAIMS", False)
+    password_hash_executor: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    password_hash_workers: int = os.getenv("PASSWORD_HASH_WORKERS", 4)
+    password_hash_max_pending: int = os.getenv("PASSWORD_HASH_MAX_PENDING", 16)
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", False)
+    fast_json_responses: bool = os.getenv("FAST_JSON_RESPONSES", False)
+    search_backend: str = os.getenv("SEARCH_BACKEND", "postgres")
+    trending_window_seconds: float = os.getenv("TRENDING_WINDOW_SECONDS", 3600)
+    trending_bucket_seconds: float = os.getenv("TRENDING_BUCKET_SECONDS", 60)
+    media_root: str = os.getenv("MEDIA_ROOT", "media")
+    media_base_url: str = os.getenv("MEDIA_BASE_URL", "http://localhost:8000/media")
+    media_max_upload_bytes: int = os.getenv("MEDIA_MAX_UPLOAD_BYTES", 20 * 1024 * 1024)
+    media_variant_sizes: str = os.getenv("MEDIA_VARIANT_SIZES", "thumb:320,medium:1080")
+    media_workers: int = os.getenv("MEDIA_WORKERS", 2)
+    caption_backend: str = os.getenv("CAPTION_BACKEND", "stub")
+    caption_model: str = os.getenv("CAPTION_MODEL", "gpt-4o")
+    caption_workers: int = os.getenv("CAPTION_WORKERS", 2)
+    caption_queue_size: int = os.getenv("CAPTION_QUEUE_SIZE", 100)
+    caption_cache_ttl_seconds: float = os.getenv("CAPTION_CACHE_TTL_SECONDS", 86400)
+    caption_failure_ttl_seconds: float = os.getenv("CAPTION_FAILURE_TTL_SECONDS", 60)
+    caption_max_failure_ttl_seconds: float = os.getenv("CAPTION_MAX_FAILURE_TTL_SECONDS", 3600)
+    caption_stub_delay_seconds: float = os.getenv("CAPTION_STUB_DELAY_SECONDS", 0.5)
+    pose_queue_size: int = os.getenv("POSE_QUEUE_SIZE", 4)
+    pose_max_landmarks: int = os.getenv("POSE_MAX_LANDMARKS", 64)
 @lru_cache
 def get_config():
     return DefaultConfig()
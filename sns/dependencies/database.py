@@ -1,56 +1,181 @@
-from typing import Optional
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
 from .config import DefaultConfig
 
+from sqlalchemy import exc
 from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from sqlalchemy.orm import Session, sessionmaker
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+
+logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 DBSessionLocal: Optional[sessionmaker] = None
 db_engine: Optional[Engine] = None
 db_session: Optional[Session] = None
+# 읽기 전용 복제본. DB_REPLICA_ENDPOINTS가 비어 있으면 모든 읽기가 primary로 갑니다.
+replica_engines: list = []
+ReplicaSessionLocals: list[sessionmaker] = []
+_replica_counter = itertools.count()
+_read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
 
 
-def init_db(config: DefaultConfig) -> None:
-    global DBSessionLocal, db_engine, db_session
+class PoolWaitStats:
+    def __init__(self):
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+
+pool_wait_stats = PoolWaitStats()
+# 체크아웃 대기 시간(초)을 받는 콜백들. 요청 단위 계측이 켜져 있을 때만 등록됩니다.
+pool_wait_listeners: list = []
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """커넥션 체크아웃 대기 시간과 대기 중인 요청 수를 기록하는 풀."""
+
+    def connect(self):
+        pool_wait_stats.waiting += 1
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_wait_stats.timeouts += 1
+            raise
+        finally:
+            pool_wait_stats.waiting -= 1
+        wait = time.perf_counter() - started
+        pool_wait_stats.record(wait)
+        for listener in pool_wait_listeners:
+            listener(wait)
+        return connection
 
-    postgres_endpoint = config.postgresql_endpoint
-    postgres_port = config.postgresql_port
-    postgres_table = config.postgresql_table
-    postgres_user = config.postgresql_user
-    postgres_password = config.postgresql_password
 
-    db_url = (
+def _db_url(config: DefaultConfig, endpoint: str, port) -> str:
+    return (
         "postgresql+asyncpg://"
-        + f"{postgres_user}:{postgres_password}"
-        + f"@{postgres_endpoint}:{postgres_port}/{postgres_table}"
+        + f"{config.postgresql_user}:{config.postgresql_password}"
+        + f"@{endpoint}:{port}/{config.postgresql_table}"
+    )
+
+
+def parse_replica_endpoints(spec: str, default_port) -> list[tuple[str, str]]:
+    # "replica1:5432,replica2" -> [("replica1", "5432"), ("replica2", default_port)]
+    endpoints = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        host, _, port = item.partition(":")
+        endpoints.append((host, port or str(default_port)))
+    return endpoints
+
+
+def _create_engine(db_url: str, config: DefaultConfig):
+    return create_async_engine(
+        db_url,
+        poolclass=TimedAsyncQueuePool,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pool_pre_ping,
+    )
+
+
+def _create_sessionmaker(engine) -> sessionmaker:
+    return sessionmaker(
+        bind=engine,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
     )
 
+
+def init_db(config: DefaultConfig) -> None:
+    global DBSessionLocal, db_engine, db_session
+
+    db_url = _db_url(config, config.postgresql_endpoint, config.postgresql_port)
+
     try:
-        db_engine = create_async_engine(db_url)
-        DBSessionLocal = sessionmaker(
-            bind=db_engine,
-            autoflush=False,
-            expire_on_commit=False,
-            class_=AsyncSession,
-        )
+        db_engine = _create_engine(db_url, config)
+        DBSessionLocal = _create_sessionmaker(db_engine)
         print("Database connection successful.")
     except Exception as e:
         print(f"Database connection failed. Reason: {str(e)}")
         print(f"Failed URL: {db_url}")
 
-async def provide_session():
-    if DBSessionLocal is None:
-        raise ImportError("You need to call init_db before this function")
+    replica_engines.clear()
+    ReplicaSessionLocals.clear()
+    for endpoint, port in parse_replica_endpoints(config.db_replica_endpoints, config.postgresql_port):
+        try:
+            engine = _create_engine(_db_url(config, endpoint, port), config)
+        except Exception as e:
+            logger.warning(f"Read replica {endpoint}:{port} skipped. Reason: {e}")
+            continue
+        replica_engines.append(engine)
+        ReplicaSessionLocals.append(_create_sessionmaker(engine))
 
-    async with sessionmaker(
-        bind=db_engine,
-        autoflush=False,
-        expire_on_commit=False,
-        class_=AsyncSession,
-    )() as session:
+
+async def warm_up_pool(connections: int) -> None:
+    # 첫 요청들이 커넥션 생성 비용을 떠안지 않도록 시작 시점에 미리 연결을 만들어 풀에 돌려놓습니다.
+    if db_engine is None or connections <= 0:
+        return
+    engines = [db_engine, *replica_engines]
+    opened = await asyncio.gather(
+        *(engine.connect() for engine in engines for _ in range(connections)), return_exceptions=True
+    )
+    for connection in opened:
+        if isinstance(connection, Exception):
+            logger.warning(f"Pool warm-up connection failed: {connection}")
+        else:
+            await connection.close()
+
+
+async def dispose_db() -> None:
+    if db_engine is not None:
+        await db_engine.dispose()
+    for engine in replica_engines:
+        await engine.dispose()
+
+
+def get_pool_stats() -> dict:
+    if db_engine is None:
+        return {}
+    pool = db_engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "waiting": pool_wait_stats.waiting,
+        "checkouts": pool_wait_stats.checkouts,
+        "timeouts": pool_wait_stats.timeouts,
+        "wait_seconds_total": round(pool_wait_stats.total_wait, 6),
+        "wait_seconds_max": round(pool_wait_stats.max_wait, 6),
+        "replicas": len(replica_engines),
+        "replica_checked_out": sum(engine.sync_engine.pool.checkedout() for engine in replica_engines),
+    }
+
+
+@asynccontextmanager
+async def _session_scope(session_factory: sessionmaker):
+    async with session_factory() as session:
         try:
             yield session
         except Exception as e:
@@ -60,3 +185,109 @@ async def provide_session():
             await session.commit()
         finally:
             await session.close()
+
+
+async def provide_session():
+    if DBSessionLocal is None:
+        raise ImportError("You need to call init_db before this function")
+
+    async with _session_scope(DBSessionLocal) as session:
+        yield session
+
+
+def read_sessionmaker() -> sessionmaker:
+    # 복제본이 없거나 이 요청이 방금 쓰기를 한 클라이언트의 것이면 primary에서 읽습니다.
+    if not ReplicaSessionLocals or _read_from_primary.get():
+        return DBSessionLocal
+    return ReplicaSessionLocals[next(_replica_counter) % len(ReplicaSessionLocals)]
+
+
+async def provide_read_session():
+    """읽기 전용 라우트용 세션. 복제본을 라운드로빈으로 고릅니다. 이 세션으로 쓰기를 하면 안 됩니다.
+
+    복제 지연 중의 값이 모든 사용자에게 퍼지지 않도록, 결과를 공유 캐시에 넣는 라우트는 이 세션 대신
+    provide_session을 써서 캐시 미스를 primary에서 채워야 합니다.
+    """
+    if DBSessionLocal is None:
+        raise ImportError("You need to call init_db before this function")
+
+    async with _session_scope(read_sessionmaker()) as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """쓰기 요청에 성공한 클라이언트의 읽기를 잠시 primary로 고정합니다.
+
+    GET/HEAD/OPTIONS가 아닌 요청이 4xx/5xx 없이 끝나면 만료 시각을 담은 쿠키를 내려주고,
+    그 쿠키가 유효한 동안 들어오는 요청은 provide_read_session이 primary 세션을 씁니다.
+    쿠키를 보관하지 않는 API 클라이언트를 위해, principal_key가 Bearer 토큰에서 꺼낸 인증 주체에도
+    같은 만료 시각을 기록해 두고 그 주체의 요청을 primary로 보냅니다.
+    복제 지연이 window_seconds보다 짧다면 사용자는 항상 자기가 쓴 내용을 보게 됩니다.
+    쿠키는 워커가 여러 개여도 동작하지만, 주체별 기록은 프로세스 메모리에 있으므로 워커별입니다.
+    """
+
+    cookie_name = "db_primary_until"
+    # 주체별 기록이 이 수를 넘으면 만료된 항목을 정리합니다.
+    max_principals = 10000
+
+    def __init__(self, app, window_seconds: float, principal_key: Optional[Callable[[str], Optional[str]]] = None):
+        self.app = app
+        self.window_seconds = window_seconds
+        self.principal_key = principal_key
+        self._primary_until: dict[str, float] = {}
+
+    def _principal(self, scope) -> Optional[str]:
+        if self.principal_key is None:
+            return None
+        for key, value in scope["headers"]:
+            if key == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token.strip():
+                    return self.principal_key(token.strip())
+        return None
+
+    def _sticky(self, scope, principal: Optional[str]) -> bool:
+        now = time.time()
+        if principal is not None and self._primary_until.get(principal, 0.0) > now:
+            return True
+        for key, value in scope["headers"]:
+            if key == b"cookie":
+                until = cookie_parser(value.decode("latin-1")).get(self.cookie_name)
+                try:
+                    # 클라이언트가 임의로 늘린 값은 무시합니다.
+                    return now < float(until) <= now + self.window_seconds
+                except (TypeError, ValueError):
+                    return False
+        return False
+
+    def _mark(self, principal: str, until: float) -> None:
+        if len(self._primary_until) >= self.max_principals:
+            now = time.time()
+            self._primary_until = {key: value for key, value in self._primary_until.items() if value > now}
+        self._primary_until[principal] = until
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes = scope["method"] not in ("GET", "HEAD", "OPTIONS")
+        principal = self._principal(scope)
+        token = _read_from_primary.set(self._sticky(scope, principal))
+
+        async def send_with_cookie(message):
+            if writes and message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window_seconds
+                if principal is not None:
+                    self._mark(principal, until)
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{self.cookie_name}={until:.3f}; Max-Age={int(self.window_seconds) + 1}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _read_from_primary.reset(token)
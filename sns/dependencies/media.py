@@ -0,0 +1,315 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, Request, status
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+# 파일 파트를 감싸는 경계선/파트 헤더에 허용하는 여유분. Content-Length가 한도 + 이 값을 넘으면 바로 거절합니다.
+MULTIPART_OVERHEAD = 16 * 1024
+# 가장 긴 시그니처(WebP: RIFF....WEBP)를 확인하는 데 필요한 바이트 수.
+SIGNATURE_BYTES = 12
+_MEDIA_NAME = re.compile(r"^[0-9a-f]{64}\.[a-z]+$")
+# 확장자는 클라이언트가 보낸 파일명이 아니라 파일 앞부분의 시그니처로 정합니다.
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+
+def detect_extension(head: bytes) -> Optional[str]:
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def _require_extension(head: bytes) -> str:
+    extension = detect_extension(head)
+    if extension is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Only JPEG, PNG, GIF and WebP images are supported",
+        )
+    return extension
+
+
+# 업로드 라우트는 UploadFile 대신 Request를 받으므로, 문서에는 multipart 본문을 직접 적어 둡니다.
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+class MultipartFileReader:
+    """multipart/form-data 본문에서 field 이름의 파일 파트 바이트만 골라내는 점진적 파서.
+
+    받은 본문 조각을 feed에 넣을 때마다 그 조각에 들어 있던 파일 바이트를 돌려주므로,
+    본문 전체를 메모리나 임시 파일에 모으지 않고 바로 저장소로 흘려보낼 수 있습니다.
+    """
+
+    def __init__(self, boundary: bytes, field: str):
+        self._field = field.encode()
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._active = False
+        self._chunks: list[bytes] = []
+        self.found = False
+        self._parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def feed(self, data: bytes) -> list[bytes]:
+        self._parser.write(data)
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+    def _on_part_begin(self) -> None:
+        self._disposition = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field, self._header_value = b"", b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        # 같은 이름의 파일 파트가 여러 개면 첫 번째만 씁니다.
+        self._active = not self.found and options.get(b"name") == self._field and b"filename" in options
+        self.found = self.found or self._active
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._active:
+            self._chunks.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        self._active = False
+
+
+async def request_file_chunks(request: Request, field: str = "file") -> AsyncIterator[bytes]:
+    # request.stream()을 받는 대로 파싱하므로 Starlette의 폼 파서처럼 본문 전체를 먼저 스풀링하지 않습니다.
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a multipart/form-data upload")
+    reader = MultipartFileReader(boundary, field)
+    async for body in request.stream():
+        for chunk in reader.feed(body):
+            yield chunk
+    if not reader.found:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing file field '{field}'")
+
+
+def parse_variant_sizes(spec: str) -> dict[str, int]:
+    # "thumb:320,medium:1080" -> {"thumb": 320, "medium": 1080}
+    sizes = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        label, _, size = item.partition(":")
+        sizes[label] = int(size)
+    return sizes
+
+
+# 프로세스 풀에서 실행되므로 모듈 수준 함수로 두고, Pillow는 여기서만 import합니다.
+def _render_variants(source: str, targets: dict[str, tuple[str, int]], temp_dir: str) -> list[str]:
+    from PIL import Image
+
+    created = []
+    with Image.open(source) as image:
+        image_format = image.format
+        for label, (target, size) in targets.items():
+            if os.path.exists(target):
+                continue
+            variant = image.copy()
+            variant.thumbnail((size, size))
+            if image_format == "JPEG" and variant.mode not in ("RGB", "L"):
+                variant = variant.convert("RGB")
+            partial = os.path.join(temp_dir, f"{os.path.basename(target)}.{os.getpid()}.tmp")
+            variant.save(partial, format=image_format)
+            os.replace(partial, target)
+            created.append(label)
+    return created
+
+
+class StoredMedia:
+    __slots__ = ("name", "path", "size", "created")
+
+    def __init__(self, name: str, path: str, size: int, created: bool):
+        self.name = name
+        self.path = path
+        self.size = size
+        self.created = created
+
+
+class MediaStore:
+    """업로드 파일을 sha256 내용 해시 이름으로 저장하는 로컬 저장소.
+
+    요청 본문을 받는 대로 해시를 계산하며 CHUNK_SIZE 단위로 임시 파일에 쓰고, 한도를 넘는 순간
+    나머지 본문을 받지 않고 413으로 끝냅니다. 다 받으면 <해시>.<확장자>로 원자적으로 옮깁니다.
+    임시 파일은 정적 서빙되는 root 밖, 같은 파일시스템의 형제 디렉터리(.<root 이름>-tmp)에 두어
+    쓰는 도중의 파일이 /media로 노출되지 않게 합니다. 같은 내용이 이미 있으면 임시 파일만 지우므로
+    재업로드는 저장 공간을 쓰지 않습니다. 리사이즈 변형은 별도 프로세스 풀에서 만듭니다.
+    """
+
+    def __init__(self, root: str, base_url: str, max_bytes: int, variant_sizes: dict[str, int], workers: int):
+        self._root = root
+        root_path = os.path.normpath(os.path.abspath(root))
+        self._temp_dir = os.path.join(os.path.dirname(root_path), f".{os.path.basename(root_path)}-tmp")
+        self._base_url = base_url.rstrip("/")
+        self._max_bytes = max_bytes
+        self._variant_sizes = variant_sizes
+        self._workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def path_for(self, name: str) -> str:
+        # 한 디렉터리에 파일이 몰리지 않도록 해시 앞 두 글자로 나눕니다.
+        return os.path.join(self._root, name[:2], name)
+
+    def url_for(self, name: str, variant: Optional[str] = None) -> str:
+        if variant is not None:
+            stem, _, extension = name.partition(".")
+            name = f"{stem}.{variant}.{extension}"
+        return f"{self._base_url}/{name[:2]}/{name}"
+
+    def name_from_url(self, url: Optional[str]) -> Optional[str]:
+        # 이 저장소가 발급한 URL이면 파일 이름(<해시>.<확장자>)을, 외부 URL이면 None을 돌려줍니다.
+        if not url or not url.startswith(self._base_url + "/"):
+            return None
+        name = url.rsplit("/", 1)[-1]
+        return name if _MEDIA_NAME.match(name) else None
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds {self._max_bytes} bytes",
+        )
+
+    async def save_stream(self, chunks: AsyncIterator[bytes]) -> StoredMedia:
+        os.makedirs(self._temp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        extension = None
+        buffer = bytearray()
+        handle, temp_path = tempfile.mkstemp(dir=self._temp_dir, suffix=".upload")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                # 본문 조각은 수십 KB 단위로 오므로 CHUNK_SIZE만큼 모아서 스레드 풀로 씁니다.
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self._max_bytes:
+                        raise self._too_large()
+                    digest.update(chunk)
+                    buffer += chunk
+                    if extension is None and len(buffer) >= SIGNATURE_BYTES:
+                        extension = _require_extension(bytes(buffer[:SIGNATURE_BYTES]))
+                    if len(buffer) >= CHUNK_SIZE:
+                        await run_in_threadpool(temp_file.write, buffer)
+                        buffer.clear()
+                if not size:
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty upload")
+                if extension is None:
+                    extension = _require_extension(bytes(buffer))
+                await run_in_threadpool(temp_file.write, buffer)
+
+            name = f"{digest.hexdigest()}.{extension}"
+            path = self.path_for(name)
+            created = not os.path.exists(path)
+            if created:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+            return StoredMedia(name, path, size, created)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    async def create_variants(self, media: StoredMedia) -> list[str]:
+        if not self._variant_sizes:
+            return []
+        stem, _, extension = media.name.partition(".")
+        targets = {
+            label: (self.path_for(f"{stem}.{label}.{extension}"), size)
+            for label, size in self._variant_sizes.items()
+            if not os.path.exists(self.path_for(f"{stem}.{label}.{extension}"))
+        }
+        # 같은 내용을 다시 올린 경우 변형도 이미 있으므로 풀에 작업을 보내지 않습니다.
+        if not targets:
+            return []
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, _render_variants, media.path, targets, self._temp_dir
+            )
+        except ImportError:
+            logger.warning("Pillow is not installed; skipping image variants")
+        except Exception as e:
+            logger.warning(f"Could not create variants for {media.name}: {e}")
+        return []
+
+    async def store(self, request: Request, field: str = "file") -> str:
+        # 선언된 길이만으로 한도를 넘는 요청은 본문을 한 바이트도 받지 않고 거절합니다.
+        length = request.headers.get("content-length", "")
+        if length.isdigit() and int(length) > self._max_bytes + MULTIPART_OVERHEAD:
+            raise self._too_large()
+        chunks = request_file_chunks(request, field)
+        try:
+            media = await self.save_stream(chunks)
+        finally:
+            await chunks.aclose()
+        await self.create_variants(media)
+        return self.url_for(media.name)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+@lru_cache
+def get_media_store() -> MediaStore:
+    config = get_config()
+    return MediaStore(
+        root=config.media_root,
+        base_url=config.media_base_url,
+        max_bytes=config.media_max_upload_bytes,
+        variant_sizes=parse_variant_sizes(config.media_variant_sizes),
+        workers=config.media_workers,
+    )
@@ -0,0 +1,188 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestTimings:
+    __slots__ = ("query_count", "sql_seconds", "pool_wait_seconds", "password_hash_seconds")
+
+    def __init__(self):
+        self.query_count = 0
+        self.sql_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.password_hash_seconds = 0.0
+
+    def server_timing(self, handler_seconds: float) -> str:
+        # Server-Timing의 dur 단위는 밀리초입니다.
+        return ", ".join([
+            f'db;dur={self.sql_seconds * 1000:.2f};desc="{self.query_count} queries"',
+            f"pool;dur={self.pool_wait_seconds * 1000:.2f}",
+            f"hash;dur={self.password_hash_seconds * 1000:.2f}",
+            f"app;dur={handler_seconds * 1000:.2f}",
+        ])
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current_timings.get()
+
+
+def record_pool_wait(seconds: float) -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.pool_wait_seconds += seconds
+
+
+def record_password_hash(seconds: float) -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.password_hash_seconds += seconds
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, label_names: tuple, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            # [버킷별 카운트..., +Inf 카운트, 합계]
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            label_text = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+LABELS = ("method", "route")
+request_duration = Histogram("http_request_duration_seconds", "Time spent handling the request.", LABELS)
+request_sql_duration = Histogram("http_request_sql_duration_seconds", "Time spent executing SQL per request.", LABELS)
+request_sql_queries = Histogram("http_request_sql_queries", "SQL statements executed per request.", LABELS, QUERY_COUNT_BUCKETS)
+request_pool_wait = Histogram("http_request_pool_wait_seconds", "Time spent waiting for a pooled DB connection per request.", LABELS)
+request_password_hash = Histogram("http_request_password_hash_seconds", "Time spent in bcrypt hashing/verification per request.", LABELS)
+HISTOGRAMS = (request_duration, request_sql_duration, request_sql_queries, request_pool_wait, request_password_hash)
+
+# 게이지는 각 모듈의 stats 함수를 /metrics 요청 시점에 읽어 옵니다. (이름, 설명, dict를 돌려주는 함수)
+gauge_sources: list = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.query_count += 1
+        timings.sql_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine) -> None:
+    # 앱 lifespan이 같은 엔진으로 여러 번 시작돼도(테스트 등) 이벤트가 중복 등록되지 않게 합니다.
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+_route_templates: dict = {}
+
+
+def route_template(scope) -> str:
+    # 경로 파라미터가 채워진 실제 URL 대신 라우트 템플릿을 라벨로 써서 시계열 수가 폭증하지 않도록 합니다.
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    template = _route_templates.get(endpoint)
+    if template is None:
+        app = scope.get("app")
+        for route in getattr(app, "routes", []):
+            if getattr(route, "endpoint", None) is endpoint:
+                template = route.path
+                break
+        template = _route_templates[endpoint] = template or "unmatched"
+    return template
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_with_server_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_timings.reset(token)
+            labels = (scope["method"], route_template(scope))
+            request_duration.observe(labels, elapsed)
+            request_sql_duration.observe(labels, timings.sql_seconds)
+            request_sql_queries.observe(labels, timings.query_count)
+            request_pool_wait.observe(labels, timings.pool_wait_seconds)
+            request_password_hash.observe(labels, timings.password_hash_seconds)
+
+
+def render_metrics() -> str:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    for name, documentation, collect in gauge_sources:
+        values = collect()
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} gauge")
+        for key, value in sorted(values.items()):
+            # 한 단계 중첩된 dict(예: 캐시 이름별 통계)는 name 라벨로 펼칩니다.
+            series = value.items() if isinstance(value, dict) else [(None, value)]
+            for inner_key, inner_value in series:
+                if not isinstance(inner_value, (int, float)) or isinstance(inner_value, bool):
+                    continue
+                if inner_key is None:
+                    lines.append(f'{name}{{key="{key}"}} {inner_value}')
+                else:
+                    lines.append(f'{name}{{name="{key}",key="{inner_key}"}} {inner_value}')
+    return "\n".join(lines) + "\n"
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from .config import get_config
+from .metrics import record_password_hash
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# 프로세스 풀에서도 pickle 가능하도록 모듈 수준 함수로 둡니다.
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """bcrypt 해싱/검증을 이벤트 루프 밖의 제한된 풀에서 실행합니다.
+
+    동시에 처리 중이거나 대기 중인 작업이 max_workers + max_pending 개를 넘으면
+    큐에 쌓지 않고 즉시 503을 돌려줍니다.
+    """
+
+    def __init__(self, executor: Executor, max_workers: int, max_pending: int):
+        self._executor = executor
+        self._capacity = max_workers + max_pending
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, plain_password, hashed_password)
+
+    async def _run(self, fn, *args):
+        if self._in_flight >= self._capacity:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent authentication requests",
+                headers={"Retry-After": "1"},
+            )
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            record_password_hash(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self._capacity,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_password_hasher(kind: str, max_workers: int, max_pending: int) -> PasswordHasher:
+    # pyca bcrypt는 해싱 중 GIL을 놓기 때문에 기본값인 스레드 풀로도 코어 수만큼 병렬 처리됩니다.
+    if kind == "thread":
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+    elif kind == "process":
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        raise ValueError(f"Unknown password hasher executor: {kind}")
+    return PasswordHasher(executor, max_workers=max_workers, max_pending=max_pending)
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    config = get_config()
+    return create_password_hasher(
+        config.password_hash_executor,
+        config.password_hash_workers,
+        config.password_hash_max_pending,
+    )
@@ -0,0 +1,39 @@
+from functools import lru_cache
+from typing import Any, List
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response
+
+from .config import get_config
+
+
+@lru_cache
+def _list_adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+class DTOResponse(Response):
+    """서비스가 이미 검증해 만든 DTO(또는 DTO 리스트)를 한 번에 JSON 바이트로 직렬화하는 응답.
+
+    pydantic-core의 dump_json으로 곧바로 bytes를 만들므로 response_model 재검증과
+    jsonable_encoder + json.dumps 단계를 모두 건너뜁니다.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        if isinstance(content, list):
+            if not content:
+                return b"[]"
+            return _list_adapter(type(content[0])).dump_json(content)
+        raise TypeError(f"DTOResponse expects a DTO or a list of DTOs, got {type(content).__name__}")
+
+
+def dto_response(content: Any, status_code: int = 200) -> Any:
+    # 라우트가 Response를 직접 돌려주면 FastAPI는 response_model 검증/직렬화를 생략합니다.
+    # 옵션이 꺼져 있으면 DTO를 그대로 돌려줘 기존 경로를 탑니다. (response_model은 문서화 용도로 유지)
+    if not get_config().fast_json_responses:
+        return content
+    return DTOResponse(content, status_code=status_code)
@@ -0,0 +1,256 @@
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+# DeepLabv3(PASCAL VOC) 출력에서 사람 클래스 번호
+PERSON_CLASS = 15
+
+_END = object()
+
+
+class SegmentationModel:
+    def predict_batch(self, frames: np.ndarray) -> np.ndarray:
+        """(N, H, W, 3) uint8 BGR 프레임 묶음을 받아 (N, H, W) uint8 마스크(0 또는 255)를 돌려줍니다."""
+        raise NotImplementedError
+
+
+class StubSegmentationModel(SegmentationModel):
+    """모델 파일 없이 테스트/벤치마크를 돌리기 위한 모델.
+
+    추론 비용은 batch_delay + frame_delay * N 만큼 sleep으로 흉내 냅니다. 실제 추론처럼 GIL을
+    놓으므로 다른 단계와 겹쳐 실행됩니다. 마스크는 화면 가운데 타원으로 고정입니다.
+    """
+
+    def __init__(self, batch_delay: float = 0.0, frame_delay: float = 0.0):
+        self._batch_delay = batch_delay
+        self._frame_delay = frame_delay
+        self._masks: dict[tuple[int, int], np.ndarray] = {}
+        self.batches = 0
+
+    def _mask(self, height: int, width: int) -> np.ndarray:
+        mask = self._masks.get((height, width))
+        if mask is None:
+            y, x = np.ogrid[:height, :width]
+            inside = ((y - height / 2) / (height / 2.5)) ** 2 + ((x - width / 2) / (width / 5)) ** 2 <= 1
+            mask = self._masks[(height, width)] = np.where(inside, 255, 0).astype(np.uint8)
+        return mask
+
+    def predict_batch(self, frames: np.ndarray) -> np.ndarray:
+        self.batches += 1
+        time.sleep(self._batch_delay + self._frame_delay * len(frames))
+        return np.broadcast_to(self._mask(*frames.shape[1:3]), frames.shape[:3])
+
+
+class KerasSegmentationModel(SegmentationModel):
+    """test/background.py의 DeepLabv3 Keras 모델. TensorFlow와 OpenCV는 여기서만 import합니다."""
+
+    def __init__(self, model_path: str, input_size: int = 512):
+        import cv2
+        from tensorflow.keras.models import load_model
+
+        self._cv2 = cv2
+        self._model = load_model(model_path)
+        self._input_size = input_size
+
+    def predict_batch(self, frames: np.ndarray) -> np.ndarray:
+        cv2 = self._cv2
+        size = self._input_size
+        height, width = frames.shape[1:3]
+        # MobileNet 계열 DeepLab의 전처리: RGB, [-1, 1] 범위
+        inputs = np.empty((len(frames), size, size, 3), dtype=np.float32)
+        for i, frame in enumerate(frames):
+            inputs[i] = cv2.cvtColor(cv2.resize(frame, (size, size)), cv2.COLOR_BGR2RGB)
+        inputs /= 127.5
+        inputs -= 1.0
+        logits = self._model.predict(inputs, batch_size=len(frames), verbose=0)
+        classes = logits.argmax(axis=-1) == PERSON_CLASS
+        masks = np.empty((len(frames), height, width), dtype=np.uint8)
+        for i, person in enumerate(classes):
+            masks[i] = cv2.resize(person.astype(np.uint8) * 255, (width, height), interpolation=cv2.INTER_NEAREST)
+        return masks
+
+
+def apply_mask(frame: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # test/background.py의 bitwise_and(frame, frame, mask=mask)와 같은 결과: 사람 영역만 남깁니다.
+    return np.where(mask[..., None] > 0, frame, 0).astype(np.uint8, copy=False)
+
+
+def read_video_frames(source) -> Iterator[np.ndarray]:
+    import cv2
+
+    capture = cv2.VideoCapture(source)
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                return
+            yield frame
+    finally:
+        capture.release()
+
+
+class PipelineStats:
+    def __init__(self):
+        self.decoded = 0
+        self.skipped = 0
+        self.inferred = 0
+        self.batches = 0
+        self.composited = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def fps(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return self.composited / elapsed if elapsed > 0 else 0.0
+
+
+class SegmentationPipeline:
+    """디코딩 -> 배치 추론 -> 합성 3단계를 스레드로 나눠 겹쳐 실행하는 세그멘테이션 파이프라인.
+
+    단계 사이는 queue_size 크기의 유한 큐로 이어져 있어 느린 단계가 있으면 앞 단계가 기다리며,
+    메모리에 쌓이는 프레임 수가 제한됩니다. 추론 단계는 큐에 와 있는 프레임을 batch_size까지
+    모아 한 번에 모델에 넣습니다. target_fps를 주면 원본 source_fps에 맞춰 프레임을 솎아내고,
+    추론이 밀려 큐가 가득 찬 경우에도 기다리지 않고 프레임을 건너뛰어 실시간 속도를 유지합니다.
+    """
+
+    def __init__(
+        self,
+        model: SegmentationModel,
+        composite: Callable[[np.ndarray, np.ndarray], np.ndarray] = apply_mask,
+        batch_size: int = 8,
+        queue_size: int = 16,
+        target_fps: Optional[float] = None,
+        source_fps: Optional[float] = None,
+    ):
+        self._model = model
+        self._composite = composite
+        self._batch_size = batch_size
+        self._queue_size = queue_size
+        self._target_fps = target_fps
+        self._source_fps = source_fps
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.stats = PipelineStats()
+
+    def _keep(self, index: int) -> bool:
+        # source_fps 30, target_fps 10이면 세 프레임마다 하나를 남깁니다.
+        if not self._target_fps or not self._source_fps or self._target_fps >= self._source_fps:
+            return True
+        ratio = self._target_fps / self._source_fps
+        return int((index + 1) * ratio) != int(index * ratio)
+
+    def _put(self, target: queue.Queue, item) -> None:
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, source: queue.Queue):
+        # 다른 단계가 실패해 멈춘 경우에도 빠져나올 수 있도록 timeout을 두고 기다립니다.
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _fail(self, error: BaseException) -> None:
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _decode(self, frames: Iterable[np.ndarray], decoded: queue.Queue) -> None:
+        try:
+            for index, frame in enumerate(frames):
+                if self._stop.is_set():
+                    break
+                self.stats.decoded += 1
+                if not self._keep(index):
+                    self.stats.skipped += 1
+                    continue
+                if self._target_fps:
+                    try:
+                        decoded.put_nowait(frame)
+                    except queue.Full:
+                        self.stats.skipped += 1
+                    continue
+                self._put(decoded, frame)
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(decoded, _END)
+
+    def _infer(self, decoded: queue.Queue, inferred: queue.Queue) -> None:
+        try:
+            done = False
+            while not done:
+                frame = self._get(decoded)
+                if frame is _END:
+                    break
+                batch = [frame]
+                # 첫 프레임은 기다리고, 나머지는 이미 와 있는 만큼만 모아 지연을 늘리지 않습니다.
+                while len(batch) < self._batch_size:
+                    try:
+                        frame = decoded.get_nowait()
+                    except queue.Empty:
+                        break
+                    if frame is _END:
+                        done = True
+                        break
+                    batch.append(frame)
+                frames = np.stack(batch)
+                masks = self._model.predict_batch(frames)
+                self.stats.batches += 1
+                self.stats.inferred += len(batch)
+                for frame, mask in zip(batch, masks):
+                    self._put(inferred, (frame, mask))
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(inferred, _END)
+
+    def _compose(self, inferred: queue.Queue, sink: Callable[[np.ndarray], None]) -> None:
+        try:
+            while True:
+                item = self._get(inferred)
+                if item is _END:
+                    break
+                sink(self._composite(*item))
+                self.stats.composited += 1
+        except Exception as e:
+            self._fail(e)
+
+    def run(self, frames: Iterable[np.ndarray], sink: Callable[[np.ndarray], None]) -> PipelineStats:
+        """frames를 끝까지 처리하고 합성된 프레임을 순서대로 sink에 넘깁니다. 한 단계가 실패하면 그 예외를 다시 던집니다."""
+        decoded: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        inferred: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        self._stop.clear()
+        self._error = None
+        self.stats = PipelineStats()
+        self.stats.started_at = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._decode, args=(frames, decoded), name="segmentation-decode", daemon=True),
+            threading.Thread(target=self._infer, args=(decoded, inferred), name="segmentation-infer", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        # 합성 단계는 호출한 스레드에서 돌려 sink(화면 출력 등)가 메인 스레드에서 실행되게 합니다.
+        self._compose(inferred, sink)
+        self._stop.set()
+        for thread in threads:
+            thread.join()
+        self.stats.finished_at = time.perf_counter()
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    def stop(self) -> None:
+        self._stop.set()
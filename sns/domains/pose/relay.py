@@ -0,0 +1,159 @@
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+
+from dependencies.config import get_config
+
+BINARY_SUBPROTOCOL = "pose.v1.binary"
+JSON_SUBPROTOCOL = "pose.v1.json"
+SUBPROTOCOLS = (BINARY_SUBPROTOCOL, JSON_SUBPROTOCOL)
+
+# 바이너리 프레임: 리틀 엔디언 [seq u32][timestamp f64][landmark 수 u16] + landmark마다 x, y, z float32
+# MediaPipe Pose 33개 기준 410 바이트로, 같은 내용의 JSON(약 2 KB)보다 훨씬 작습니다.
+_HEADER = struct.Struct("<IdH")
+SEQ_MAX = 2 ** 32 - 1
+
+
+class FrameError(ValueError):
+    pass
+
+
+class PoseFrame:
+    """한 프레임의 랜드마크. 포맷별 인코딩은 처음 필요할 때 한 번만 만들고 구독자들이 공유합니다."""
+
+    __slots__ = ("seq", "timestamp", "coordinates", "_binary", "_json")
+
+    def __init__(self, seq: int, timestamp: float, coordinates: tuple, binary: Optional[bytes] = None):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.coordinates = coordinates
+        self._binary = binary
+        self._json: Optional[str] = None
+
+    @property
+    def landmark_count(self) -> int:
+        return len(self.coordinates) // 3
+
+    def to_binary(self) -> bytes:
+        if self._binary is None:
+            count = self.landmark_count
+            self._binary = _HEADER.pack(self.seq, self.timestamp, count) + struct.pack(f"<{count * 3}f", *self.coordinates)
+        return self._binary
+
+    def to_json(self) -> str:
+        # test/pose.py가 보내던 {"landmarks": [[x, y, z], ...]} 형식에 seq/timestamp를 더한 형태입니다.
+        if self._json is None:
+            coordinates = self.coordinates
+            landmarks = [coordinates[i:i + 3] for i in range(0, len(coordinates), 3)]
+            self._json = json.dumps({"seq": self.seq, "timestamp": self.timestamp, "landmarks": landmarks})
+        return self._json
+
+
+def decode_binary(data: bytes, max_landmarks: int) -> PoseFrame:
+    if len(data) < _HEADER.size:
+        raise FrameError("Frame is shorter than the header")
+    seq, timestamp, count = _HEADER.unpack_from(data)
+    if count > max_landmarks or len(data) != _HEADER.size + count * 12:
+        raise FrameError("Frame size does not match its landmark count")
+    # 받은 바이트를 그대로 재사용하므로 바이너리 구독자에게는 다시 인코딩하지 않고 전달됩니다.
+    return PoseFrame(seq, timestamp, struct.unpack_from(f"<{count * 3}f", data, _HEADER.size), binary=data)
+
+
+def decode_json(text: str, seq: int, max_landmarks: int) -> PoseFrame:
+    try:
+        payload = json.loads(text)
+        landmarks = payload["landmarks"]
+        if len(landmarks) > max_landmarks:
+            raise FrameError("Too many landmarks")
+        coordinates = tuple(float(value) for landmark in landmarks for value in landmark[:3])
+        seq = int(payload.get("seq", seq))
+        timestamp = float(payload.get("timestamp", time.time()))
+    except (ValueError, KeyError, TypeError, OverflowError) as e:
+        raise FrameError(f"Invalid JSON frame: {e}")
+    if len(coordinates) != len(landmarks) * 3:
+        raise FrameError("Each landmark needs x, y and z")
+    # 바이너리 구독자에게 보낼 때 u32로 인코딩하므로 여기서 범위를 확인합니다.
+    if not 0 <= seq <= SEQ_MAX:
+        raise FrameError(f"seq must be between 0 and {SEQ_MAX}")
+    return PoseFrame(seq, timestamp, coordinates)
+
+
+class LatestFrameQueue:
+    """구독자별 유한 큐. 가득 차면 가장 오래된 프레임을 버려 느린 소비자가 메모리를 키우지 않게 합니다."""
+
+    def __init__(self, maxsize: int):
+        self._frames: deque = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, frame: PoseFrame) -> None:
+        if len(self._frames) == self._frames.maxlen:
+            self.dropped += 1
+        self._frames.append(frame)
+        self._ready.set()
+
+    async def get(self) -> PoseFrame:
+        while not self._frames:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._frames.popleft()
+
+
+class Subscriber:
+    __slots__ = ("binary", "queue", "sent")
+
+    def __init__(self, binary: bool, queue_size: int):
+        self.binary = binary
+        self.queue = LatestFrameQueue(queue_size)
+        self.sent = 0
+
+
+class PoseRelay:
+    """방(room) 단위로 발행자의 랜드마크 프레임을 구독자들에게 중계합니다.
+
+    publish는 각 구독자 큐에 넣기만 하므로 느린 구독자가 발행자나 다른 구독자를 막지 않습니다.
+    """
+
+    def __init__(self, queue_size: int, max_landmarks: int):
+        self.queue_size = queue_size
+        self.max_landmarks = max_landmarks
+        self._rooms: dict[str, set[Subscriber]] = {}
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self, room: str, binary: bool) -> Subscriber:
+        subscriber = Subscriber(binary, self.queue_size)
+        self._rooms.setdefault(room, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, room: str, subscriber: Subscriber) -> None:
+        self._dropped += subscriber.queue.dropped
+        subscribers = self._rooms.get(room)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._rooms[room]
+
+    def publish(self, room: str, frame: PoseFrame) -> None:
+        self._published += 1
+        for subscriber in self._rooms.get(room, ()):
+            subscriber.queue.put(frame)
+
+    def stats(self) -> dict:
+        subscribers = [subscriber for room in self._rooms.values() for subscriber in room]
+        return {
+            "rooms": len(self._rooms),
+            "subscribers": len(subscribers),
+            "published": self._published,
+            "dropped": self._dropped + sum(subscriber.queue.dropped for subscriber in subscribers),
+        }
+
+
+@lru_cache
+def get_pose_relay() -> PoseRelay:
+    config = get_config()
+    return PoseRelay(config.pose_queue_size, config.pose_max_landmarks)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from ..users.dto import UserProfileDTO
 
 class PostCreateDTO(BaseModel):
@@ -19,4 +19,23 @@ class PostDTO(BaseModel):
     updated_at: datetime
     author: UserProfileDTO
     likes_count: int
-    comments_count: int
\ No newline at end of file
+    comments_count: int
+
+class PostPageDTO(BaseModel):
+    items: List[PostDTO]
+    next_cursor: Optional[str] = None
+
+class LikeStatusDTO(BaseModel):
+    post_id: int
+    liked: bool
+    likes_count: int
+
+class TrendingHashtagDTO(BaseModel):
+    tag: str
+    count: int
+
+class CaptionDTO(BaseModel):
+    post_id: int
+    status: str
+    caption: Optional[str] = None
+    hashtags: List[str] = []
@@ -0,0 +1,55 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete, tuple_
+from ..users.models import PostHashtag
+from datetime import datetime
+from typing import Optional
+
+
+class HashtagRepository:
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get_post_tags(self, post_id: int) -> list[str]:
+        result = await self._session.execute(select(PostHashtag.tag).where(PostHashtag.post_id == post_id))
+        return result.scalars().all()
+
+    async def set_post_hashtags(
+        self, post_id: int, created_at: datetime, tags: list[str]
+    ) -> tuple[list[str], list[str]]:
+        # 게시물의 태그 집합을 통째로 교체하고, 새로 붙은 태그와 떨어진 태그를 돌려줍니다 (트렌딩 집계용).
+        existing = set(await self.get_post_tags(post_id))
+        removed = sorted(existing - set(tags))
+        added = [tag for tag in tags if tag not in existing]
+        if removed:
+            await self._session.execute(
+                delete(PostHashtag).where(PostHashtag.post_id == post_id, PostHashtag.tag.in_(removed))
+            )
+        if added:
+            await self._session.execute(
+                insert(PostHashtag),
+                [{"post_id": post_id, "tag": tag, "created_at": created_at} for tag in added],
+            )
+        if removed or added:
+            await self._session.commit()
+        return added, removed
+
+    async def get_entries(
+        self, tag: str, before: Optional[tuple[datetime, int]], limit: int
+    ) -> list[tuple[datetime, int]]:
+        query = (
+            select(PostHashtag.created_at, PostHashtag.post_id)
+            .where(PostHashtag.tag == tag)
+            .order_by(PostHashtag.created_at.desc(), PostHashtag.post_id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            query = query.where(tuple_(PostHashtag.created_at, PostHashtag.post_id) < before)
+        result = await self._session.execute(query)
+        return result.all()
+
+    async def get_recent_tags(self, since: datetime, until: datetime) -> list[tuple[str, datetime]]:
+        query = select(PostHashtag.tag, PostHashtag.created_at).where(
+            PostHashtag.created_at >= since, PostHashtag.created_at < until
+        )
+        result = await self._session.execute(query)
+        return result.all()
@@ -0,0 +1,144 @@
+import asyncio
+import heapq
+import math
+import re
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+from dependencies.config import get_config
+
+HASHTAG_MAX_LENGTH = 100
+_HASHTAG_PATTERN = re.compile(r"#(\w+)")
+
+
+def extract_hashtags(content: str) -> list[str]:
+    # 소문자로 정규화하고 본문에 처음 나온 순서를 유지한 채 중복을 제거합니다.
+    tags = {}
+    for match in _HASHTAG_PATTERN.finditer(content or ""):
+        tags.setdefault(match.group(1).lower()[:HASHTAG_MAX_LENGTH], None)
+    return list(tags)
+
+
+def normalize_hashtag(tag: str) -> str:
+    return tag.lstrip("#").lower()[:HASHTAG_MAX_LENGTH]
+
+
+class SlidingWindowCounter:
+    """시간 버킷 단위의 슬라이딩 윈도우 카운터.
+
+    bucket_seconds 크기의 버킷을 window_seconds만큼만 유지하며, 버킷이 윈도우 밖으로
+    밀려날 때 그 버킷의 카운트를 누적 합계에서 빼 줍니다. 상위 태그 목록은 합계가 바뀐 뒤
+    최대 refresh_seconds마다 한 번만 다시 계산하므로 top(k)는 캐시된 순위에서 k개를 자르는 비용입니다.
+    카운터는 프로세스 메모리에 있으므로 워커가 여러 개면 워커별 근사치입니다.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        bucket_seconds: float,
+        ranking_size: int = 100,
+        refresh_seconds: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._bucket_seconds = bucket_seconds
+        self._bucket_count = max(1, math.ceil(window_seconds / bucket_seconds))
+        self._ranking_size = ranking_size
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._buckets: deque[tuple[int, Counter]] = deque()
+        self._totals: Counter = Counter()
+        self._ranking: list[tuple[str, int]] = []
+        self._ranking_dirty = False
+        self._ranked_at = -math.inf
+        self.started_at = clock()
+        self.warmed = False
+        self.warm_lock = asyncio.Lock()
+
+    def _oldest_index(self, now: float) -> int:
+        return int(now // self._bucket_seconds) - self._bucket_count + 1
+
+    def _expire(self, now: float) -> None:
+        oldest = self._oldest_index(now)
+        while self._buckets and self._buckets[0][0] < oldest:
+            _, counts = self._buckets.popleft()
+            for key, count in counts.items():
+                remaining = self._totals[key] - count
+                if remaining > 0:
+                    self._totals[key] = remaining
+                else:
+                    del self._totals[key]
+            self._ranking_dirty = True
+
+    def _bucket(self, index: int) -> Counter:
+        if not self._buckets or self._buckets[-1][0] < index:
+            self._buckets.append((index, Counter()))
+            return self._buckets[-1][1]
+        # 워밍업처럼 과거 시각으로 기록할 때만 뒤쪽 버킷을 찾아 들어갑니다.
+        for position, (bucket_index, counts) in enumerate(reversed(self._buckets)):
+            if bucket_index == index:
+                return counts
+            if bucket_index < index:
+                counts = Counter()
+                self._buckets.insert(len(self._buckets) - position, (index, counts))
+                return counts
+        counts = Counter()
+        self._buckets.appendleft((index, counts))
+        return counts
+
+    def add(self, keys: Iterable[str], at: Optional[float] = None) -> None:
+        now = self._clock()
+        at = now if at is None else at
+        self._expire(now)
+        index = int(at // self._bucket_seconds)
+        if index < self._oldest_index(now):
+            return
+        counts = None
+        for key in keys:
+            if counts is None:
+                counts = self._bucket(index)
+            counts[key] += 1
+            self._totals[key] += 1
+            self._ranking_dirty = True
+
+    def remove(self, keys: Iterable[str]) -> None:
+        # 태그가 떨어지거나 게시물이 지워지면 아직 윈도우 안에 남은 가장 최근 버킷에서 하나씩 뺍니다.
+        # 이미 밀려난 버킷에만 있던 태그는 합계에서도 빠진 상태이므로 건너뜁니다.
+        self._expire(self._clock())
+        for key in keys:
+            for _, counts in reversed(self._buckets):
+                if counts[key] > 0:
+                    counts[key] -= 1
+                    if not counts[key]:
+                        del counts[key]
+                    self._totals[key] -= 1
+                    if not self._totals[key]:
+                        del self._totals[key]
+                    self._ranking_dirty = True
+                    break
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        now = self._clock()
+        self._expire(now)
+        if self._ranking_dirty and now - self._ranked_at >= self._refresh_seconds:
+            self._ranking = heapq.nsmallest(
+                self._ranking_size, self._totals.items(), key=lambda item: (-item[1], item[0])
+            )
+            self._ranking_dirty = False
+            self._ranked_at = now
+        return self._ranking[:k]
+
+
+def to_timestamp(value: datetime) -> float:
+    # created_at은 UTC로 저장되며, 드라이버에 따라 tzinfo 없이 올 수 있습니다.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@lru_cache
+def get_trending_counter() -> SlidingWindowCounter:
+    config = get_config()
+    return SlidingWindowCounter(config.trending_window_seconds, config.trending_bucket_seconds)
@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, delete, func, tuple_
 from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from ..users.models import Post, User, Like, Comment
 from fastapi import HTTPException
 from .dto import *
+from ..users.dto import CommentCreateDTO
 from datetime import datetime
+from typing import Optional
 
 
 class PostRepository:
@@ -42,7 +46,8 @@ class PostRepository:
         if post.author_id != user_id:
             raise HTTPException(status_code=403, detail="Not authorized to update this post")
         
-        for key, value in payload.dict(exclude_unset=True).items():
+        # mode="json"으로 HttpUrl을 문자열로 바꿔야 String 컬럼에 저장할 수 있습니다.
+        for key, value in payload.model_dump(mode="json", exclude_unset=True).items():
             setattr(post, key, value)
         
         await self._session.commit()
@@ -58,16 +63,160 @@ class PostRepository:
         await self._session.commit()
 
     async def get_posts(self, skip: int = 0, limit: int = 10) -> list[Post]:
-        query = select(Post).options(joinedload(Post.author)).order_by(Post.created_at.desc()).offset(skip).limit(limit)
+        query = select(Post).options(joinedload(Post.author)).order_by(Post.created_at.desc(), Post.id.desc()).offset(skip).limit(limit)
         result = await self._session.execute(query)
         return result.scalars().all()
 
-    async def get_post_likes_count(self, post_id: int) -> int:
-        query = select(func.count(Like.id)).where(Like.post_id == post_id)
+    async def get_posts_before(self, before: Optional[tuple[datetime, int]], limit: int = 10) -> list[Post]:
+        # (created_at, id) 키셋 페이지네이션: ix_posts_created_at_id 인덱스를 따라 바로 다음 페이지로 이동합니다.
+        query = select(Post).options(joinedload(Post.author)).order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+        if before is not None:
+            query = query.where(tuple_(Post.created_at, Post.id) < before)
         result = await self._session.execute(query)
-        return result.scalar_one()
+        return result.scalars().all()
+
+    async def get_posts_by_ids(self, post_ids: list[int]) -> dict[int, Post]:
+        if not post_ids:
+            return {}
+        query = select(Post).options(joinedload(Post.author)).where(Post.id.in_(post_ids))
+        result = await self._session.execute(query)
+        return {post.id: post for post in result.scalars().all()}
+
+    async def get_posts_likes_counts(self, post_ids: list[int]) -> dict[int, int]:
+        if not post_ids:
+            return {}
+        query = select(Like.post_id, func.count(Like.id)).where(Like.post_id.in_(post_ids)).group_by(Like.post_id)
+        result = await self._session.execute(query)
+        return dict(result.all())
+
+    async def get_posts_comments_counts(self, post_ids: list[int]) -> dict[int, int]:
+        if not post_ids:
+            return {}
+        query = select(Comment.post_id, func.count(Comment.id)).where(Comment.post_id.in_(post_ids)).group_by(Comment.post_id)
+        result = await self._session.execute(query)
+        return dict(result.all())
+
+    async def adjust_counters(self, post_id: int, likes: int = 0, comments: int = 0) -> None:
+        # 좋아요/댓글을 추가·삭제하는 쪽과 같은 트랜잭션 안에서 호출해야 합니다 (커밋은 호출자가 담당).
+        query = (
+            update(Post)
+            .where(Post.id == post_id)
+            # 카운터 변경은 게시물 수정이 아니므로 updated_at의 onupdate가 동작하지 않도록 그대로 둡니다.
+            .values(
+                likes_count=Post.likes_count + likes,
+                comments_count=Post.comments_count + comments,
+                updated_at=Post.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.execute(query)
+
+    async def get_posts_counters(self, after_id: int, limit: int) -> list[tuple[int, int, int]]:
+        query = (
+            select(Post.id, Post.likes_count, Post.comments_count)
+            .where(Post.id > after_id)
+            .order_by(Post.id)
+            .limit(limit)
+        )
+        result = await self._session.execute(query)
+        return result.all()
+
+    async def recount_counters(self, post_ids: list[int]) -> None:
+        likes_count = select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery()
+        comments_count = select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery()
+        query = (
+            update(Post)
+            .where(Post.id.in_(post_ids))
+            .values(likes_count=likes_count, comments_count=comments_count, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.execute(query)
+
+    async def like_post(self, user_id: int, post_id: int) -> int:
+        # INSERT ... ON CONFLICT DO NOTHING과 카운터 갱신을 하나의 문장으로 처리합니다.
+        # 이미 좋아요한 상태라면 삽입된 행이 없으므로 카운터에 0이 더해집니다.
+        inserted = (
+            pg_insert(Like)
+            .values(user_id=user_id, post_id=post_id)
+            .on_conflict_do_nothing(index_elements=[Like.user_id, Like.post_id])
+            .returning(Like.post_id)
+            .cte("inserted_like")
+        )
+        query = (
+            update(Post)
+            .where(Post.id == post_id)
+            .values(
+                likes_count=Post.likes_count + select(func.count()).select_from(inserted).scalar_subquery(),
+                updated_at=Post.updated_at,
+            )
+            .returning(Post.likes_count)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = await self._session.execute(query)
+            likes_count = result.scalar_one_or_none()
+            await self._session.commit()
+        except IntegrityError:
+            await self._session.rollback()
+            raise HTTPException(status_code=404, detail="Post not found")
+        return likes_count
+
+    async def unlike_post(self, user_id: int, post_id: int) -> int:
+        deleted = (
+            delete(Like)
+            .where(Like.user_id == user_id, Like.post_id == post_id)
+            .returning(Like.post_id)
+            .cte("deleted_like")
+        )
+        query = (
+            update(Post)
+            .where(Post.id == post_id)
+            .values(
+                likes_count=Post.likes_count - select(func.count()).select_from(deleted).scalar_subquery(),
+                updated_at=Post.updated_at,
+            )
+            .returning(Post.likes_count)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(query)
+        likes_count = result.scalar_one_or_none()
+        await self._session.commit()
+        if likes_count is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        return likes_count
 
-    async def get_post_comments_count(self, post_id: int) -> int:
-        query = select(func.count(Comment.id)).where(Comment.post_id == post_id)
+    async def create_comment(self, user_id: int, post_id: int, payload: CommentCreateDTO) -> Comment:
+        comment = Comment(
+            content=payload.content,
+            author_id=user_id,
+            post_id=post_id,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        self._session.add(comment)
+        # 댓글 삽입과 comments_count 증가를 한 트랜잭션으로 커밋합니다.
+        try:
+            await self._session.flush()
+            await self.adjust_counters(post_id, comments=1)
+            await self._session.commit()
+        except IntegrityError:
+            await self._session.rollback()
+            raise HTTPException(status_code=404, detail="Post not found")
+        return comment
+
+    async def get_comments_after(self, post_id: int, after: Optional[tuple[datetime, int]], limit: int = 10) -> list[Comment]:
+        # (post_id, created_at, id) 키셋 페이지네이션: 몇 번째 페이지든 인덱스에서 바로 시작 위치를 찾습니다.
+        query = (
+            select(Comment)
+            .where(Comment.post_id == post_id)
+            .order_by(Comment.created_at, Comment.id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(Comment.created_at, Comment.id) > after)
         result = await self._session.execute(query)
-        return result.scalar_one()
\ No newline at end of file
+        return result.scalars().all()
+
+    async def post_exists(self, post_id: int) -> bool:
+        result = await self._session.execute(select(Post.id).where(Post.id == post_id))
+        return result.scalar_one_or_none() is not None
@@ -0,0 +1,159 @@
+import asyncio
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import Float, cast, func, literal_column, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dependencies.config import get_config
+from ..users.models import Post
+
+# 한국어 형태소 분석 사전이 없으므로 공백/구두점 기준으로만 나누는 'simple' 설정을 씁니다.
+TEXT_SEARCH_CONFIG = "simple"
+_TOKEN_PATTERN = re.compile(r"\w+")
+# 마이그레이션에만 있는 생성 컬럼이라 모델 대신 컬럼 표현식으로 참조합니다.
+SEARCH_VECTOR = literal_column("posts.search_vector", TSVECTOR)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchBackend:
+    """게시물 본문 검색 인터페이스.
+
+    search는 (rank, post_id)를 rank 내림차순, 같은 rank에서는 id 내림차순으로 돌려주며
+    after가 주어지면 그 키 다음부터 이어서 반환합니다(키셋 페이지네이션).
+    """
+
+    async def search(
+        self, session: AsyncSession, query: str, after: Optional[tuple[float, int]], limit: int
+    ) -> list[tuple[float, int]]:
+        raise NotImplementedError
+
+    async def index(self, post_id: int, content: str) -> None:
+        pass
+
+    async def remove(self, post_id: int) -> None:
+        pass
+
+
+class PostgresSearchBackend(SearchBackend):
+    """posts.search_vector(생성 컬럼, GIN) 전문 검색 + pg_trgm 단어 유사도로 부분 일치를 보완합니다.
+
+    인덱스는 DB가 생성 컬럼으로 유지하므로 index/remove는 할 일이 없습니다.
+    컬럼과 인덱스, pg_trgm 확장은 alembic 마이그레이션으로 만들어야 합니다.
+    """
+
+    async def search(
+        self, session: AsyncSession, query: str, after: Optional[tuple[float, int]], limit: int
+    ) -> list[tuple[float, int]]:
+        ts_query = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+        # ts_rank_cd/word_similarity는 real이므로 커서 값과 정확히 비교되도록 double로 맞춥니다.
+        rank = cast(
+            func.greatest(func.ts_rank_cd(SEARCH_VECTOR, ts_query), func.word_similarity(query, Post.content)),
+            Float,
+        ).label("rank")
+        matches = (
+            select(rank, Post.id.label("id"))
+            .where(or_(SEARCH_VECTOR.op("@@")(ts_query), Post.content.op("%>")(query)))
+            .subquery()
+        )
+        statement = select(matches.c.rank, matches.c.id).order_by(matches.c.rank.desc(), matches.c.id.desc()).limit(limit)
+        if after is not None:
+            statement = statement.where(tuple_(matches.c.rank, matches.c.id) < after)
+        result = await session.execute(statement)
+        return [(rank, post_id) for rank, post_id in result.all()]
+
+
+class MemorySearchBackend(SearchBackend):
+    """프로세스 내 역색인. Postgres 확장 없이 로컬 개발/테스트에서 같은 인터페이스로 검색합니다.
+
+    첫 검색 때 posts 전체를 읽어 색인을 만들고, 이후에는 서비스가 index/remove로 갱신합니다.
+    질의어는 접두어로 취급해 부분 일치를 지원하며 점수는 TF-IDF 합입니다.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._documents: dict[int, list[str]] = {}
+        self._vocabulary: list[str] = []
+        self._vocabulary_dirty = False
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    async def index(self, post_id: int, content: str) -> None:
+        await self.remove(post_id)
+        tokens = tokenize(content)
+        self._documents[post_id] = tokens
+        for token in tokens:
+            postings = self._postings[token]
+            if not postings:
+                self._vocabulary_dirty = True
+            postings[post_id] = postings.get(post_id, 0) + 1
+
+    async def remove(self, post_id: int) -> None:
+        for token in set(self._documents.pop(post_id, ())):
+            postings = self._postings[token]
+            postings.pop(post_id, None)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+    async def _ensure_loaded(self, session: AsyncSession) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            result = await session.stream(select(Post.id, Post.content))
+            async for post_id, content in result:
+                await self.index(post_id, content)
+            self._loaded = True
+
+    def _expand(self, term: str) -> list[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, term)
+        expanded = []
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            expanded.append(token)
+        return expanded
+
+    async def search(
+        self, session: AsyncSession, query: str, after: Optional[tuple[float, int]], limit: int
+    ) -> list[tuple[float, int]]:
+        await self._ensure_loaded(session)
+        total = max(len(self._documents), 1)
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            for token in self._expand(term):
+                postings = self._postings[token]
+                idf = math.log(1 + total / len(postings))
+                for post_id, frequency in postings.items():
+                    scores[post_id] += frequency / len(self._documents[post_id]) * idf
+
+        ranked = sorted(((score, post_id) for post_id, score in scores.items()), reverse=True)
+        if after is not None:
+            ranked = [key for key in ranked if key < after]
+        return ranked[:limit]
+
+
+def create_search_backend(kind: str) -> SearchBackend:
+    if kind == "postgres":
+        return PostgresSearchBackend()
+    if kind == "memory":
+        return MemorySearchBackend()
+    raise ValueError(f"Unknown search backend: {kind}")
+
+
+@lru_cache
+def get_search_backend() -> SearchBackend:
+    return create_search_backend(get_config().search_backend)
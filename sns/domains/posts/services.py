@@ -1,9 +1,22 @@
 from .repository import PostRepository
+from .timeline_repository import TimelineRepository
+from .search import get_search_backend
+from .hashtag_repository import HashtagRepository
+from .hashtags import extract_hashtags, normalize_hashtag, get_trending_counter, to_timestamp
 from ..users.repositories import UserRepository
-from .dto import PostCreateDTO, PostUpdateDTO, PostDTO
-from ..users.dto import UserProfileDTO
-from ..users.models import Post
+from .dto import PostCreateDTO, PostUpdateDTO, PostDTO, PostPageDTO, LikeStatusDTO, TrendingHashtagDTO, CaptionDTO
+from ..users.dto import UserProfileDTO, CommentCreateDTO, CommentDTO, CommentPageDTO
+from ..users.models import Post, User, Comment
+from ..pagination import encode_cursor, decode_cursor
+from dependencies.config import get_config
+from dependencies.cache import get_cache
+from dependencies.media import get_media_store
+from dependencies.captions import get_caption_queue
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, Request
+from datetime import datetime
+from typing import Optional, Union
 
 
 class PostService:
@@ -11,32 +24,244 @@ class PostService:
         self._session = session
         self._repository = PostRepository(session)
         self._user_repository = UserRepository(session)
+        self._timeline_repository = TimelineRepository(session, get_config().timeline_fanout_limit)
+        self._cache = get_cache("posts")
+        self._search = get_search_backend()
+        self._hashtag_repository = HashtagRepository(session)
+        self._trending = get_trending_counter()
 
     async def create_post(self, user_id: int, payload: PostCreateDTO) -> PostDTO:
         post = await self._repository.create_post(user_id, payload)
+        await self._timeline_repository.fan_out(post)
+        await self._search.index(post.id, post.content)
+        await self._sync_hashtags(post)
+        await self._enqueue_caption(post.image_url)
         return await self._post_to_dto(post)
 
     async def get_post(self, post_id: int) -> PostDTO:
+        return await self._cache.get_or_load(post_id, lambda: self._load_post(post_id))
+
+    async def _load_post(self, post_id: int) -> PostDTO:
         post = await self._repository.get_post_by_id(post_id)
         return await self._post_to_dto(post)
 
     async def update_post(self, post_id: int, user_id: int, payload: PostUpdateDTO) -> PostDTO:
         post = await self._repository.update_post(post_id, user_id, payload)
+        await self._cache.delete(post_id)
+        await self._search.index(post.id, post.content)
+        await self._sync_hashtags(post)
         return await self._post_to_dto(post)
 
+    async def attach_image(self, post_id: int, user_id: int, request: Request) -> PostDTO:
+        # 권한을 먼저 확인해 다른 사람의 게시물로 저장 공간을 채울 수 없게 합니다.
+        post = await self._repository.get_post_by_id(post_id)
+        if post.author_id != user_id:
+            raise HTTPException(status_code=403, detail="Not authorized to update this post")
+        image_url = await get_media_store().store(request)
+        dto = await self.update_post(post_id, user_id, PostUpdateDTO(image_url=image_url))
+        await self._enqueue_caption(image_url)
+        return dto
+
+    async def get_caption(self, post_id: int) -> CaptionDTO:
+        post = await self._repository.get_post_by_id(post_id)
+        name = get_media_store().name_from_url(post.image_url)
+        if name is None:
+            raise HTTPException(status_code=404, detail="Post has no uploaded image")
+        queue = get_caption_queue()
+        job = await queue.status(name)
+        # 캐시에서 밀려났거나 큐가 가득 차 거절된 경우 조회 시점에 다시 넣습니다.
+        # 실패한 작업은 큐가 재시도 기한까지 failed로 돌려주고, 기한이 지나면 None이 되어 다시 들어갑니다.
+        if job is None or job.status == "rejected":
+            job = await self._enqueue_caption(post.image_url)
+        result = job.result
+        return CaptionDTO(
+            post_id=post_id,
+            status=job.status,
+            caption=result.caption if result else None,
+            hashtags=result.hashtags if result else [],
+        )
+
+    async def _enqueue_caption(self, image_url: Optional[str]):
+        # 이 서버에 업로드된 이미지만 대상이며, 요청은 작업을 넣기만 하고 기다리지 않습니다.
+        media_store = get_media_store()
+        name = media_store.name_from_url(image_url)
+        if name is None:
+            return None
+        return await get_caption_queue().submit(name, media_store.path_for(name))
+
     async def delete_post(self, post_id: int, user_id: int) -> None:
+        # post_hashtags 행은 FK CASCADE로 함께 지워지므로 트렌딩에서 뺄 태그를 먼저 읽어 둡니다.
+        tags = await self._hashtag_repository.get_post_tags(post_id)
         await self._repository.delete_post(post_id, user_id)
+        await self._cache.delete(post_id)
+        await self._search.remove(post_id)
+        self._trending.remove(tags)
+
+    async def like_post(self, user_id: int, post_id: int) -> LikeStatusDTO:
+        likes_count = await self._repository.like_post(user_id, post_id)
+        await self._cache.delete(post_id)
+        return LikeStatusDTO(post_id=post_id, liked=True, likes_count=likes_count)
+
+    async def unlike_post(self, user_id: int, post_id: int) -> LikeStatusDTO:
+        likes_count = await self._repository.unlike_post(user_id, post_id)
+        await self._cache.delete(post_id)
+        return LikeStatusDTO(post_id=post_id, liked=False, likes_count=likes_count)
 
     async def get_posts(self, skip: int = 0, limit: int = 10) -> list[PostDTO]:
         posts = await self._repository.get_posts(skip, limit)
-        return [await self._post_to_dto(post) for post in posts]
+        return await self._posts_to_dtos(posts)
+
+    async def get_posts_page(self, cursor: Optional[str] = None, limit: int = 10) -> PostPageDTO:
+        before = decode_cursor(cursor, datetime, int) if cursor else None
+        posts = await self._repository.get_posts_before(before, limit + 1)
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+        return PostPageDTO(items=await self._posts_to_dtos(posts), next_cursor=next_cursor)
+
+    async def search_posts(self, query: str, cursor: Optional[str] = None, limit: int = 10) -> PostPageDTO:
+        if not query.strip():
+            raise HTTPException(status_code=400, detail="Search query must not be empty")
+        after = decode_cursor(cursor, float, int) if cursor else None
+        hits = await self._search.search(self._session, query, after, limit + 1)
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            next_cursor = encode_cursor(*hits[-1])
+
+        # 검색 백엔드는 (rank, id)만 돌려주므로 게시물은 한 번에 읽어 rank 순서대로 배치합니다.
+        posts_by_id = await self._repository.get_posts_by_ids([post_id for _, post_id in hits])
+        posts = [posts_by_id[post_id] for _, post_id in hits if post_id in posts_by_id]
+        return PostPageDTO(items=await self._posts_to_dtos(posts), next_cursor=next_cursor)
+
+    async def get_hashtag_posts(self, tag: str, cursor: Optional[str] = None, limit: int = 10) -> PostPageDTO:
+        before = decode_cursor(cursor, datetime, int) if cursor else None
+        entries = await self._hashtag_repository.get_entries(normalize_hashtag(tag), before, limit + 1)
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = encode_cursor(*entries[-1])
+
+        posts_by_id = await self._repository.get_posts_by_ids([post_id for _, post_id in entries])
+        posts = [posts_by_id[post_id] for _, post_id in entries if post_id in posts_by_id]
+        return PostPageDTO(items=await self._posts_to_dtos(posts), next_cursor=next_cursor)
+
+    async def get_trending_hashtags(self, limit: int = 10) -> list[TrendingHashtagDTO]:
+        await self._warm_trending()
+        return [TrendingHashtagDTO(tag=tag, count=count) for tag, count in self._trending.top(limit)]
+
+    async def _sync_hashtags(self, post: Post) -> None:
+        added, removed = await self._hashtag_repository.set_post_hashtags(
+            post.id, post.created_at, extract_hashtags(post.content)
+        )
+        self._trending.add(added)
+        self._trending.remove(removed)
+
+    async def _warm_trending(self) -> None:
+        # 프로세스가 뜨기 전에 작성된 윈도우 안의 태그를 첫 조회 때 한 번만 채워 넣습니다.
+        # 이후의 태그는 작성 시점에 바로 집계되므로 started_at 이전 행만 읽습니다.
+        if self._trending.warmed:
+            return
+        async with self._trending.warm_lock:
+            if self._trending.warmed:
+                return
+            started_at = self._trending.started_at
+            since = datetime.utcfromtimestamp(started_at - get_config().trending_window_seconds)
+            until = datetime.utcfromtimestamp(started_at)
+            for tag, created_at in await self._hashtag_repository.get_recent_tags(since, until):
+                self._trending.add([tag], at=to_timestamp(created_at))
+            self._trending.warmed = True
+
+    async def get_feed(self, user_id: int, cursor: Optional[str] = None, limit: int = 10) -> PostPageDTO:
+        before = decode_cursor(cursor, datetime, int) if cursor else None
+        # 미리 펼쳐 둔 타임라인과 팬아웃 제외 계정의 글을 (created_at, id) 순으로 병합합니다.
+        entries = await self._timeline_repository.get_entries(user_id, before, limit + 1)
+        entries += await self._timeline_repository.get_pulled_entries(user_id, before, limit + 1)
+        keys = sorted({(created_at, post_id) for created_at, post_id in entries}, reverse=True)[:limit + 1]
+
+        next_cursor = None
+        if len(keys) > limit:
+            keys = keys[:limit]
+            next_cursor = encode_cursor(*keys[-1])
+
+        posts_by_id = await self._repository.get_posts_by_ids([post_id for _, post_id in keys])
+        posts = [posts_by_id[post_id] for _, post_id in keys if post_id in posts_by_id]
+        return PostPageDTO(items=await self._posts_to_dtos(posts), next_cursor=next_cursor)
+
+    async def create_comment(self, user_id: int, post_id: int, payload: CommentCreateDTO) -> CommentDTO:
+        comment = await self._repository.create_comment(user_id, post_id, payload)
+        await self._cache.delete(post_id)
+        dtos = await self._comments_to_dtos([comment])
+        return dtos[0]
+
+    async def get_comments_page(self, post_id: int, cursor: Optional[str] = None, limit: int = 10) -> CommentPageDTO:
+        after = decode_cursor(cursor, datetime, int) if cursor else None
+        comments = await self._repository.get_comments_after(post_id, after, limit + 1)
+        # 빈 페이지일 때만 게시물 존재 여부를 확인해 정상 경로에는 쿼리를 더하지 않습니다.
+        if not comments and not await self._repository.post_exists(post_id):
+            raise HTTPException(status_code=404, detail="Post not found")
+        next_cursor = None
+        if len(comments) > limit:
+            comments = comments[:limit]
+            next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+        return CommentPageDTO(items=await self._comments_to_dtos(comments), next_cursor=next_cursor)
+
+    async def _comments_to_dtos(self, comments: list[Comment]) -> list[CommentDTO]:
+        authors = await self._load_authors(comments)
+        return [
+            CommentDTO(
+                id=comment.id,
+                content=comment.content,
+                created_at=comment.created_at,
+                updated_at=comment.updated_at,
+                author=self._author_to_dto(authors[comment.author_id]),
+                post_id=comment.post_id
+            )
+            for comment in comments
+        ]
 
     async def _post_to_dto(self, post: Post) -> PostDTO:
-        likes_count = await self._repository.get_post_likes_count(post.id)
-        comments_count = await self._repository.get_post_comments_count(post.id)
-        
-        author = await self._user_repository.get_user_by_id(post.author_id)
-        author_dto = UserProfileDTO(
+        dtos = await self._posts_to_dtos([post])
+        return dtos[0]
+
+    async def _posts_to_dtos(self, posts: list[Post]) -> list[PostDTO]:
+        # 카운트는 posts 테이블의 비정규화 컬럼을 그대로 쓰고, 작성자는 페이지 단위로 한 번에 조회합니다.
+        if not posts:
+            return []
+
+        authors = await self._load_authors(posts)
+
+        return [
+            PostDTO(
+                id=post.id,
+                content=post.content,
+                image_url=post.image_url,
+                created_at=post.created_at,
+                updated_at=post.updated_at,
+                author=self._author_to_dto(authors[post.author_id]),
+                likes_count=post.likes_count,
+                comments_count=post.comments_count
+            )
+            for post in posts
+        ]
+
+    async def _load_authors(self, rows: list[Union[Post, Comment]]) -> dict[int, User]:
+        # joinedload로 이미 로드된 작성자는 재사용하고, 나머지만 IN 쿼리 한 번으로 가져옵니다.
+        authors = {}
+        missing_ids = set()
+        for row in rows:
+            if "author" in inspect(row).unloaded:
+                missing_ids.add(row.author_id)
+            else:
+                authors[row.author_id] = row.author
+        if missing_ids:
+            authors.update(await self._user_repository.get_users_by_ids(list(missing_ids)))
+        return authors
+
+    @staticmethod
+    def _author_to_dto(author: User) -> UserProfileDTO:
+        return UserProfileDTO(
             id=author.id,
             username=author.username,
             email=author.email,
@@ -46,15 +271,3 @@ class PostService:
             created_at=author.created_at,
             updated_at=author.updated_at
         )
-        
-        return PostDTO(
-            id=post.id,
-            content=post.content,
-            image_url=post.image_url,
-            created_at=post.created_at,
-            updated_at=post.updated_at,
-            author=author_dto,
-            likes_count=likes_count,
-            comments_count=comments_count
-        )
-
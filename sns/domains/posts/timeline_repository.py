@@ -0,0 +1,76 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, union, tuple_
+from ..users.models import Post, User, Follow, TimelineEntry
+from datetime import datetime
+from typing import Optional
+
+
+class TimelineRepository:
+    """홈 타임라인 저장소.
+
+    팔로워 수가 fanout_limit 이하인 작성자의 글은 작성 시점에 팔로워별 timeline_entries
+    행으로 펼쳐 두고(fan-out-on-write), 그보다 큰 계정의 글은 읽을 때 posts에서 직접
+    가져옵니다(pull-on-read). 한 번의 글 작성이 수백만 행 삽입으로 번지지 않게 하기 위함입니다.
+    """
+
+    def __init__(self, session: AsyncSession, fanout_limit: int):
+        self._session = session
+        self._fanout_limit = fanout_limit
+
+    async def fan_out(self, post: Post) -> bool:
+        followers_count = await self._session.scalar(
+            select(User.followers_count).where(User.id == post.author_id)
+        )
+
+        # 작성자 본인의 타임라인에는 항상 넣습니다.
+        own_entry = select(Post.author_id, Post.id, Post.created_at).where(Post.id == post.id)
+        push_to_followers = followers_count is None or followers_count <= self._fanout_limit
+        if not push_to_followers:
+            entries = own_entry
+        else:
+            follower_entries = (
+                select(Follow.follower_id, Post.id, Post.created_at)
+                .join(Post, Post.author_id == Follow.followed_id)
+                .where(Post.id == post.id)
+            )
+            # UNION으로 중복 팔로우 행이나 자기 자신 팔로우로 인한 PK 충돌을 막습니다.
+            entries = union(own_entry, follower_entries)
+
+        query = insert(TimelineEntry).from_select(["user_id", "post_id", "created_at"], entries)
+        await self._session.execute(query)
+        await self._session.commit()
+        return push_to_followers
+
+    async def get_entries(
+        self, user_id: int, before: Optional[tuple[datetime, int]], limit: int
+    ) -> list[tuple[datetime, int]]:
+        query = (
+            select(TimelineEntry.created_at, TimelineEntry.post_id)
+            .where(TimelineEntry.user_id == user_id)
+            .order_by(TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            query = query.where(tuple_(TimelineEntry.created_at, TimelineEntry.post_id) < before)
+        result = await self._session.execute(query)
+        return result.all()
+
+    async def get_pulled_entries(
+        self, user_id: int, before: Optional[tuple[datetime, int]], limit: int
+    ) -> list[tuple[datetime, int]]:
+        # 팬아웃 대상에서 제외된(팔로워가 많은) 팔로우 계정의 글을 읽는 시점에 가져옵니다.
+        large_followed_ids = (
+            select(Follow.followed_id)
+            .join(User, User.id == Follow.followed_id)
+            .where(Follow.follower_id == user_id, User.followers_count > self._fanout_limit)
+        )
+        query = (
+            select(Post.created_at, Post.id)
+            .where(Post.author_id.in_(large_followed_ids))
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            query = query.where(tuple_(Post.created_at, Post.id) < before)
+        result = await self._session.execute(query)
+        return result.all()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, HttpUrl, AnyUrl
+from pydantic import BaseModel, ConfigDict, EmailStr, HttpUrl, AnyUrl
 from datetime import datetime
 from typing import Optional, List
 
@@ -18,6 +18,13 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
+class PrincipalDTO(BaseModel):
+    # 인증된 사용자. 캐시에 담겨 여러 요청이 같은 객체를 공유하므로 변경할 수 없게 둡니다.
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    username: str
+
 class UserProfileDTO(BaseModel):
     id: int
     username: str
@@ -31,7 +38,6 @@ class UserProfileDTO(BaseModel):
 
 class CommentCreateDTO(BaseModel):
     content: str
-    post_id: int
 
 class CommentDTO(BaseModel):
     id: int
@@ -41,6 +47,10 @@ class CommentDTO(BaseModel):
     author: UserProfileDTO
     post_id: int
 
+class CommentPageDTO(BaseModel):
+    items: List[CommentDTO]
+    next_cursor: Optional[str] = None
+
 class LikeDTO(BaseModel):
     id: int
     user_id: int
@@ -51,4 +61,9 @@ class FollowDTO(BaseModel):
     id: int
     follower_id: int
     followed_id: int
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+
+class FollowStatusDTO(BaseModel):
+    user_id: int
+    following: bool
+    followers_count: int
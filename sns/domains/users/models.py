@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from dependencies.database import Base
@@ -14,6 +14,7 @@ class User(Base):
     profile_picture = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    followers_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     posts = relationship("Post", back_populates="author")
     comments = relationship("Comment", back_populates="author")
@@ -29,11 +30,20 @@ class Post(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # 검색 전용 search_vector 생성 컬럼과 GIN/pg_trgm 인덱스는 Postgres 전용이므로 모델에 두지 않고
+    # 마이그레이션(42b05a66f996)에서만 만듭니다. create_all은 확장 없는 DB에서도 동작합니다.
 
     author = relationship("User", back_populates="posts")
     comments = relationship("Comment", back_populates="post")
     likes = relationship("Like", back_populates="post")
 
+    __table_args__ = (
+        Index("ix_posts_created_at_id", created_at.desc(), id.desc()),
+        Index("ix_posts_author_id_created_at", author_id, created_at.desc(), id.desc()),
+    )
+
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -47,6 +57,10 @@ class Comment(Base):
     author = relationship("User", back_populates="comments")
     post = relationship("Post", back_populates="comments")
 
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at_id", post_id, created_at, id),
+    )
+
 class Like(Base):
     __tablename__ = "likes"
     id = Column(Integer, primary_key=True, index=True)
@@ -57,6 +71,11 @@ class Like(Base):
     user = relationship("User", back_populates="likes")
     post = relationship("Post", back_populates="likes")
 
+    __table_args__ = (
+        Index("uq_likes_user_id_post_id", user_id, post_id, unique=True),
+        Index("ix_likes_post_id", post_id),
+    )
+
 class Follow(Base):
     __tablename__ = "follows"
     id = Column(Integer, primary_key=True, index=True)
@@ -65,4 +84,30 @@ class Follow(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     follower = relationship("User", foreign_keys=[follower_id], back_populates="following")
-    followed = relationship("User", foreign_keys=[followed_id], back_populates="followers")
\ No newline at end of file
+    followed = relationship("User", foreign_keys=[followed_id], back_populates="followers")
+
+    __table_args__ = (
+        Index("uq_follows_follower_id_followed_id", follower_id, followed_id, unique=True),
+        Index("ix_follows_followed_id", followed_id, follower_id),
+    )
+
+class TimelineEntry(Base):
+    __tablename__ = "timeline_entries"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_timeline_entries_user_id_created_at", user_id, created_at.desc(), post_id.desc()),
+    )
+
+class PostHashtag(Base):
+    __tablename__ = "post_hashtags"
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(100), primary_key=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_post_hashtags_tag_created_at", tag, created_at.desc(), post_id.desc()),
+        Index("ix_post_hashtags_created_at", created_at),
+    )
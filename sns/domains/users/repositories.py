@@ -1,8 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
-from sqlalchemy import select
-from .models import User
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from .models import User, Follow, Post, TimelineEntry
 from .dto import UserSignUpDTO, UserProfileDTO
 from datetime import datetime
 
@@ -49,6 +50,13 @@ class UserRepository:
             raise HTTPException(status_code=404, detail="User not found")
         return user
 
+    async def get_users_by_ids(self, user_ids: list[int]) -> dict[int, User]:
+        if not user_ids:
+            return {}
+        query = select(User).where(User.id.in_(user_ids))
+        result = await self._session.execute(query)
+        return {user.id: user for user in result.scalars().all()}
+
     async def update_user(self, user_id: int, payload: UserProfileDTO) -> User:
         query = select(User).where(User.id == user_id)
         result = await self._session.execute(query)
@@ -66,4 +74,72 @@ class UserRepository:
             await self._session.rollback()
             raise HTTPException(status_code=400, detail="Database integrity error: " + str(e))
         
-        return user
\ No newline at end of file
+        return user
+
+    async def set_profile_picture(self, user_id: int, url: str) -> User:
+        user = await self.get_user_by_id(user_id)
+        user.profile_picture = url
+        await self._session.commit()
+        await self._session.refresh(user)
+        return user
+
+    async def follow_user(self, follower_id: int, followed_id: int) -> int:
+        # INSERT ... ON CONFLICT DO NOTHING과 팔로워 수 갱신을 하나의 문장으로 처리합니다.
+        inserted = (
+            pg_insert(Follow)
+            .values(follower_id=follower_id, followed_id=followed_id)
+            .on_conflict_do_nothing(index_elements=[Follow.follower_id, Follow.followed_id])
+            .returning(Follow.followed_id)
+            .cte("inserted_follow")
+        )
+        query = (
+            update(User)
+            .where(User.id == followed_id)
+            .values(
+                followers_count=User.followers_count + select(func.count()).select_from(inserted).scalar_subquery(),
+                updated_at=User.updated_at,
+            )
+            .returning(User.followers_count)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = await self._session.execute(query)
+            followers_count = result.scalar_one_or_none()
+            await self._session.commit()
+        except IntegrityError:
+            await self._session.rollback()
+            raise HTTPException(status_code=404, detail="User not found")
+        return followers_count
+
+    async def unfollow_user(self, follower_id: int, followed_id: int) -> int:
+        deleted = (
+            delete(Follow)
+            .where(Follow.follower_id == follower_id, Follow.followed_id == followed_id)
+            .returning(Follow.followed_id)
+            .cte("deleted_follow")
+        )
+        query = (
+            update(User)
+            .where(User.id == followed_id)
+            .values(
+                followers_count=User.followers_count - select(func.count()).select_from(deleted).scalar_subquery(),
+                updated_at=User.updated_at,
+            )
+            .returning(User.followers_count)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(query)
+        followers_count = result.scalar_one_or_none()
+        # fan-out으로 팔로워 타임라인에 펼쳐 둔 그 작성자의 글도 같은 트랜잭션에서 걷어냅니다.
+        await self._session.execute(
+            delete(TimelineEntry)
+            .where(
+                TimelineEntry.user_id == follower_id,
+                TimelineEntry.post_id.in_(select(Post.id).where(Post.author_id == followed_id)),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
+        if followers_count is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return followers_count
@@ -1,30 +1,34 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from .repositories import UserRepository
-from .dto import UserSignUpDTO, UserLoginDTO, Token, UserProfileDTO
+from .dto import UserSignUpDTO, UserLoginDTO, Token, UserProfileDTO, FollowStatusDTO, PrincipalDTO
 from .models import User
 from dependencies.database import provide_session
+from dependencies.cache import get_cache
+from dependencies.config import get_config
+from dependencies.password import get_password_hasher
+from dependencies.media import get_media_store
 
 # 이 값들은 환경 변수나 설정 파일에서 가져오는 것이 좋습니다.
 SECRET_KEY = "your-secret-key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
 
 class UserService:
     def __init__(self, session: AsyncSession):
         self._session = session
         self._repository = UserRepository(session)
+        self._profile_cache = get_cache("profiles")
 
     async def create_user(self, payload: UserSignUpDTO) -> User:
-        hashed_password = self._hash_password(payload.password)
+        hashed_password = await self._hash_password(payload.password)
         payload.password = hashed_password
         return await self._repository.create_user(payload=payload)
 
@@ -32,7 +36,7 @@ class UserService:
         user = await self._repository.get_user_by_username(username)
         if not user:
             return None
-        if not self._verify_password(password, user.password):
+        if not await self._verify_password(password, user.password):
             return None
         return user
 
@@ -43,31 +47,75 @@ class UserService:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
-    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(provide_session)) -> User:
-        credentials_exception = HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    @staticmethod
+    async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(provide_session)) -> PrincipalDTO:
+        principal = await UserService.resolve_principal(token, db)
+        if principal is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return principal
+
+    @staticmethod
+    async def resolve_principal(token: str, db: Optional[AsyncSession] = None) -> Optional[PrincipalDTO]:
+        """토큰을 검증해 인증 주체를 돌려줍니다. 유효하지 않으면 None.
+
+        db 없이 부르면 예전 토큰을 조회할 때만 짧은 세션을 엽니다 (웹소켓처럼 오래 유지되는 연결용).
+        """
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            username: str = payload.get("sub")
-            if username is None:
-                raise credentials_exception
         except JWTError:
-            raise credentials_exception
-        user_service = UserService(db)  # UserService 인스턴스를 생성
-        user = await user_service._repository.get_user_by_username(username)
-        if user is None:
-            raise credentials_exception
-        return user
-    
+            return None
+        username: Optional[str] = payload.get("sub")
+        if username is None:
+            return None
 
-    def _hash_password(self, password: str) -> str:
-        return pwd_context.hash(password)
+        # uid 클레임이 있는 토큰은 서명된 클레임만으로 인증 주체를 만들므로 쿼리가 없습니다.
+        # username은 로그인 시점의 값이며, 라우트는 id만 씁니다.
+        user_id: Optional[int] = payload.get("uid")
+        if user_id is not None:
+            return PrincipalDTO(id=user_id, username=username)
 
-    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        # 예전 토큰은 username으로 한 번 조회한 뒤 짧은 TTL 동안 캐시합니다.
+        # ORM 객체 대신 불변 DTO를 두어 한 요청의 변경이 같은 캐시 항목을 받은 다른 요청에 새지 않게 합니다.
+        principal_cache = UserService._principal_cache()
+        principal = await principal_cache.get(username)
+        if principal is not None:
+            return principal
+
+        generation = principal_cache.generation
+        try:
+            if db is None:
+                async with asynccontextmanager(provide_session)() as session:
+                    user = await UserRepository(session).get_user_by_username(username)
+            else:
+                user = await UserRepository(db).get_user_by_username(username)
+        except HTTPException:
+            return None
+        principal = PrincipalDTO(id=user.id, username=user.username)
+        if generation == principal_cache.generation:
+            await principal_cache.set(username, principal)
+        return principal
+
+    @staticmethod
+    def token_subject(token: str) -> Optional[str]:
+        # 서명이 맞는 토큰의 sub만 돌려줍니다. DB를 보지 않으므로 미들웨어에서 요청마다 불러도 됩니다.
+        try:
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+        except JWTError:
+            return None
+
+    @staticmethod
+    def _principal_cache():
+        return get_cache("principals", ttl=get_config().auth_cache_ttl_seconds)
+
+    async def _hash_password(self, password: str) -> str:
+        return await get_password_hasher().hash(password)
+
+    async def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await get_password_hasher().verify(plain_password, hashed_password)
 
     async def login(self, login_data: UserLoginDTO) -> Token:
         user = await self.authenticate_user(login_data.username, login_data.password)
@@ -77,7 +125,10 @@ class UserService:
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        access_token = self.create_access_token(data={"sub": user.username})
+        claims = {"sub": user.username}
+        if get_config().jwt_profile_claims:
+            claims["uid"] = user.id
+        access_token = self.create_access_token(data=claims)
         return Token(access_token=access_token, token_type="bearer")
 
     async def get_user_profile(self, user: User) -> UserProfileDTO:
@@ -92,5 +143,34 @@ class UserService:
             updated_at=user.updated_at
         )
 
+    async def get_user_profile_by_id(self, user_id: int) -> UserProfileDTO:
+        return await self._profile_cache.get_or_load(user_id, lambda: self._load_user_profile(user_id))
+
+    async def _load_user_profile(self, user_id: int) -> UserProfileDTO:
+        user = await self._repository.get_user_by_id(user_id)
+        return await self.get_user_profile(user)
+
     async def update_user_profile(self, user_id: int, payload: UserProfileDTO) -> User:
-        return await self._repository.update_user(user_id, payload)
\ No newline at end of file
+        # 인증 주체 캐시는 username 키이므로, username이 바뀌면 이전 이름으로 캐시된 주체를 지웁니다.
+        previous = await self._session.get(User, user_id)
+        previous_username = previous.username if previous is not None else None
+        user = await self._repository.update_user(user_id, payload)
+        await self._profile_cache.delete(user_id)
+        await self._principal_cache().delete(previous_username)
+        return user
+
+    async def update_profile_picture(self, user_id: int, request: Request) -> User:
+        url = await get_media_store().store(request)
+        user = await self._repository.set_profile_picture(user_id, url)
+        await self._profile_cache.delete(user_id)
+        return user
+
+    async def follow_user(self, follower_id: int, followed_id: int) -> FollowStatusDTO:
+        if follower_id == followed_id:
+            raise HTTPException(status_code=400, detail="Cannot follow yourself")
+        followers_count = await self._repository.follow_user(follower_id, followed_id)
+        return FollowStatusDTO(user_id=followed_id, following=True, followers_count=followers_count)
+
+    async def unfollow_user(self, follower_id: int, followed_id: int) -> FollowStatusDTO:
+        followers_count = await self._repository.unfollow_user(follower_id, followed_id)
+        return FollowStatusDTO(user_id=followed_id, following=False, followers_count=followers_count)
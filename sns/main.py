@@ -1,18 +1,49 @@
 import logging
 import traceback
-from urllib.request import Request
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from starlette.requests import Request
 from starlette.responses import JSONResponse
+from sqlalchemy import exc
 
-from dependencies.database import init_db
+import dependencies.database as database
+from dependencies.database import init_db, warm_up_pool, dispose_db, get_pool_stats, ReadYourWritesMiddleware
 from dependencies.config import get_config
+from dependencies.admission import AdmissionMiddleware, get_admission_controller, overloaded_response
+from dependencies.cache import cache_stats
+from dependencies.password import get_password_hasher
+from dependencies.media import get_media_store
+from dependencies.captions import get_caption_queue
+from dependencies import metrics
+from domains.pose.relay import get_pose_relay
+from domains.users.services import UserService
 from routers import router as main_router
 
-init_db(get_config())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # import 시점에는 아무것도 연결하지 않고, 서버가 뜰 때 엔진을 만듭니다.
+    # 도구나 테스트가 미리 엔진을 설정해 둔 경우에는 그대로 씁니다.
+    config = get_config()
+    if database.db_engine is None:
+        init_db(config)
+    if config.metrics_enabled:
+        metrics.instrument_engine(database.db_engine)
+        if metrics.record_pool_wait not in database.pool_wait_listeners:
+            database.pool_wait_listeners.append(metrics.record_pool_wait)
+    await warm_up_pool(min(config.db_pool_prewarm, config.db_pool_size))
+    await get_caption_queue().start()
+    yield
+    await get_caption_queue().stop()
+    get_media_store().shutdown()
+    await dispose_db()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     openapi_url="/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
@@ -21,6 +52,37 @@ app = FastAPI(
 
 
 app.include_router(router=main_router)
+# 업로드된 미디어 파일. 운영에서는 MEDIA_BASE_URL을 CDN/웹 서버로 두고 이 경로는 개발용으로 씁니다.
+app.mount("/media", StaticFiles(directory=get_config().media_root, check_dir=False), name="media")
+
+# 풀이 포화되면 요청을 풀 대기열에 쌓는 대신 앞단에서 503으로 돌려보냅니다.
+# 계측 미들웨어보다 먼저 등록해 버려진 요청도 /metrics 히스토그램에 남도록 합니다.
+if get_config().admission_enabled:
+    app.add_middleware(AdmissionMiddleware)
+
+# 계측을 끄면 미들웨어와 엔진 이벤트를 아예 등록하지 않으므로 요청 경로에 추가 비용이 없습니다.
+if get_config().metrics_enabled:
+    metrics.gauge_sources.extend([
+        ("sns_db_pool", "Database connection pool gauges.", get_pool_stats),
+        ("sns_cache", "Cache statistics by cache name.", cache_stats),
+        ("sns_password_hasher", "Password hashing executor gauges.", lambda: get_password_hasher().stats()),
+        ("sns_caption_queue", "Caption job queue gauges.", lambda: get_caption_queue().stats()),
+        ("sns_pose_relay", "Pose landmark relay gauges.", lambda: get_pose_relay().stats()),
+    ])
+    if get_config().admission_enabled:
+        metrics.gauge_sources.append(
+            ("sns_admission", "Admission control and load shedding gauges.", lambda: get_admission_controller().stats())
+        )
+    app.add_middleware(metrics.RequestMetricsMiddleware)
+    app.add_route("/metrics", metrics.metrics_endpoint, include_in_schema=False)
+
+# 복제본을 쓸 때만 쓰기 직후 읽기를 primary로 고정하는 미들웨어를 붙입니다.
+if get_config().db_replica_endpoints:
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=get_config().db_read_your_writes_seconds,
+        principal_key=UserService.token_subject,
+    )
 
 app.add_middleware(
     CORSMiddleware,
@@ -61,6 +123,15 @@ async def add_cors_to_response(
     return response
 
 
+@app.exception_handler(exc.TimeoutError)
+async def pool_timeout_handler(request: Request, error: exc.TimeoutError):
+    # 커넥션 풀 대기 시간 초과는 서버 오류가 아니라 과부하이므로 재시도할 수 있는 503으로 돌려줍니다.
+    controller = get_admission_controller()
+    controller.pool_timeouts += 1
+    response = overloaded_response("Database connection pool timed out", controller.retry_after)
+    return await add_cors_to_response(request=request, response=response)
+
+
 @app.exception_handler(Exception)
 async def exception_handler(request: Request, exc: Exception):
     logging.error(traceback.format_exc())
@@ -69,6 +140,7 @@ async def exception_handler(request: Request, exc: Exception):
 
 
 
-import uvicorn
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
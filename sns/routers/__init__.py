@@ -1,14 +1,18 @@
-import importlib
-from pathlib import Path
-
 from fastapi import APIRouter
 
-router_files = Path(__file__).parent.rglob("*.py")
+from routers.pose import pose_controller
+from routers.system import system_controller
+from routers.users import feed_controller, hashtag_controller, post_controller, user_controller
 
+# 등록할 컨트롤러 목록. 새 컨트롤러는 여기에 추가합니다.
+# (디렉터리를 훑어 import하면 순서가 파일 시스템에 따라 달라지고, 도구/테스트에서 import만 해도 모든 모듈을 읽습니다.)
 routers = [
-    importlib.import_module(f"routers.{file.parent.name}.{file.stem}")
-    for file in router_files
-    if file.stem != "__init__" and file.parent.name != "base"
+    system_controller,
+    user_controller,
+    post_controller,
+    feed_controller,
+    hashtag_controller,
+    pose_controller,
 ]
 
 # 하위 라우터를 모으기 위한 중앙 라우터
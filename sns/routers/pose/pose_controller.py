@@ -0,0 +1,119 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, WebSocket, status
+
+from domains.pose.relay import (
+    BINARY_SUBPROTOCOL,
+    JSON_SUBPROTOCOL,
+    SEQ_MAX,
+    FrameError,
+    PoseRelay,
+    decode_binary,
+    decode_json,
+    get_pose_relay,
+)
+from domains.users.dto import PrincipalDTO
+from domains.users.services import UserService
+
+router = APIRouter()
+
+name = "pose"
+
+# 브라우저 WebSocket은 Authorization 헤더를 붙일 수 없으므로 "bearer.<JWT>" 서브프로토콜로 토큰을 받습니다.
+# 이 경우 클라이언트는 포맷 서브프로토콜도 함께 제안해야 합니다 (서버는 토큰 항목을 되돌려 보내지 않음).
+TOKEN_SUBPROTOCOL_PREFIX = "bearer."
+
+
+def negotiate_subprotocol(websocket: WebSocket):
+    # 클라이언트가 바이너리를 제안하면 우선 사용하고, 아무것도 제안하지 않으면 기존 JSON 형식으로 동작합니다.
+    offered = websocket.scope.get("subprotocols", [])
+    for subprotocol in (BINARY_SUBPROTOCOL, JSON_SUBPROTOCOL):
+        if subprotocol in offered:
+            return subprotocol
+    return None
+
+
+def websocket_token(websocket: WebSocket) -> Optional[str]:
+    # token 쿼리 파라미터도 받지만 접근 로그에 남으므로 서브프로토콜을 권장합니다.
+    for subprotocol in websocket.scope.get("subprotocols", []):
+        if subprotocol.startswith(TOKEN_SUBPROTOCOL_PREFIX):
+            return subprotocol[len(TOKEN_SUBPROTOCOL_PREFIX):]
+    return websocket.query_params.get("token")
+
+
+async def authenticate(websocket: WebSocket) -> Optional[PrincipalDTO]:
+    token = websocket_token(websocket)
+    if not token:
+        return None
+    # 연결이 오래 유지되므로 세션을 의존성으로 붙잡지 않고, 필요할 때만 짧게 엽니다.
+    return await UserService.resolve_principal(token)
+
+
+@router.websocket("/pose/{room}")
+async def pose_stream(
+    websocket: WebSocket,
+    room: str,
+    role: str = "subscriber",
+    relay: PoseRelay = Depends(get_pose_relay),
+):
+    # 방 이름은 방송하는 사용자의 id입니다. 구독은 로그인한 사용자 누구나, 발행은 방 주인만 할 수 있습니다.
+    # accept 전에 닫으면 핸드셰이크가 403으로 거절됩니다.
+    if role not in ("publisher", "subscriber"):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    principal = await authenticate(websocket)
+    if principal is None or (role == "publisher" and room != str(principal.id)):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    subprotocol = negotiate_subprotocol(websocket)
+    await websocket.accept(subprotocol=subprotocol)
+    if role == "publisher":
+        await publish_frames(websocket, room, relay)
+    else:
+        await relay_frames(websocket, room, relay, binary=subprotocol == BINARY_SUBPROTOCOL)
+
+
+async def publish_frames(websocket: WebSocket, room: str, relay: PoseRelay) -> None:
+    seq = 0
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        seq = (seq + 1) & SEQ_MAX
+        try:
+            if message.get("bytes") is not None:
+                frame = decode_binary(message["bytes"], relay.max_landmarks)
+            else:
+                frame = decode_json(message["text"], seq, relay.max_landmarks)
+        except FrameError as e:
+            await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA, reason=str(e))
+            return
+        relay.publish(room, frame)
+
+
+async def relay_frames(websocket: WebSocket, room: str, relay: PoseRelay, binary: bool) -> None:
+    subscriber = relay.subscribe(room, binary)
+
+    async def send() -> None:
+        while True:
+            frame = await subscriber.queue.get()
+            if binary:
+                await websocket.send_bytes(frame.to_binary())
+            else:
+                await websocket.send_text(frame.to_json())
+            subscriber.sent += 1
+
+    async def wait_disconnect() -> None:
+        # 구독자는 보내는 데이터가 없으므로 연결 종료만 감지합니다.
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(send()), asyncio.create_task(wait_disconnect())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        relay.unsubscribe(room, subscriber)
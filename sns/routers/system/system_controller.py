@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from dependencies.admission import get_admission_controller
+from dependencies.database import get_pool_stats
+from dependencies.captions import get_caption_queue
+from domains.pose.relay import get_pose_relay
+
+router = APIRouter()
+
+name = "system"
+
+@router.get("/system/pool")
+async def get_pool_gauges():
+    return get_pool_stats()
+
+@router.get("/system/captions")
+async def get_caption_queue_gauges():
+    return get_caption_queue().stats()
+
+@router.get("/system/pose")
+async def get_pose_relay_gauges():
+    return get_pose_relay().stats()
+
+@router.get("/system/admission")
+async def get_admission_gauges():
+    return get_admission_controller().stats()
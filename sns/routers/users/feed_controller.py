@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from domains.posts.services import PostService
+from domains.posts.dto import PostPageDTO
+from domains.users.services import UserService
+from dependencies.database import provide_read_session
+from dependencies.responses import dto_response
+from domains.users.dto import PrincipalDTO
+
+router = APIRouter()
+
+name = "feed"
+
+@router.get("/feed", response_model=PostPageDTO)
+async def get_feed(
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
+    session: AsyncSession = Depends(provide_read_session)
+):
+    post_service = PostService(session)
+    return dto_response(await post_service.get_feed(current_user.id, cursor, limit))
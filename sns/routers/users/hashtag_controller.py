@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from domains.posts.services import PostService
+from domains.posts.dto import PostPageDTO, TrendingHashtagDTO
+from dependencies.database import provide_read_session
+from dependencies.responses import dto_response
+
+router = APIRouter()
+
+name = "hashtags"
+
+@router.get("/hashtags/trending", response_model=List[TrendingHashtagDTO])
+async def get_trending_hashtags(
+    limit: int = 10,
+    session: AsyncSession = Depends(provide_read_session)
+):
+    post_service = PostService(session)
+    return dto_response(await post_service.get_trending_hashtags(limit))
+
+@router.get("/hashtags/{tag}/posts", response_model=PostPageDTO)
+async def get_hashtag_posts(
+    tag: str,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    session: AsyncSession = Depends(provide_read_session)
+):
+    post_service = PostService(session)
+    return dto_response(await post_service.get_hashtag_posts(tag, cursor, limit))
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Union
 from domains.posts.services import PostService
-from domains.posts.dto import PostCreateDTO, PostUpdateDTO, PostDTO
+from domains.posts.dto import PostCreateDTO, PostUpdateDTO, PostDTO, PostPageDTO, LikeStatusDTO, CaptionDTO
+from domains.users.dto import CommentCreateDTO, CommentDTO, CommentPageDTO, PrincipalDTO
 from domains.users.services import UserService
-from dependencies.database import provide_session
-from domains.users.models import User
+from dependencies.database import provide_read_session, provide_session
+from dependencies.media import UPLOAD_OPENAPI
+from dependencies.responses import dto_response
 
 router = APIRouter()
 
@@ -14,44 +16,117 @@ name = "posts"
 @router.post("/posts", response_model=PostDTO, status_code=status.HTTP_201_CREATED)
 async def create_post(
     payload: PostCreateDTO,
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
     session: AsyncSession = Depends(provide_session)
 ):
     post_service = PostService(session)
-    return await post_service.create_post(current_user.id, payload)
+    return dto_response(await post_service.create_post(current_user.id, payload), status.HTTP_201_CREATED)
 
+# /posts/{post_id}보다 먼저 등록해야 "search"가 post_id로 매칭되지 않습니다.
+@router.get("/posts/search", response_model=PostPageDTO)
+async def search_posts(
+    q: str,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    session: AsyncSession = Depends(provide_read_session)
+):
+    post_service = PostService(session)
+    return dto_response(await post_service.search_posts(q, cursor, limit))
+
+# 결과가 게시물 캐시에 들어가므로, 쓰기 직후의 캐시 미스를 지연된 복제본이 아닌 primary에서 채웁니다.
 @router.get("/posts/{post_id}", response_model=PostDTO)
 async def get_post(
     post_id: int,
     session: AsyncSession = Depends(provide_session)
 ):
     post_service = PostService(session)
-    return await post_service.get_post(post_id)
+    return dto_response(await post_service.get_post(post_id))
 
 @router.put("/posts/{post_id}", response_model=PostDTO)
 async def update_post(
     post_id: int,
     payload: PostUpdateDTO,
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
+    session: AsyncSession = Depends(provide_session)
+):
+    post_service = PostService(session)
+    return dto_response(await post_service.update_post(post_id, current_user.id, payload))
+
+# multipart 본문("file" 필드)은 폼 파서를 거치지 않고 MediaStore가 요청 스트림에서 바로 읽습니다.
+@router.post("/posts/{post_id}/image", response_model=PostDTO, openapi_extra=UPLOAD_OPENAPI)
+async def upload_post_image(
+    post_id: int,
+    request: Request,
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
     session: AsyncSession = Depends(provide_session)
 ):
     post_service = PostService(session)
-    return await post_service.update_post(post_id, current_user.id, payload)
+    return dto_response(await post_service.attach_image(post_id, current_user.id, request))
+
+@router.get("/posts/{post_id}/caption", response_model=CaptionDTO)
+async def get_post_caption(
+    post_id: int,
+    session: AsyncSession = Depends(provide_read_session)
+):
+    post_service = PostService(session)
+    return dto_response(await post_service.get_caption(post_id))
 
 @router.delete("/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_post(
     post_id: int,
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
     session: AsyncSession = Depends(provide_session)
 ):
     post_service = PostService(session)
     await post_service.delete_post(post_id, current_user.id)
 
-@router.get("/posts", response_model=List[PostDTO])
+@router.get("/posts", response_model=Union[PostPageDTO, List[PostDTO]])
 async def get_posts(
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(provide_read_session)
+):
+    post_service = PostService(session)
+    # cursor 파라미터가 있으면(빈 값은 첫 페이지) 키셋 페이지를, 없으면 기존 skip 방식의 목록을 반환합니다.
+    if cursor is not None:
+        return dto_response(await post_service.get_posts_page(cursor, limit))
+    return dto_response(await post_service.get_posts(skip, limit))
+
+@router.put("/posts/{post_id}/like", response_model=LikeStatusDTO)
+async def like_post(
+    post_id: int,
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
+    session: AsyncSession = Depends(provide_session)
+):
+    post_service = PostService(session)
+    return dto_response(await post_service.like_post(current_user.id, post_id))
+
+@router.delete("/posts/{post_id}/like", response_model=LikeStatusDTO)
+async def unlike_post(
+    post_id: int,
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
+    session: AsyncSession = Depends(provide_session)
+):
+    post_service = PostService(session)
+    return dto_response(await post_service.unlike_post(current_user.id, post_id))
+
+@router.post("/posts/{post_id}/comments", response_model=CommentDTO, status_code=status.HTTP_201_CREATED)
+async def create_comment(
+    post_id: int,
+    payload: CommentCreateDTO,
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
     session: AsyncSession = Depends(provide_session)
 ):
     post_service = PostService(session)
-    return await post_service.get_posts(skip, limit)
\ No newline at end of file
+    return dto_response(await post_service.create_comment(current_user.id, post_id, payload), status.HTTP_201_CREATED)
+
+@router.get("/posts/{post_id}/comments", response_model=CommentPageDTO)
+async def get_comments(
+    post_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    session: AsyncSession = Depends(provide_read_session)
+):
+    post_service = PostService(session)
+    return dto_response(await post_service.get_comments_page(post_id, cursor, limit))
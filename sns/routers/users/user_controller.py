@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependencies.database import provide_session
+from dependencies.media import UPLOAD_OPENAPI
+from dependencies.responses import dto_response
 from domains.users.services import UserService
-from domains.users.dto import UserSignUpDTO, UserLoginDTO, Token, UserProfileDTO
-from domains.users.models import User
+from domains.users.dto import UserSignUpDTO, UserLoginDTO, Token, UserProfileDTO, FollowStatusDTO, PrincipalDTO
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,10 +21,13 @@ async def signup(payload: UserSignUpDTO, db: AsyncSession = Depends(provide_sess
     try:
         user = await user_service.create_user(payload=payload)
         logger.info(f"Signup successful for user: {payload.username}")
-        return await user_service.get_user_profile(user)
+        return dto_response(await user_service.get_user_profile(user))
     except HTTPException as he:
         logger.warning(f"Signup failed for user {payload.username}: {he.detail}")
         raise he
+    except exc.TimeoutError:
+        # 커넥션 풀 대기 시간 초과는 앱 전역 핸들러가 503으로 바꿉니다.
+        raise
     except Exception as e:
         logger.error(f"An unexpected error occurred during signup: {str(e)}")
         raise HTTPException(
@@ -38,10 +43,13 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
         login_data = UserLoginDTO(username=form_data.username, password=form_data.password)
         token = await user_service.login(login_data)
         logger.info(f"Login successful for user: {form_data.username}")
-        return token
+        return dto_response(token)
     except HTTPException as he:
         logger.warning(f"Login failed for user {form_data.username}: {he.detail}")
         raise he
+    except exc.TimeoutError:
+        # 커넥션 풀 대기 시간 초과는 앱 전역 핸들러가 503으로 바꿉니다.
+        raise
     except Exception as e:
         logger.error(f"An unexpected error occurred during login: {str(e)}")
         raise HTTPException(
@@ -49,20 +57,49 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
             detail="An unexpected error occurred during login",
         )
 
+# 프로필 캐시에 들어가는 결과이므로 캐시 미스는 primary에서 읽습니다.
 @router.get("/me", response_model=UserProfileDTO)
 async def read_users_me(
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
     db: AsyncSession = Depends(provide_session)
 ):
     user_service = UserService(db)
-    return await user_service.get_user_profile(current_user)
+    return dto_response(await user_service.get_user_profile_by_id(current_user.id))
 
 @router.put("/me", response_model=UserProfileDTO)
 async def update_user_profile(
     payload: UserProfileDTO,
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
     db: AsyncSession = Depends(provide_session)
 ):
     user_service = UserService(db)
     updated_user = await user_service.update_user_profile(current_user.id, payload)
-    return await user_service.get_user_profile(updated_user)
\ No newline at end of file
+    return dto_response(await user_service.get_user_profile(updated_user))
+
+@router.put("/me/picture", response_model=UserProfileDTO, openapi_extra=UPLOAD_OPENAPI)
+async def update_profile_picture(
+    request: Request,
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
+    db: AsyncSession = Depends(provide_session)
+):
+    user_service = UserService(db)
+    updated_user = await user_service.update_profile_picture(current_user.id, request)
+    return dto_response(await user_service.get_user_profile(updated_user))
+
+@router.put("/users/{user_id}/follow", response_model=FollowStatusDTO)
+async def follow_user(
+    user_id: int,
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
+    db: AsyncSession = Depends(provide_session)
+):
+    user_service = UserService(db)
+    return dto_response(await user_service.follow_user(current_user.id, user_id))
+
+@router.delete("/users/{user_id}/follow", response_model=FollowStatusDTO)
+async def unfollow_user(
+    user_id: int,
+    current_user: PrincipalDTO = Depends(UserService.get_current_user),
+    db: AsyncSession = Depends(provide_session)
+):
+    user_service = UserService(db)
+    return dto_response(await user_service.unfollow_user(current_user.id, user_id))
@@ -0,0 +1,73 @@
+"""`import main` 시간 예산 / 부작용 검사.
+
+새 인터프리터에서 `import main`을 IMPORT_TIME_RUNS 번 실행해 중간값이 IMPORT_TIME_BUDGET_MS(기본 2000)를
+넘으면 실패합니다. import만으로 DB 엔진이 만들어지거나(asyncpg 로드), 선택 의존성(비전, LLM 등)이 로드돼도
+실패합니다. 시간 예산을 넘으면 -X importtime 기준으로 누적 시간이 큰 최상위 모듈을 실패 메시지에 붙입니다.
+
+    IMPORT_TIME_BUDGET_MS=1500 python -m pytest tests/test_import_time.py
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 2000))
+RUNS = int(os.getenv("IMPORT_TIME_RUNS", 3))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import main 이후 sys.modules에 있으면 안 되는 모듈들
+LAZY_MODULES = ("asyncpg", "numpy", "cv2", "PIL", "tensorflow", "mediapipe", "langchain_openai", "langchain_teddynote")
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+import dependencies.database as database
+print(json.dumps({{
+    "elapsed_ms": elapsed * 1000,
+    "engine_created": database.db_engine is not None,
+    "loaded": [name for name in {LAZY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def run_probe(importtime: bool = False) -> tuple[dict, str]:
+    # -X importtime 자체가 import를 느리게 하므로 시간 측정에는 쓰지 않고, 실패 원인을 보여줄 때만 켭니다.
+    options = ["-X", "importtime"] if importtime else []
+    completed = subprocess.run(
+        [sys.executable, *options, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def slowest_imports(importtime: str, limit: int = 10) -> list[tuple[str, int]]:
+    # "import time: self [us] | cumulative | imported package"에서 main이 직접 import한 모듈(한 단계 들여쓰기)만 봅니다.
+    totals = []
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if name.startswith("   ") and not name.startswith("    ") and cumulative.strip().isdigit():
+            totals.append((name.strip(), int(cumulative)))
+    return sorted(totals, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def test_import_main_within_budget():
+    median = statistics.median(run_probe()[0]["elapsed_ms"] for _ in range(RUNS))
+    if median > BUDGET_MS:
+        slowest = "\n".join(
+            f"  {cumulative / 1000:8.1f} ms  {name}" for name, cumulative in slowest_imports(run_probe(True)[1])
+        )
+        raise AssertionError(f"import main took {median:.0f} ms (budget {BUDGET_MS:.0f} ms)\n{slowest}")
+
+
+def test_import_main_has_no_side_effects():
+    result, _ = run_probe()
+    assert not result["engine_created"], "importing main created the database engine"
+    assert not result["loaded"], f"importing main loaded optional modules: {', '.join(result['loaded'])}"
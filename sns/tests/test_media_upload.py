@@ -0,0 +1,86 @@
+"""업로드가 요청 스트림에서 바로 저장되고, 한도를 넘는 본문은 끝까지 받기 전에 거절되는지 확인합니다."""
+import asyncio
+import hashlib
+import os
+
+import httpx
+from fastapi import FastAPI, Request
+
+from dependencies.media import MediaStore
+
+PNG = b"\x89PNG\r\n\x1a\n" + os.urandom(300 * 1024)
+BOUNDARY = "test-boundary"
+
+
+def multipart_body(content: bytes, field: str = "file") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhello\r\n"
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"a.png\"\r\n"
+        f"Content-Type: image/png\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def run_upload(tmp_path, body, max_bytes: int = 1024 * 1024, headers=None):
+    store = MediaStore(str(tmp_path / "media"), "http://test/media", max_bytes, {}, 1)
+    app = FastAPI()
+    received = []
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        return {"url": await store.store(request)}
+
+    async def counted(chunks):
+        # 서버가 본문을 얼마나 읽었는지 보기 위해 보낸 양을 셉니다.
+        for chunk in chunks:
+            received.append(len(chunk))
+            yield chunk
+            await asyncio.sleep(0)
+
+    async def run():
+        headers_ = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}", **(headers or {})}
+        content = body if isinstance(body, bytes) else counted(body)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/upload", content=content, headers=headers_)
+
+    response = asyncio.run(run())
+    leftovers = os.listdir(tmp_path / ".media-tmp") if (tmp_path / ".media-tmp").exists() else []
+    return response, sum(received), leftovers
+
+
+def test_streams_file_part_into_store(tmp_path):
+    # 경계선이 여러 조각에 걸쳐 나뉘어도 파일 바이트만 정확히 저장합니다.
+    body = multipart_body(PNG)
+    chunks = [body[i:i + 7001] for i in range(0, len(body), 7001)]
+    response, _, leftovers = run_upload(tmp_path, chunks)
+    assert response.status_code == 200
+    name = f"{hashlib.sha256(PNG).hexdigest()}.png"
+    assert response.json()["url"] == f"http://test/media/{name[:2]}/{name}"
+    with open(tmp_path / "media" / name[:2] / name, "rb") as stored:
+        assert stored.read() == PNG
+    assert leftovers == []
+
+
+def test_rejects_declared_oversized_upload_without_reading(tmp_path):
+    body = multipart_body(PNG)
+    response, received, _ = run_upload(
+        tmp_path, [body], max_bytes=1024, headers={"Content-Length": str(len(body))}
+    )
+    assert response.status_code == 413
+    assert received == 0
+
+
+def test_rejects_oversized_stream_before_end(tmp_path):
+    # Content-Length가 없는(chunked) 본문은 받는 도중 한도를 넘는 순간 멈춥니다.
+    body = multipart_body(PNG)
+    chunks = [body[i:i + 16 * 1024] for i in range(0, len(body), 16 * 1024)]
+    response, received, leftovers = run_upload(tmp_path, chunks, max_bytes=64 * 1024)
+    assert response.status_code == 413
+    assert received < len(body) // 2
+    assert leftovers == []
+
+
+def test_rejects_missing_field_and_non_images(tmp_path):
+    response, _, _ = run_upload(tmp_path, multipart_body(PNG, field="other"))
+    assert response.status_code == 400
+    response, _, _ = run_upload(tmp_path, multipart_body(b"not an image at all"))
+    assert response.status_code == 415
@@ -0,0 +1,111 @@
+"""포즈 웹소켓 인증 확인: 토큰 없는 연결은 accept 전에 거절되고, 발행은 방 주인만 할 수 있습니다.
+
+핸드셰이크 거절(403)까지 보려고 uvicorn을 띄워 실제 웹소켓 클라이언트(websockets 패키지 필요)로 붙습니다.
+"""
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import dependencies.database as database
+from dependencies.database import Base
+from domains.pose.relay import JSON_SUBPROTOCOL, PoseRelay, get_pose_relay
+from domains.users.models import User
+from domains.users.services import UserService
+from routers.pose.pose_controller import TOKEN_SUBPROTOCOL_PREFIX, router
+
+websockets = pytest.importorskip("websockets")
+
+FRAME = json.dumps({"seq": 1, "timestamp": 1.0, "landmarks": [[0.1, 0.2, 0.3]]})
+
+
+def token_for(user_id: int, username: str = "owner") -> str:
+    return UserService(None).create_access_token({"sub": username, "uid": user_id})
+
+
+def run_with_server(scenario):
+    import uvicorn
+
+    async def run():
+        relay = PoseRelay(queue_size=8, max_landmarks=33)
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_pose_relay] = lambda: relay
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+
+        def connect(room: str, role: str, token: str = None, query: str = ""):
+            subprotocols = [JSON_SUBPROTOCOL] + ([TOKEN_SUBPROTOCOL_PREFIX + token] if token else [])
+            return websockets.connect(f"ws://127.0.0.1:{port}/pose/{room}?role={role}{query}", subprotocols=subprotocols)
+
+        try:
+            await scenario(connect, relay)
+        finally:
+            server.should_exit = True
+            await server_task
+
+    asyncio.run(run())
+
+
+async def assert_rejected(connection):
+    with pytest.raises(websockets.exceptions.InvalidStatusCode) as rejected:
+        async with connection:
+            pass
+    assert rejected.value.status_code == 403
+
+
+def test_rejects_missing_or_invalid_token():
+    async def scenario(connect, relay):
+        await assert_rejected(connect("1", "subscriber"))
+        await assert_rejected(connect("1", "subscriber", token="not-a-jwt"))
+        assert relay.stats()["subscribers"] == 0
+
+    run_with_server(scenario)
+
+
+def test_only_room_owner_can_publish():
+    async def scenario(connect, relay):
+        await assert_rejected(connect("1", "publisher", token=token_for(2, "other")))
+
+        async with connect("1", "subscriber", token=token_for(2, "other")) as subscriber:
+            # 토큰 항목은 되돌려 보내지 않고 포맷 서브프로토콜만 고릅니다.
+            assert subscriber.subprotocol == JSON_SUBPROTOCOL
+            while relay.stats()["subscribers"] < 1:
+                await asyncio.sleep(0.01)
+            async with connect("1", "publisher", token=token_for(1)) as publisher:
+                await publisher.send(FRAME)
+                received = await asyncio.wait_for(subscriber.recv(), timeout=5)
+                assert json.loads(received)["landmarks"] == [[0.1, 0.2, 0.3]]
+
+    run_with_server(scenario)
+
+
+def test_accepts_legacy_token_in_query(monkeypatch):
+    # uid 클레임이 없는 예전 토큰은 짧은 세션으로 사용자를 조회합니다.
+    async def scenario(connect, relay):
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        started = datetime(2024, 1, 1)
+        async with database._create_sessionmaker(engine)() as session:
+            session.add(User(id=7, username="legacy", email="legacy@example.com", password="x",
+                             full_name="Legacy", created_at=started, updated_at=started))
+            await session.commit()
+        monkeypatch.setattr(database, "DBSessionLocal", database._create_sessionmaker(engine))
+        try:
+            legacy = UserService(None).create_access_token({"sub": "legacy"})
+            async with connect("7", "publisher", query=f"&token={legacy}") as publisher:
+                await publisher.send(FRAME)
+            await assert_rejected(connect("1", "publisher", query=f"&token={legacy}"))
+        finally:
+            await UserService._principal_cache().clear()
+            await engine.dispose()
+
+    run_with_server(scenario)
@@ -0,0 +1,83 @@
+"""게시물 목록이 페이지 크기와 상관없이 고정된 수의 쿼리로 만들어지는지 확인합니다 (N+1 회귀 방지)."""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from dependencies.database import Base
+from domains.posts.services import PostService
+from domains.users.models import Comment, Like, Post, User
+
+
+async def create_engine_with_posts(count: int):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    started = datetime(2024, 1, 1)
+    async with AsyncSession(engine) as session:
+        # 게시물마다 작성자를 달리 해 작성자 조회가 행 단위로 늘어나면 바로 드러나게 합니다.
+        users = [
+            User(id=i, username=f"user{i}", email=f"user{i}@example.com", password="x", full_name=f"User {i}",
+                 created_at=started, updated_at=started)
+            for i in range(1, count + 1)
+        ]
+        posts = [
+            Post(id=i, author_id=i, content=f"post {i}", created_at=started + timedelta(minutes=i),
+                 updated_at=started, likes_count=1, comments_count=1)
+            for i in range(1, count + 1)
+        ]
+        session.add_all(users + posts)
+        await session.flush()
+        session.add_all([Like(user_id=i, post_id=i) for i in range(1, count + 1)])
+        session.add_all([
+            Comment(author_id=i, post_id=i, content="comment", created_at=started, updated_at=started)
+            for i in range(1, count + 1)
+        ])
+        await session.commit()
+    return engine
+
+
+async def count_statements(engine, load):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            page = await load(PostService(session))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements), page
+
+
+def run_page_sizes(load) -> list[int]:
+    async def measure():
+        engine = await create_engine_with_posts(31)
+        try:
+            counts = []
+            for limit in (10, 30):
+                count, page = await count_statements(engine, lambda service: load(service, limit))
+                items = page.items if hasattr(page, "items") else page
+                assert len(items) == limit
+                assert all(item.author.username == f"user{item.id}" for item in items)
+                counts.append(count)
+            return counts
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(measure())
+
+
+def test_get_posts_query_count_does_not_grow_with_page_size():
+    small, large = run_page_sizes(lambda service, limit: service.get_posts(0, limit))
+    assert small == large
+
+
+def test_get_posts_page_query_count_does_not_grow_with_page_size():
+    small, large = run_page_sizes(lambda service, limit: service.get_posts_page(None, limit))
+    assert small == large
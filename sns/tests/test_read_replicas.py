@@ -0,0 +1,94 @@
+"""복제본 읽기 라우팅 확인: 지연된 복제본 값이 캐시에 퍼지지 않고, 쓴 사용자는 토큰만으로 자기 쓰기를 봅니다.
+
+primary와 복제본을 서로 다른 SQLite DB로 두고 복제본에는 쓰기를 반영하지 않아 복제 지연을 흉내 냅니다.
+"""
+import asyncio
+from datetime import datetime
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import dependencies.database as database
+from dependencies.cache import get_cache
+from dependencies.database import Base, ReadYourWritesMiddleware
+from domains.users.models import Post, User
+from domains.users.services import UserService
+from routers import router as main_router
+
+
+async def create_database():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    started = datetime(2024, 1, 1)
+    async with database._create_sessionmaker(engine)() as session:
+        session.add(User(id=1, username="writer", email="writer@example.com", password="x", full_name="Writer",
+                         created_at=started, updated_at=started))
+        session.add(Post(id=1, author_id=1, content="old", created_at=started, updated_at=started))
+        await session.commit()
+    return engine
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(main_router)
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=5, principal_key=UserService.token_subject)
+    return app
+
+
+def run_with_replica(monkeypatch, scenario):
+    async def run():
+        primary, replica = await create_database(), await create_database()
+        monkeypatch.setattr(database, "DBSessionLocal", database._create_sessionmaker(primary))
+        monkeypatch.setattr(database, "ReplicaSessionLocals", [database._create_sessionmaker(replica)])
+        await get_cache("posts").clear()
+        try:
+            transport = httpx.ASGITransport(app=create_app())
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await scenario(client, primary)
+        finally:
+            await get_cache("posts").clear()
+            await primary.dispose()
+            await replica.dispose()
+
+    asyncio.run(run())
+
+
+def contents(response: httpx.Response) -> list[str]:
+    assert response.status_code == 200
+    return [post["content"] for post in response.json()]
+
+
+def test_cached_post_is_loaded_from_primary(monkeypatch):
+    async def scenario(client, primary):
+        async with database._create_sessionmaker(primary)() as session:
+            await session.execute(update(Post).where(Post.id == 1).values(content="new"))
+            await session.commit()
+
+        # 목록은 복제본에서 읽으므로 아직 이전 값이 보입니다.
+        assert contents(await client.get("/api/posts")) == ["old"]
+        # 캐시되는 단건 조회는 primary에서 채우므로, 캐시 적중 후에도 새 값만 보입니다.
+        for _ in range(2):
+            response = await client.get("/api/posts/1")
+            assert response.status_code == 200
+            assert response.json()["content"] == "new"
+
+    run_with_replica(monkeypatch, scenario)
+
+
+def test_bearer_writer_reads_own_write_without_cookies(monkeypatch):
+    async def scenario(client, primary):
+        token = UserService(None).create_access_token({"sub": "writer", "uid": 1})
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await client.put("/api/posts/1", json={"content": "edited"}, headers=headers)
+        assert response.status_code == 200
+        client.cookies.clear()
+
+        assert contents(await client.get("/api/posts", headers=headers)) == ["edited"]
+        # 다른 사용자(토큰 없음)는 그대로 복제본에서 읽습니다.
+        assert contents(await client.get("/api/posts")) == ["old"]
+
+    run_with_replica(monkeypatch, scenario)
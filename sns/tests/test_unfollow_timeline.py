@@ -0,0 +1,42 @@
+"""언팔로우하면 fan-out으로 펼쳐 둔 그 작성자의 글이 홈 타임라인에서 빠지는지 확인합니다 (Postgres 필요)."""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from conftest import create_postgres_engine
+from domains.posts.dto import PostCreateDTO
+from domains.posts.services import PostService
+from domains.users.models import User
+from domains.users.services import UserService
+
+
+def test_unfollow_removes_author_posts_from_feed(postgres_url):
+    async def run():
+        engine = await create_postgres_engine(postgres_url)
+        try:
+            started = datetime(2024, 1, 1)
+            async with AsyncSession(engine) as session:
+                session.add_all([
+                    User(id=i, username=f"user{i}", email=f"user{i}@example.com", password="x",
+                         full_name=f"User {i}", created_at=started, updated_at=started)
+                    for i in (1, 2)
+                ])
+                await session.commit()
+
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                await UserService(session).follow_user(1, 2)
+                await PostService(session).create_post(2, PostCreateDTO(content="hello"))
+                own = await PostService(session).create_post(1, PostCreateDTO(content="mine"))
+                feed = await PostService(session).get_feed(1)
+                assert [post.content for post in feed.items] == ["mine", "hello"]
+
+                await UserService(session).unfollow_user(1, 2)
+                feed = await PostService(session).get_feed(1)
+                # 자기 글은 남고 언팔로우한 작성자의 글만 빠집니다.
+                assert [post.id for post in feed.items] == [own.id]
+                assert (await PostService(session).get_feed(2)).items[0].content == "hello"
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,397 @@
+"""users / posts / comments / likes / follows 테이블 NDJSON 대량 가져오기·내보내기.
+
+테이블마다 <디렉터리>/<테이블>.ndjson 파일 하나를 씁니다 (한 줄에 JSON 객체 하나).
+
+- export: 테이블별로 Postgres가 직접 만든 JSON 줄을 COPY ... TO STDOUT으로 받아 그대로 파일에 씁니다.
+- import: 파일을 --chunk-size 줄씩 읽어 임시 staging 테이블에 COPY로 넣은 뒤, 원본 id -> 새 id
+  매핑 테이블을 만들어 외래 키를 DB 안에서 한 번의 INSERT ... SELECT로 풀어냅니다.
+  사용자는 username으로 기존 행과 맞추고, 좋아요/팔로우는 유니크 인덱스로 중복을 건너뜁니다.
+  게시물/댓글은 항상 새 행으로 추가됩니다. likes_count/comments_count/followers_count는 들어간
+  행만큼 올리고, 새 게시물의 해시태그와 홈 타임라인도 채웁니다. 전체가 하나의 트랜잭션입니다.
+  매핑되지 않아 빠진 행(예: username은 새롭지만 email이 기존 사용자와 겹친 사용자, 그 사용자를
+  가리키는 게시물/좋아요)은 테이블별 unmatched 수와 원본 키 일부로 보고하며, --strict면 롤백합니다.
+
+클라이언트는 청크 하나만 메모리에 들고 있으므로 파일 크기와 상관없이 메모리 사용량이 일정합니다.
+users 파일 없이 posts 등을 가져오면 파일의 id를 기존 행의 id로 간주합니다.
+
+    python -m tools.bulk export dump/
+    python -m tools.bulk import dump/ --tables users,posts --chunk-size 20000
+    python -m tools.bulk import dump/ --strict
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from typing import Optional
+
+import asyncpg
+
+from dependencies.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# 외래 키 의존 순서. 가져올 때 이 순서대로 처리합니다.
+TABLES = ("users", "posts", "comments", "likes", "follows")
+
+# 테이블별 NDJSON 키와 staging 컬럼 타입. 시각 값은 텍스트로 받아 INSERT 할 때 timestamptz로 바꿉니다.
+# 앱이 만드는 행처럼 updated_at이 비어 있으면 created_at으로 채웁니다 (응답 DTO가 값을 요구합니다).
+FIELDS = {
+    "users": (
+        ("id", "bigint"), ("username", "text"), ("email", "text"), ("password", "text"), ("full_name", "text"),
+        ("bio", "text"), ("profile_picture", "text"), ("created_at", "text"), ("updated_at", "text"),
+    ),
+    "posts": (
+        ("id", "bigint"), ("author_id", "bigint"), ("content", "text"), ("image_url", "text"),
+        ("created_at", "text"), ("updated_at", "text"),
+    ),
+    "comments": (
+        ("id", "bigint"), ("author_id", "bigint"), ("post_id", "bigint"), ("content", "text"),
+        ("created_at", "text"), ("updated_at", "text"),
+    ),
+    "likes": (("user_id", "bigint"), ("post_id", "bigint"), ("created_at", "text")),
+    "follows": (("follower_id", "bigint"), ("followed_id", "bigint"), ("created_at", "text")),
+}
+
+# 이번에 가져오지 않은 테이블은 파일의 id를 그대로 기존 행 id로 씁니다.
+IDENTITY_MAPS = {
+    "users": "(SELECT id AS src_id, id FROM users)",
+    "posts": "(SELECT id AS src_id, id FROM posts)",
+}
+
+# 각 문장의 {users}/{posts}는 원본 id -> 새 id 매핑 관계로 바뀝니다. 트랜잭션 안에서 크게 불어난
+# 테이블은 통계가 비어 있어 이후 조인이 nested loop로 풀리므로, 넣은 뒤마다 ANALYZE 합니다.
+RESOLVE_STATEMENTS = {
+    "users": (
+        "INSERT INTO users (username, email, password, full_name, bio, profile_picture, created_at, updated_at) "
+        "SELECT username, email, password, full_name, bio, profile_picture, coalesce(created_at::timestamptz, now()), "
+        "coalesce(updated_at::timestamptz, created_at::timestamptz, now()) "
+        "FROM _bulk_users ORDER BY id "
+        "ON CONFLICT DO NOTHING",
+        "ANALYZE users",
+        # 새로 넣은 사용자와 username이 같은 기존 사용자를 모두 매핑합니다.
+        "CREATE TEMP TABLE _bulk_map_users ON COMMIT DROP AS "
+        "SELECT s.id AS src_id, u.id FROM _bulk_users s JOIN users u ON u.username = s.username",
+        "CREATE UNIQUE INDEX ON _bulk_map_users (src_id)",
+        "ANALYZE _bulk_map_users",
+    ),
+    "posts": (
+        # 시퀀스에서 새 id를 미리 받아 두면 INSERT ... SELECT 한 번으로 매핑과 삽입을 모두 할 수 있습니다.
+        "CREATE TEMP TABLE _bulk_map_posts ON COMMIT DROP AS "
+        "SELECT s.id AS src_id, nextval(pg_get_serial_sequence('posts', 'id'))::integer AS id "
+        "FROM _bulk_posts s JOIN {users} author ON author.src_id = s.author_id ORDER BY s.id",
+        "CREATE UNIQUE INDEX ON _bulk_map_posts (src_id)",
+        "ANALYZE _bulk_map_posts",
+        "INSERT INTO posts (id, author_id, content, image_url, created_at, updated_at) "
+        "SELECT post.id, author.id, s.content, s.image_url, coalesce(s.created_at::timestamptz, now()), "
+        "coalesce(s.updated_at::timestamptz, s.created_at::timestamptz, now()) "
+        "FROM _bulk_posts s "
+        "JOIN _bulk_map_posts post ON post.src_id = s.id "
+        "JOIN {users} author ON author.src_id = s.author_id",
+        "ANALYZE posts",
+    ),
+    "comments": (
+        "WITH inserted AS ("
+        "INSERT INTO comments (author_id, post_id, content, created_at, updated_at) "
+        "SELECT author.id, post.id, s.content, coalesce(s.created_at::timestamptz, now()), "
+        "coalesce(s.updated_at::timestamptz, s.created_at::timestamptz, now()) "
+        "FROM _bulk_comments s "
+        "JOIN {users} author ON author.src_id = s.author_id "
+        "JOIN {posts} post ON post.src_id = s.post_id "
+        "ORDER BY s.id "
+        "RETURNING post_id"
+        "), counted AS ("
+        "UPDATE posts SET comments_count = posts.comments_count + added.count "
+        "FROM (SELECT post_id, count(*) FROM inserted GROUP BY post_id) AS added "
+        "WHERE posts.id = added.post_id"
+        ") "
+        "SELECT count(*) FROM inserted",
+        "ANALYZE comments",
+    ),
+    "likes": (
+        "WITH inserted AS ("
+        "INSERT INTO likes (user_id, post_id, created_at) "
+        "SELECT DISTINCT ON (liker.id, post.id) liker.id, post.id, coalesce(s.created_at::timestamptz, now()) "
+        "FROM _bulk_likes s "
+        "JOIN {users} liker ON liker.src_id = s.user_id "
+        "JOIN {posts} post ON post.src_id = s.post_id "
+        "ON CONFLICT DO NOTHING "
+        "RETURNING post_id"
+        "), counted AS ("
+        "UPDATE posts SET likes_count = posts.likes_count + added.count "
+        "FROM (SELECT post_id, count(*) FROM inserted GROUP BY post_id) AS added "
+        "WHERE posts.id = added.post_id"
+        ") "
+        "SELECT count(*) FROM inserted",
+        "ANALYZE likes",
+    ),
+    "follows": (
+        "WITH inserted AS ("
+        "INSERT INTO follows (follower_id, followed_id, created_at) "
+        "SELECT DISTINCT ON (follower.id, followed.id) follower.id, followed.id, coalesce(s.created_at::timestamptz, now()) "
+        "FROM _bulk_follows s "
+        "JOIN {users} follower ON follower.src_id = s.follower_id "
+        "JOIN {users} followed ON followed.src_id = s.followed_id "
+        "ON CONFLICT DO NOTHING "
+        "RETURNING followed_id"
+        "), counted AS ("
+        "UPDATE users SET followers_count = users.followers_count + added.count "
+        "FROM (SELECT followed_id, count(*) FROM inserted GROUP BY followed_id) AS added "
+        "WHERE users.id = added.followed_id"
+        ") "
+        "SELECT count(*) FROM inserted",
+        "ANALYZE follows",
+    ),
+}
+
+# 참조를 풀지 못해 들어가지 못한 staging 행의 원본 키. count(*) OVER ()로 전체 수도 함께 받습니다.
+UNMATCHED_SAMPLE = 20
+UNMATCHED_STATEMENTS = {
+    "users": (
+        "SELECT s.id, count(*) OVER () FROM _bulk_users s "
+        "WHERE NOT EXISTS (SELECT 1 FROM _bulk_map_users m WHERE m.src_id = s.id) ORDER BY s.id LIMIT $1"
+    ),
+    "posts": (
+        "SELECT s.id, count(*) OVER () FROM _bulk_posts s "
+        "WHERE NOT EXISTS (SELECT 1 FROM _bulk_map_posts m WHERE m.src_id = s.id) ORDER BY s.id LIMIT $1"
+    ),
+    "comments": (
+        "SELECT s.id, count(*) OVER () FROM _bulk_comments s "
+        "WHERE NOT EXISTS (SELECT 1 FROM {users} m WHERE m.src_id = s.author_id) "
+        "OR NOT EXISTS (SELECT 1 FROM {posts} m WHERE m.src_id = s.post_id) ORDER BY s.id LIMIT $1"
+    ),
+    "likes": (
+        "SELECT ARRAY[s.user_id, s.post_id], count(*) OVER () FROM _bulk_likes s "
+        "WHERE NOT EXISTS (SELECT 1 FROM {users} m WHERE m.src_id = s.user_id) "
+        "OR NOT EXISTS (SELECT 1 FROM {posts} m WHERE m.src_id = s.post_id) ORDER BY s.user_id, s.post_id LIMIT $1"
+    ),
+    "follows": (
+        "SELECT ARRAY[s.follower_id, s.followed_id], count(*) OVER () FROM _bulk_follows s "
+        "WHERE NOT EXISTS (SELECT 1 FROM {users} m WHERE m.src_id = s.follower_id) "
+        "OR NOT EXISTS (SELECT 1 FROM {users} m WHERE m.src_id = s.followed_id) "
+        "ORDER BY s.follower_id, s.followed_id LIMIT $1"
+    ),
+}
+
+
+class UnmatchedRowsError(Exception):
+    pass
+
+
+# 새 게시물에 대해 앱이 작성 시점에 하던 일(해시태그 색인, 타임라인 fan-out)을 한 번에 처리합니다.
+HASHTAG_BACKFILL = (
+    "INSERT INTO post_hashtags (post_id, tag, created_at) "
+    "SELECT DISTINCT posts.id, left(lower(match[1]), 100), posts.created_at "
+    "FROM posts JOIN _bulk_map_posts imported ON imported.id = posts.id, "
+    "regexp_matches(posts.content, '#(\\w+)', 'g') AS match"
+)
+
+# 팔로워가 fan-out 한도 이하인 작성자의 글만 팔로워 타임라인에 펼칩니다 (TimelineRepository.fan_out과 같은 규칙).
+TIMELINE_BACKFILL = (
+    "INSERT INTO timeline_entries (user_id, post_id, created_at) "
+    "SELECT posts.author_id, posts.id, posts.created_at "
+    "FROM posts JOIN _bulk_map_posts imported ON imported.id = posts.id "
+    "UNION "
+    "SELECT follows.follower_id, posts.id, posts.created_at "
+    "FROM posts JOIN _bulk_map_posts imported ON imported.id = posts.id "
+    "JOIN users ON users.id = posts.author_id "
+    "JOIN follows ON follows.followed_id = posts.author_id "
+    "WHERE users.followers_count <= $1 "
+    "ON CONFLICT DO NOTHING"
+)
+
+
+class Progress:
+    """진행 상황을 stderr 한 줄에 주기적으로 덮어써 출력합니다."""
+
+    def __init__(self, label: str, total_bytes: Optional[int] = None, interval: float = 1.0):
+        self.label = label
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.rows = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self._reported = self.started
+
+    def update(self, rows: int, nbytes: int) -> None:
+        self.rows += rows
+        self.bytes += nbytes
+        now = time.perf_counter()
+        if now - self._reported >= self.interval:
+            self._reported = now
+            self._print(now, end="\r")
+
+    def _print(self, now: float, end: str) -> None:
+        elapsed = max(now - self.started, 1e-9)
+        line = f"{self.label}: {self.rows:,} rows, {self.rows / elapsed:,.0f} rows/s, {self.bytes / elapsed / 1e6:.1f} MB/s"
+        if self.total_bytes:
+            line += f", {min(self.bytes / self.total_bytes, 1.0):.0%}"
+        print(line, end=end, file=sys.stderr, flush=True)
+
+    def finish(self) -> float:
+        now = time.perf_counter()
+        self._print(now, end="\n")
+        return now - self.started
+
+
+async def connect() -> asyncpg.Connection:
+    config = get_config()
+    return await asyncpg.connect(
+        host=config.postgresql_endpoint,
+        port=int(config.postgresql_port),
+        user=config.postgresql_user,
+        password=config.postgresql_password,
+        database=config.postgresql_table,
+    )
+
+
+def export_query(table: str) -> str:
+    pairs = ", ".join(f"'{field}', {field}" for field, _ in FIELDS[table])
+    order = "id" if FIELDS[table][0][0] == "id" else ", ".join(field for field, _ in FIELDS[table][:2])
+    return f"SELECT json_build_object({pairs})::text FROM {table} ORDER BY {order}"
+
+
+async def export_table(conn: asyncpg.Connection, table: str, path: str) -> int:
+    progress = Progress(f"export {table}")
+    with open(path, "wb") as output:
+        async def write(chunk: bytes) -> None:
+            output.write(chunk)
+            progress.update(chunk.count(b"\n"), len(chunk))
+
+        # JSON 텍스트에는 줄바꿈과 제어 문자가 이스케이프되어 있으므로, 나올 수 없는 문자를
+        # CSV 구분자/따옴표로 지정하면 COPY 출력이 그대로 NDJSON 줄이 됩니다.
+        await conn.copy_from_query(export_query(table), output=write, format="csv", delimiter="\x02", quote="\x01")
+    progress.finish()
+    return progress.rows
+
+
+async def stage_table(conn: asyncpg.Connection, table: str, path: str, chunk_size: int) -> int:
+    fields = FIELDS[table]
+    columns = [field for field, _ in fields]
+    staging = f"_bulk_{table}"
+    await conn.execute(
+        f"CREATE TEMP TABLE {staging} ({', '.join(f'{field} {kind}' for field, kind in fields)}) ON COMMIT DROP"
+    )
+    progress = Progress(f"import {table}", total_bytes=os.path.getsize(path))
+    chunk = []
+    chunk_bytes = 0
+    with open(path, "rb") as source:
+        for line in source:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            chunk.append(tuple(row.get(field) for field in columns))
+            chunk_bytes += len(line)
+            if len(chunk) >= chunk_size:
+                await conn.copy_records_to_table(staging, records=chunk, columns=columns)
+                progress.update(len(chunk), chunk_bytes)
+                chunk, chunk_bytes = [], 0
+    if chunk:
+        await conn.copy_records_to_table(staging, records=chunk, columns=columns)
+        progress.update(len(chunk), chunk_bytes)
+    progress.finish()
+    await conn.execute(f"ANALYZE {staging}")
+    return progress.rows
+
+
+def affected_rows(status: str) -> int:
+    # "INSERT 0 42" / "UPDATE 42" 같은 명령 태그에서 행 수를 읽습니다.
+    parts = status.split()
+    return int(parts[-1]) if parts and parts[-1].isdigit() else 0
+
+
+async def find_unmatched(conn: asyncpg.Connection, table: str, maps: dict) -> tuple[int, list]:
+    rows = await conn.fetch(UNMATCHED_STATEMENTS[table].format(**maps), UNMATCHED_SAMPLE)
+    return (rows[0][1] if rows else 0), [list(row[0]) if table in ("likes", "follows") else row[0] for row in rows]
+
+
+async def import_tables(
+    conn: asyncpg.Connection, directory: str, tables: list[str], chunk_size: int, strict: bool = False
+) -> dict:
+    summary = {}
+    maps = dict(IDENTITY_MAPS)
+    async with conn.transaction():
+        for table in tables:
+            path = os.path.join(directory, f"{table}.ndjson")
+            if not os.path.exists(path):
+                continue
+            staged = await stage_table(conn, table, path, chunk_size)
+            inserted = 0
+            for statement in RESOLVE_STATEMENTS[table]:
+                statement = statement.format(**maps)
+                if statement.startswith("WITH"):
+                    # 카운터 UPDATE를 함께 하는 문장은 실제로 들어간 행 수를 SELECT로 돌려줍니다.
+                    inserted = await conn.fetchval(statement)
+                else:
+                    status = await conn.execute(statement)
+                    if status.startswith("INSERT"):
+                        inserted = affected_rows(status)
+            unmatched, unmatched_ids = await find_unmatched(conn, table, maps)
+            if table in maps:
+                maps[table] = f"_bulk_map_{table}"
+            summary[table] = {
+                "staged": staged,
+                "inserted": inserted,
+                "skipped": staged - inserted,
+                "unmatched": unmatched,
+                "unmatched_ids": unmatched_ids,
+            }
+            if unmatched:
+                logger.warning(f"{table}: {unmatched} rows could not be matched, e.g. source ids {unmatched_ids}")
+        unmatched_tables = [table for table, result in summary.items() if result["unmatched"]]
+        if strict and unmatched_tables:
+            # 트랜잭션 안에서 올리므로 이미 넣은 행까지 모두 롤백됩니다.
+            raise UnmatchedRowsError(f"Unmatched rows in {', '.join(unmatched_tables)}; import rolled back")
+        if "posts" in summary:
+            await conn.execute(HASHTAG_BACKFILL)
+            await conn.execute(TIMELINE_BACKFILL, get_config().timeline_fanout_limit)
+    return summary
+
+
+def parse_tables(spec: Optional[str]) -> list[str]:
+    if not spec:
+        return list(TABLES)
+    requested = {name.strip() for name in spec.split(",") if name.strip()}
+    unknown = requested - set(TABLES)
+    if unknown:
+        raise SystemExit(f"Unknown tables: {', '.join(sorted(unknown))}")
+    return [table for table in TABLES if table in requested]
+
+
+async def run(args) -> dict:
+    conn = await connect()
+    try:
+        tables = parse_tables(args.tables)
+        if args.command == "export":
+            os.makedirs(args.directory, exist_ok=True)
+            return {
+                table: {"exported": await export_table(conn, table, os.path.join(args.directory, f"{table}.ndjson"))}
+                for table in tables
+            }
+        return await import_tables(conn, args.directory, tables, args.chunk_size, args.strict)
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream NDJSON in and out of the users/posts/social graph tables.")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("directory", help="directory holding <table>.ndjson files")
+    parser.add_argument("--tables", help=f"comma-separated subset of {','.join(TABLES)}")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows per COPY when importing")
+    parser.add_argument("--strict", action="store_true", help="roll back the import if any row cannot be matched")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    started = time.perf_counter()
+    try:
+        summary = asyncio.run(run(args))
+    except UnmatchedRowsError as error:
+        raise SystemExit(str(error))
+    logger.info(f"{args.command} finished in {time.perf_counter() - started:.1f}s: {json.dumps(summary)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""posts.likes_count / posts.comments_count 드리프트 보정 작업.
+
+게시물을 id 순으로 batch-size 개씩 훑으면서 likes/comments 테이블의 실제 개수와
+비교하고, 어긋난 게시물만 다시 집계합니다. 배치마다 별도 트랜잭션으로 커밋하므로
+운영 중에도 잠금 범위가 한 배치로 제한됩니다.
+
+    python -m tools.reconcile_counters --batch-size 500 --pause 0.1
+"""
+import argparse
+import asyncio
+import logging
+
+import dependencies.database as database
+from dependencies.config import get_config
+from dependencies.database import init_db
+from domains.posts.repository import PostRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_batch(repository: PostRepository, after_id: int, batch_size: int) -> tuple[int, int, int]:
+    """Returns (last_post_id, scanned, fixed) for one batch starting after `after_id`."""
+    rows = await repository.get_posts_counters(after_id, batch_size)
+    if not rows:
+        return after_id, 0, 0
+
+    post_ids = [post_id for post_id, _, _ in rows]
+    likes_counts = await repository.get_posts_likes_counts(post_ids)
+    comments_counts = await repository.get_posts_comments_counts(post_ids)
+    drifted = [
+        post_id
+        for post_id, likes_count, comments_count in rows
+        if likes_count != likes_counts.get(post_id, 0) or comments_count != comments_counts.get(post_id, 0)
+    ]
+    if drifted:
+        # 비교 이후에 들어온 좋아요/댓글까지 반영되도록 값을 직접 쓰지 않고 UPDATE 안에서 재집계합니다.
+        await repository.recount_counters(drifted)
+    return post_ids[-1], len(rows), len(drifted)
+
+
+async def reconcile(batch_size: int = 500, pause: float = 0.0, start_after: int = 0) -> int:
+    after_id = start_after
+    total_fixed = 0
+    while True:
+        async with database.DBSessionLocal() as session:
+            repository = PostRepository(session)
+            after_id, scanned, fixed = await reconcile_batch(repository, after_id, batch_size)
+            await session.commit()
+        if not scanned:
+            break
+        total_fixed += fixed
+        logger.info(f"Reconciled posts up to id {after_id}: scanned={scanned} fixed={fixed}")
+        if pause:
+            await asyncio.sleep(pause)
+    return total_fixed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fix drift in denormalized post like/comment counters.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    parser.add_argument("--start-after", type=int, default=0, help="resume after this post id")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db(get_config())
+
+    async def run() -> int:
+        try:
+            return await reconcile(args.batch_size, args.pause, args.start_after)
+        finally:
+            await database.db_engine.dispose()
+
+    fixed = asyncio.run(run())
+    logger.info(f"Reconciliation finished: {fixed} posts fixed")
+
+
+if __name__ == "__main__":
+    main()
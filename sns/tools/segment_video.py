@@ -0,0 +1,63 @@
+"""동영상에서 사람 영역만 남기는 세그멘테이션 작업 (test/background.py 대체).
+
+SegmentationPipeline으로 디코딩, 배치 추론, 합성을 겹쳐 실행하고 결과를 --output 파일로
+저장합니다. --model을 주지 않으면 stub 모델로 파이프라인만 확인합니다. OpenCV가 필요하며,
+Keras 모델을 쓰려면 TensorFlow도 필요합니다.
+
+    python -m tools.segment_video input_video.mp4 --output person.mp4 --model deeplabv3.h5 --batch-size 8
+"""
+import argparse
+import logging
+
+from dependencies.segmentation import (
+    KerasSegmentationModel,
+    SegmentationPipeline,
+    StubSegmentationModel,
+    read_video_frames,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    import cv2
+
+    parser = argparse.ArgumentParser(description="Segment people out of a video with the batched pipeline.")
+    parser.add_argument("source", help="video file path or camera index")
+    parser.add_argument("--output", default="person.mp4")
+    parser.add_argument("--model", help="DeepLabv3 Keras model; omit to use the stub model")
+    parser.add_argument("--input-size", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--target-fps", type=float, help="skip frames to keep up with this rate")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    capture = cv2.VideoCapture(source)
+    source_fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    capture.release()
+
+    model = KerasSegmentationModel(args.model, args.input_size) if args.model else StubSegmentationModel()
+    pipeline = SegmentationPipeline(
+        model,
+        batch_size=args.batch_size,
+        queue_size=args.queue_size,
+        target_fps=args.target_fps,
+        source_fps=source_fps,
+    )
+    writer = cv2.VideoWriter(args.output, cv2.VideoWriter_fourcc(*"mp4v"), args.target_fps or source_fps, (width, height))
+    try:
+        stats = pipeline.run(read_video_frames(source), writer.write)
+    finally:
+        writer.release()
+    logger.info(
+        f"decoded={stats.decoded} skipped={stats.skipped} processed={stats.composited} "
+        f"batches={stats.batches} fps={stats.fps:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()